@@ -5,6 +5,8 @@
 
 import re
 
+from interning import Symbol, LABEL
+
 class AssemblyTranslator:
     def __init__(self):
         self.asm_output = []
@@ -13,10 +15,20 @@ class AssemblyTranslator:
         self.fmt_label = "fmt_int"
         # Relocation prefix for static access
         self.mem_prefix = "rel "
+        # set while translating a function unit (translate_function)
+        self._slots = None
+        self._label_prefix = ''
+        self._return_label = None
+        # streamed module state (begin_stream / end_stream)
+        self._stream_vars = set()
+        self._stream_main = False
 
     _ident_re = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
 
     def _is_ident(self, s):
+        if type(s) is Symbol:
+            # interned by the lexer/parser: already a valid name
+            return True
         return isinstance(s, str) and bool(self._ident_re.match(s))
 
     def _is_int(self, s):
@@ -33,13 +45,33 @@ class AssemblyTranslator:
             if op == 'mark':
                 if isinstance(s1, str):
                     self.labels.add(s1)
+            elif op == 'jump':
+                self.labels.add(s1)
+            elif op == 'jump_if_false':
+                self.labels.add(s2)
+                if self._is_ident(s1):
+                    self.vars.add(s1)
             else:
                 for x in (s1, s2, d):
-                    if self._is_ident(x):
+                    if type(x) is Symbol:
+                        if x.kind != LABEL:
+                            self.vars.add(x)
+                    elif self._is_ident(x):
                         # treat labels (LabelN) as labels only when used with mark/jump
                         # keep everything else as vars
                         self.vars.add(x)
 
+    def _mem(self, name):
+        """Memory operand for a variable: a frame slot inside a function, else static data."""
+        if self._slots is not None:
+            slot = self._slots.get(name)
+            if slot is not None:
+                return f"QWORD [rbp - {slot}]"
+        return f"QWORD [{self.mem_prefix}{name}]"
+
+    def _label(self, name):
+        return f"{self._label_prefix}{name}"
+
     def _repr_operand_load(self, operand, target_reg):
         """
         Produce assembly lines to load 'operand' into target_reg.
@@ -49,7 +81,7 @@ class AssemblyTranslator:
         if self._is_int(operand):
             lines.append(f"    mov {target_reg}, {operand}")
         elif self._is_ident(operand):
-            lines.append(f"    mov {target_reg}, QWORD [{self.mem_prefix}{operand}]")
+            lines.append(f"    mov {target_reg}, {self._mem(operand)}")
         else:
             # Fallback: try to print repr
             lines.append(f"    ; unsupported operand {operand!r}, zeroing")
@@ -57,6 +89,10 @@ class AssemblyTranslator:
         return lines
 
     def translate(self, ir_code):
+        """Translate a whole top-level program into a single `main`."""
+        self._slots = None
+        self._label_prefix = ''
+        self._return_label = None
         self._collect_symbols(ir_code)
         out = []
 
@@ -82,120 +118,220 @@ class AssemblyTranslator:
 
         # Translate IR
         for instr in ir_code:
-            op = instr.get('op')
-            s1 = instr.get('src1')
-            s2 = instr.get('src2')
-            d = instr.get('dst')
+            self._emit_instruction(instr, out)
 
-            if op == 'assign':
-                # assign src1 -> d
-                if self._is_int(s1):
-                    out.append(f"    mov rax, {int(s1)}")
-                else:
-                    out += self._repr_operand_load(s1, "rax")
-                if self._is_ident(d):
-                    out.append(f"    mov QWORD [{self.mem_prefix}{d}], rax")
-                else:
-                    out.append(f"    ; assign to non-ident {d!r}")
-                out.append("")
-
-            elif op in ('+', '-', '*', '/', '%'):
-                # dst = s1 op s2
-                out += self._repr_operand_load(s1, "rax")
-                out += self._repr_operand_load(s2, "rbx")
-                if op == '+':
-                    out.append("    add rax, rbx")
-                elif op == '-':
-                    out.append("    sub rax, rbx")
-                elif op == '*':
-                    out.append("    imul rax, rbx")
-                elif op == '/':
-                    out.append("    cqo")               # sign extend rax -> rdx:rax
-                    out.append("    idiv rbx")         # quotient in rax
-                elif op == '%':
-                    out.append("    cqo")
-                    out.append("    idiv rbx")
-                    out.append("    mov rax, rdx")    # remainder in rdx
-                if self._is_ident(d):
-                    out.append(f"    mov QWORD [{self.mem_prefix}{d}], rax")
-                out.append("")
-
-            elif op in ('<', '<=', '>', '>=', '==', '!='):
-                # comparison -> dst (0 or 1)
-                out += self._repr_operand_load(s1, "rax")
-                out += self._repr_operand_load(s2, "rbx")
-                out.append("    cmp rax, rbx")
-                set_instr = {
-                    '<': 'setl', '<=': 'setle', '>': 'setg', '>=': 'setge',
-                    '==': 'sete', '!=': 'setne'
-                }[op]
-                out.append(f"    {set_instr} al")
-                out.append("    movzx rax, al")
-                if self._is_ident(d):
-                    out.append(f"    mov QWORD [{self.mem_prefix}{d}], rax")
-                out.append("")
-
-            elif op == 'mark':
-                lbl = s1
-                out.append(f"{lbl}:")
-                out.append("")
-
-            elif op == 'jump':
-                lbl = s1
-                out.append(f"    jmp {lbl}")
-                out.append("")
+        # Epilogue and return
+        out.append("    mov rsp, rbp")
+        out.append("    pop rbp")
+        out.append("    ret")
+        out.append("")
 
-            elif op == 'jump_if_false':
-                # s1 is condition variable (or immediate), s2 is label to jump to
-                cond = s1
-                lbl = s2
-                if self._is_int(cond):
-                    out.append(f"    mov rax, {int(cond)}")
-                else:
-                    out += self._repr_operand_load(cond, "rax")
-                out.append("    cmp rax, 0")
-                out.append(f"    je {lbl}")
-                out.append("")
-
-            elif op == 'output':
-                # call printf(fmt, value)
-                val = s1
-                # load value into rsi, format into rdi
-                if self._is_int(val):
-                    out.append(f"    mov rsi, {int(val)}")
-                else:
-                    out += self._repr_operand_load(val, "rsi")
-                    # mov rsi, [val] left rsi contains value when using repr_operand_load
-                    # repr_operand_load uses mov rsi, [rel val] already
-                out.append(f"    lea rdi, [rel {self.fmt_label}]")
-                out.append("    xor rax, rax")
-                out.append("    call printf")
-                out.append("")
-
-            elif op == 'return':
-                # src1 may be None or an expression/variable
-                if s1 is None:
-                    out.append("    mov rax, 0")
-                elif self._is_int(s1):
-                    out.append(f"    mov rax, {int(s1)}")
-                else:
-                    out += self._repr_operand_load(s1, "rax")
-                out.append("    ; function return")
-                out.append("")  # We'll emit epilogue and ret after processing all IR
+        self.asm_output = out
+        return out
 
-            else:
-                out.append(f"    ; unhandled op: {op} ({instr})")
-                out.append("")
+    def translate_function(self, name, ir_code):
+        """
+        Translate one function unit into its own global symbol.
 
-        # Epilogue and return
+        Every variable and temp of the unit lives in the function's stack
+        frame and its labels are NASM local labels (.LabelN), so units share
+        nothing and can be translated independently. Returns the text lines
+        of the function only; see assemble().
+        """
+        self._collect_symbols(ir_code)
+        self._slots = {v: 8 * (i + 1) for i, v in enumerate(sorted(self.vars))}
+        self._label_prefix = '.'
+        self._return_label = '.exit'
+        frame = 8 * len(self._slots)
+        frame += frame % 16  # keep rsp 16-byte aligned for calls
+        out = [f"global {name}", f"{name}:", "    push rbp", "    mov rbp, rsp"]
+        if frame:
+            out.append(f"    sub rsp, {frame}")
+        out.append("")  # prologue
+        for instr in ir_code:
+            self._emit_instruction(instr, out)
+        out.append(f"{self._return_label}:")
         out.append("    mov rsp, rbp")
         out.append("    pop rbp")
         out.append("    ret")
         out.append("")
+        self._slots = None
+        self._label_prefix = ''
+        self._return_label = None
+        return out
 
+    def assemble(self, functions):
+        """Join translated functions (lists of lines or text, in order) into one module."""
+        out = ["section .data", f"{self.fmt_label}: db \"%d\", 10, 0", ""]
+        out += ["section .text", "extern printf", ""]
+        for lines in functions:
+            out += lines.split('\n') if isinstance(lines, str) else lines
         self.asm_output = out
         return out
 
+    # -----------------------
+    # Streamed output (streaming.compile_stream)
+    # -----------------------
+    def begin_stream(self, functions):
+        """
+        First lines of a module written piece by piece: `functions` selects
+        translate_function() per unit, otherwise the pieces of a top-level
+        program go through translate_statements(). Variables are collected
+        as they are seen and the data section follows the code (end_stream).
+        """
+        self._slots = None
+        self._label_prefix = ''
+        self._return_label = None
+        self._stream_vars = set()
+        self._stream_main = not functions
+        out = ["section .text", "extern printf"]
+        if functions:
+            out.append("")
+        else:
+            out += ["global main", "", "main:", "    push rbp", "    mov rbp, rsp", ""]
+        return out
+
+    def translate_statements(self, ir_code):
+        """Lines for one piece of a streamed top-level program."""
+        self._collect_symbols(ir_code)
+        self._stream_vars.update(str(v) for v in self.vars)
+        out = []
+        for instr in ir_code:
+            self._emit_instruction(instr, out)
+        return out
+
+    def end_stream(self):
+        """Epilogue of a streamed top-level program, then the data section."""
+        out = []
+        if self._stream_main:
+            out += ["    mov rsp, rbp", "    pop rbp", "    ret", ""]
+        out += ["section .data", f"{self.fmt_label}: db \"%d\", 10, 0"]
+        out += [f"{v}: dq 0" for v in sorted(self._stream_vars)]
+        out.append("")
+        self._stream_vars = set()
+        return out
+
+    def _emit_instruction(self, instr, out):
+        op = instr.get('op')
+        s1 = instr.get('src1')
+        s2 = instr.get('src2')
+        d = instr.get('dst')
+
+        if op == 'assign':
+            # assign src1 -> d
+            if self._is_int(s1):
+                out.append(f"    mov rax, {int(s1)}")
+            else:
+                out += self._repr_operand_load(s1, "rax")
+            if self._is_ident(d):
+                out.append(f"    mov {self._mem(d)}, rax")
+            else:
+                out.append(f"    ; assign to non-ident {d!r}")
+            out.append("")
+
+        elif op in ('+', '-', '*', '/', '%'):
+            # dst = s1 op s2
+            out += self._repr_operand_load(s1, "rax")
+            out += self._repr_operand_load(s2, "rbx")
+            if op == '+':
+                out.append("    add rax, rbx")
+            elif op == '-':
+                out.append("    sub rax, rbx")
+            elif op == '*':
+                out.append("    imul rax, rbx")
+            elif op == '/':
+                out.append("    cqo")               # sign extend rax -> rdx:rax
+                out.append("    idiv rbx")         # quotient in rax
+            elif op == '%':
+                out.append("    cqo")
+                out.append("    idiv rbx")
+                out.append("    mov rax, rdx")    # remainder in rdx
+            if self._is_ident(d):
+                out.append(f"    mov {self._mem(d)}, rax")
+            out.append("")
+
+        elif op in ('<', '<=', '>', '>=', '==', '!='):
+            # comparison -> dst (0 or 1)
+            out += self._repr_operand_load(s1, "rax")
+            out += self._repr_operand_load(s2, "rbx")
+            out.append("    cmp rax, rbx")
+            set_instr = {
+                '<': 'setl', '<=': 'setle', '>': 'setg', '>=': 'setge',
+                '==': 'sete', '!=': 'setne'
+            }[op]
+            out.append(f"    {set_instr} al")
+            out.append("    movzx rax, al")
+            if self._is_ident(d):
+                out.append(f"    mov {self._mem(d)}, rax")
+            out.append("")
+
+        elif op == 'mark':
+            out.append(f"{self._label(s1)}:")
+            out.append("")
+
+        elif op == 'jump':
+            out.append(f"    jmp {self._label(s1)}")
+            out.append("")
+
+        elif op == 'jump_if_false':
+            # s1 is condition variable (or immediate), s2 is label to jump to
+            cond = s1
+            if self._is_int(cond):
+                out.append(f"    mov rax, {int(cond)}")
+            else:
+                out += self._repr_operand_load(cond, "rax")
+            out.append("    cmp rax, 0")
+            out.append(f"    je {self._label(s2)}")
+            out.append("")
+
+        elif op == 'output':
+            # call printf(fmt, value)
+            val = s1
+            # load value into rsi, format into rdi
+            if self._is_int(val):
+                out.append(f"    mov rsi, {int(val)}")
+            else:
+                out += self._repr_operand_load(val, "rsi")
+            out.append(f"    lea rdi, [rel {self.fmt_label}]")
+            out.append("    xor rax, rax")
+            out.append("    call printf")
+            out.append("")
+
+        elif op == 'return':
+            # src1 may be None or an expression/variable
+            if s1 is None:
+                out.append("    mov rax, 0")
+            elif self._is_int(s1):
+                out.append(f"    mov rax, {int(s1)}")
+            else:
+                out += self._repr_operand_load(s1, "rax")
+            if self._return_label is not None:
+                out.append(f"    jmp {self._return_label}")
+            else:
+                out.append("    ; function return")
+            out.append("")  # the top-level program falls through to the epilogue
+
+        else:
+            out.append(f"    ; unhandled op: {op} ({instr})")
+            out.append("")
+
+
+# per-process translator for translate_unit (process pool workers)
+_unit_translator = None
+
+
+def translate_unit(unit):
+    """
+    Translate one parser.FunctionUnit; module-level so a process pool can run it.
+
+    Returns the function's text as one string, which crosses the process
+    boundary much more cheaply than a list of lines.
+    """
+    global _unit_translator
+    if _unit_translator is None:
+        _unit_translator = AssemblyTranslator()
+    return '\n'.join(_unit_translator.translate_function(unit.name, unit.ir))
+
 
 if __name__ == "__main__":
     # small self-test / demo IR (for the fib example you'd produce a larger IR)
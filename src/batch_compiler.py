@@ -0,0 +1,253 @@
+"""
+Headless batch compilation of many source files.
+
+Files are compiled in a ProcessPoolExecutor sized to the machine; each
+worker process builds one CompilerPipeline when it starts and reuses it
+for every file it is handed. Diagnostics are written as JSON lines, one
+object per file.
+
+Exit codes: 0 = all files compiled cleanly, 1 = at least one file had
+compile issues, 2 = a file could not be read or written.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from pathlib import Path
+
+from compile_cache import CompilationCache, default_cache_dir
+from pipeline import CompilerPipeline, format_ir, format_tokens
+
+SOURCE_SUFFIXES = ('.c', '.mc')
+
+EXIT_OK = 0
+EXIT_ISSUES = 1
+EXIT_FAILURE = 2
+
+# per-process warm pipeline (set by _init_worker or lazily in-process)
+_pipeline = None
+
+
+def _init_worker(cache_dir=None, options=None):
+    global _pipeline
+    cache = CompilationCache(cache_dir) if cache_dir else None
+    # files are already spread over processes; translate units in-process
+    _pipeline = CompilerPipeline(cache=cache, options=options, jobs=1)
+
+
+def _get_pipeline():
+    if _pipeline is None:
+        _init_worker()
+    return _pipeline
+
+
+def collect_sources(inputs):
+    """Expand files and directories into a sorted list of (source, root) pairs."""
+    found = []
+    for item in inputs:
+        p = Path(item)
+        if p.is_dir():
+            for dirpath, _dirs, files in os.walk(p):
+                for name in files:
+                    if name.endswith(SOURCE_SUFFIXES):
+                        found.append((Path(dirpath) / name, p))
+        else:
+            found.append((p, p.parent))
+    found.sort()
+    return found
+
+
+def output_stem(src, root, out_dir):
+    """Path (without suffix) for the artifacts of `src`."""
+    if out_dir is None:
+        return src.with_suffix('')
+    return Path(out_dir) / src.relative_to(root).with_suffix('')
+
+
+def compile_job(job):
+    """
+    Compile one file and write its artifacts. Runs inside a worker process.
+
+    Args:
+        job (tuple): (source path, output stem, emit_ir, emit_tokens, stats, stream)
+
+    Returns:
+        dict: the JSON-serialisable diagnostics record for the file.
+    """
+    src, stem, emit_ir, emit_tokens, stats, stream = job
+    if stream:
+        return _stream_job(src, stem, emit_ir, stats)
+    record = {'file': str(src), 'status': 'ok', 'diagnostics': [], 'outputs': []}
+    t0 = time.perf_counter()
+    try:
+        code = Path(src).read_text(encoding='utf-8')
+    except (OSError, UnicodeDecodeError) as e:
+        record['status'] = 'failed'
+        record['diagnostics'].append({'phase': 'io', 'message': str(e), 'line': None, 'column': None})
+        return record
+
+    result = _get_pipeline().compile(code, path=str(src))
+    record['diagnostics'] = result.diagnostics()
+    record['cached'] = result.cached
+    if stats:
+        record['stats'] = result.stats.as_dict()
+    if not result.ok:
+        record['status'] = 'issues'
+
+    artifacts = []
+    if result.codegen_error is None:
+        artifacts.append(('.asm', '\n'.join(result.asm)))
+    if emit_ir:
+        artifacts.append(('.ir', format_ir(result.ir) + '\n'))
+    if emit_tokens:
+        artifacts.append(('.tokens', format_tokens(result.tokens) + '\n'))
+    try:
+        stem = Path(stem)
+        stem.parent.mkdir(parents=True, exist_ok=True)
+        for suffix, text in artifacts:
+            out = stem.with_name(stem.name + suffix)
+            out.write_text(text, encoding='utf-8')
+            record['outputs'].append(str(out))
+    except OSError as e:
+        record['status'] = 'failed'
+        record['diagnostics'].append({'phase': 'io', 'message': str(e), 'line': None, 'column': None})
+    record['seconds'] = round(time.perf_counter() - t0, 6)
+    return record
+
+
+def _stream_job(src, stem, emit_ir, stats):
+    """compile_job for --stream: the source is read and the outputs written piece by piece."""
+    record = {'file': str(src), 'status': 'ok', 'diagnostics': [], 'outputs': [], 'cached': False}
+    t0 = time.perf_counter()
+    stem = Path(stem)
+    asm_path = stem.with_name(stem.name + '.asm')
+    ir_path = stem.with_name(stem.name + '.ir')
+    try:
+        stem.parent.mkdir(parents=True, exist_ok=True)
+        with open(src, encoding='utf-8') as f, open(asm_path, 'w', encoding='utf-8') as out, \
+                (open(ir_path, 'w', encoding='utf-8') if emit_ir else nullcontext()) as ir_out:
+            result = _get_pipeline().compile_stream(f, out, path=str(src), ir_sink=ir_out)
+    except (OSError, UnicodeDecodeError) as e:
+        record['status'] = 'failed'
+        record['diagnostics'].append({'phase': 'io', 'message': str(e), 'line': None, 'column': None})
+        return record
+    record['diagnostics'] = result.diagnostics()
+    if stats:
+        record['stats'] = result.stats.as_dict()
+    if not result.ok:
+        record['status'] = 'issues'
+    if result.codegen_error is None:
+        record['outputs'].append(str(asm_path))
+    else:
+        asm_path.unlink(missing_ok=True)
+    if emit_ir:
+        record['outputs'].append(str(ir_path))
+    record['seconds'] = round(time.perf_counter() - t0, 6)
+    return record
+
+
+def compile_files(sources, out_dir=None, jobs=None, emit_ir=False, emit_tokens=False, cache_dir=None,
+                  stats=False, options=None, stream=False):
+    """
+    Compile (source, root) pairs, yielding diagnostics records in input order.
+
+    Args:
+        jobs (int): worker processes; defaults to the CPU count, 1 runs in-process.
+        cache_dir (str): shared compilation cache directory, None to disable.
+        stats (bool): include per-phase timings and output sizes in each record.
+        options (dict): pipeline options (opt_level, verify_ir).
+        stream (bool): compile each file piece by piece in bounded memory
+            (streaming.py); the cache and emit_tokens are not used.
+    """
+    work = [(src, output_stem(src, root, out_dir), emit_ir, emit_tokens, stats, stream)
+            for src, root in sources]
+    jobs = jobs or os.cpu_count() or 1
+    jobs = min(jobs, max(1, len(work)))
+    if jobs == 1:
+        _init_worker(cache_dir, options)
+        for job in work:
+            yield compile_job(job)
+        return
+    chunksize = max(1, len(work) // (jobs * 8))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(cache_dir, options)) as pool:
+        yield from pool.map(compile_job, work, chunksize=chunksize)
+
+
+def exit_code(records):
+    code = EXIT_OK
+    for rec in records:
+        if rec['status'] == 'failed':
+            return EXIT_FAILURE
+        if rec['status'] == 'issues':
+            code = EXIT_ISSUES
+    return code
+
+
+def options_from_args(args):
+    """Pipeline options selected on the command line (empty at the defaults)."""
+    options = {}
+    if args.opt_level:
+        options['opt_level'] = args.opt_level
+    if args.verify_ir:
+        options['verify_ir'] = True
+    return options
+
+
+def add_optimization_arguments(parser):
+    parser.add_argument('-O', dest='opt_level', type=int, choices=(0, 1, 2), default=0,
+                        help='IR optimisation level (default: 0)')
+    parser.add_argument('--verify-ir', action='store_true', help='check the IR after every optimisation pass')
+
+
+def add_arguments(parser):
+    parser.add_argument('inputs', nargs='+', help='source files or directories')
+    parser.add_argument('-o', '--out-dir', help='write artifacts here (default: next to each source)')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--emit-ir', action='store_true', help='also write a .ir dump')
+    parser.add_argument('--emit-tokens', action='store_true', help='also write a .tokens dump')
+    parser.add_argument('--diagnostics', help='JSON-lines diagnostics file (default: stdout)')
+    parser.add_argument('--cache-dir', default=default_cache_dir(), help='compilation cache directory')
+    parser.add_argument('--no-cache', action='store_true', help='do not read or write the compilation cache')
+    parser.add_argument('--stats', action='store_true', help='add phase timings and counts to each record')
+    parser.add_argument('--stream', action='store_true',
+                        help='compile piece by piece in bounded memory (for very large sources)')
+    add_optimization_arguments(parser)
+
+
+def run(args):
+    sources = collect_sources(args.inputs)
+    missing = [str(s) for s, _ in sources if not s.exists()]
+    if missing:
+        for m in missing:
+            print(f"error: no such file: {m}", file=sys.stderr)
+        return EXIT_FAILURE
+
+    if args.stream and args.emit_tokens:
+        print("error: --emit-tokens cannot be combined with --stream", file=sys.stderr)
+        return EXIT_FAILURE
+
+    sink = open(args.diagnostics, 'w', encoding='utf-8') if args.diagnostics else sys.stdout
+    records = []
+    try:
+        cache_dir = None if args.no_cache else args.cache_dir
+        for rec in compile_files(sources, args.out_dir, args.jobs, args.emit_ir, args.emit_tokens, cache_dir,
+                                 args.stats, options_from_args(args), args.stream):
+            records.append(rec)
+            sink.write(json.dumps(rec) + '\n')
+    finally:
+        if sink is not sys.stdout:
+            sink.close()
+    return exit_code(records)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compile source files to assembly without the GUI.')
+    add_arguments(parser)
+    return run(parser.parse_args(argv))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
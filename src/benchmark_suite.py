@@ -0,0 +1,164 @@
+"""
+Scaling benchmarks for the compiler phases.
+
+Generates seeded synthetic programs (program_generator.ProgramGenerator)
+of increasing size and times TokenScanner.scan, SyntaxProcessor.process
+and AssemblyTranslator.translate separately, recording peak traced memory
+and output sizes. Results are written as JSON and can be compared against
+a stored baseline to flag regressions.
+
+Example:
+    python src/benchmark_suite.py --sizes 1000 10000 100000 -o bench.json
+    python src/benchmark_suite.py --baseline bench.json
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from pipeline import COMPILER_VERSION, CompilerPipeline
+from program_generator import ProgramGenerator
+
+PHASES = ('scan', 'process', 'translate')
+DEFAULT_SIZES = (1000, 10000, 100000)
+
+
+def _run_phase(pipeline, phase, source, ir):
+    if phase == 'scan':
+        return pipeline.scanner.scan(source)
+    if phase == 'process':
+        return pipeline.processor.process(source, lexer=pipeline.scanner.scanner)
+    return pipeline.translator.translate(ir)
+
+
+def measure_phase(pipeline, phase, source, ir, repeat=3, trace_memory=True):
+    """Best-of-`repeat` wall time for one phase, plus its peak traced memory."""
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        _run_phase(pipeline, phase, source, ir)
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    peak = None
+    if trace_memory:
+        gc.collect()
+        tracemalloc.start()
+        _run_phase(pipeline, phase, source, ir)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return {'seconds': best, 'peak_bytes': peak}
+
+
+def benchmark_size(pipeline, lines, generator, repeat=3, trace_memory=True):
+    source = generator.generate(lines)
+    record = {'lines': lines, 'source_bytes': len(source.encode('utf-8')), 'phases': {}}
+
+    # produce the inputs of later phases once, outside the timed region
+    tokens, lex_issues = pipeline.scanner.scan(source)
+    record['tokens'] = len(tokens)
+    pipeline.processor.process(source, lexer=pipeline.scanner.scanner)
+    ir = list(pipeline.processor.ir_instructions)
+    record['ir_instructions'] = len(ir)
+    record['issues'] = len(lex_issues) + len(pipeline.processor.issues)
+    asm = pipeline.translator.translate(ir)
+    record['asm_lines'] = len(asm)
+    record['asm_bytes'] = sum(len(line) + 1 for line in asm)
+
+    for phase in PHASES:
+        record['phases'][phase] = measure_phase(pipeline, phase, source, ir, repeat, trace_memory)
+    record['total_seconds'] = sum(p['seconds'] for p in record['phases'].values())
+    record['lines_per_second'] = lines / record['total_seconds'] if record['total_seconds'] else None
+    return record
+
+
+def run_suite(sizes=DEFAULT_SIZES, seed=0, max_depth=4, expr_depth=3, decl_density=0.2,
+              repeat=3, trace_memory=True, log=None):
+    generator = ProgramGenerator(seed=seed, max_depth=max_depth, expr_depth=expr_depth,
+                                 decl_density=decl_density)
+    pipeline = CompilerPipeline()
+    results = {
+        'compiler_version': COMPILER_VERSION,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'config': {'seed': seed, 'max_depth': max_depth, 'expr_depth': expr_depth,
+                   'decl_density': decl_density, 'repeat': repeat},
+        'runs': [],
+    }
+    for lines in sizes:
+        rec = benchmark_size(pipeline, lines, generator, repeat, trace_memory)
+        results['runs'].append(rec)
+        if log:
+            phases = '  '.join(f"{ph}={rec['phases'][ph]['seconds']:.3f}s" for ph in PHASES)
+            log(f"{lines:>9} lines  {phases}  tokens={rec['tokens']} ir={rec['ir_instructions']}")
+    return results
+
+
+def compare(results, baseline, threshold=0.10):
+    """
+    Return regression records for phases slower (or hungrier) than the baseline.
+
+    A phase regresses when its time or peak memory exceeds the baseline value
+    by more than `threshold` (a fraction).
+    """
+    base_runs = {r['lines']: r for r in baseline.get('runs', [])}
+    regressions = []
+    for run in results['runs']:
+        base = base_runs.get(run['lines'])
+        if base is None:
+            continue
+        for phase in PHASES:
+            cur, old = run['phases'][phase], base['phases'].get(phase)
+            if old is None:
+                continue
+            for metric in ('seconds', 'peak_bytes'):
+                if cur.get(metric) is None or not old.get(metric):
+                    continue
+                ratio = cur[metric] / old[metric]
+                if ratio > 1 + threshold:
+                    regressions.append({'lines': run['lines'], 'phase': phase, 'metric': metric,
+                                        'baseline': old[metric], 'current': cur[metric],
+                                        'ratio': round(ratio, 3)})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark compiler phases on generated programs.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES), help='program sizes in lines')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-depth', type=int, default=4, help='maximum block nesting')
+    parser.add_argument('--expr-depth', type=int, default=3, help='maximum expression depth')
+    parser.add_argument('--decl-density', type=float, default=0.2, help='share of declaration statements')
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per phase (best is kept)')
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc pass')
+    parser.add_argument('-o', '--output', help='write JSON results here')
+    parser.add_argument('--baseline', help='compare against this results file')
+    parser.add_argument('--threshold', type=float, default=0.10, help='allowed slowdown fraction (default 0.10)')
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.sizes, args.seed, args.max_depth, args.expr_depth, args.decl_density,
+                        args.repeat, not args.no_memory, log=print)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        results['regressions'] = regressions
+        for r in regressions:
+            print(f"REGRESSION {r['lines']} lines {r['phase']} {r['metric']}: "
+                  f"{r['baseline']} -> {r['current']} (x{r['ratio']})")
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,296 @@
+"""
+Incremental build of a project directory.
+
+A manifest next to the outputs records, per source file, its size, mtime,
+content hash, the outputs it produced and its last status, together with
+the compiler fingerprint (version and a hash of its sources) and the
+options of the build. A rebuild compiles only
+sources whose record no longer matches:
+
+1. size and mtime_ns equal to the manifest -> up to date, without reading it;
+2. otherwise the content hash is compared, so a touched but unchanged file
+   only has its stat refreshed;
+3. a different compiler fingerprint or different options rebuild everything.
+
+Sources do not include one another, so a file's own content, the options
+and the compiler are its complete set of dependencies. Outputs of sources
+that were deleted are removed, also on a full rebuild, and so are recorded
+outputs that a recompiled source no longer produces. One .asm (and, with --objects, one .o
+assembled by nasm) is written per source, mirroring the project layout.
+"""
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import batch_compiler
+from pipeline import compiler_fingerprint
+
+MANIFEST_NAME = '.build-manifest.json'
+MANIFEST_VERSION = 1
+
+
+def hash_file(path):
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def scan_sources(root, skip):
+    """Yield (relative path, os.stat_result) for every source under `root`, skipping `skip`."""
+    stack = [root]
+    skip = os.path.normpath(skip)
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if os.path.normpath(entry.path) != skip and not entry.name.startswith('.'):
+                        stack.append(entry.path)
+                elif entry.name.endswith(batch_compiler.SOURCE_SUFFIXES):
+                    yield os.path.relpath(entry.path, root), entry.stat()
+
+
+def load_manifest(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get('version') != MANIFEST_VERSION:
+        return None
+    return data
+
+
+def save_manifest(path, data):
+    """Write the manifest atomically (a crash never leaves a truncated file)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.manifest-')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def assemble_object(asm_path, obj_path):
+    """Assemble one .asm into an ELF64 object with nasm; returns an error message or None."""
+    nasm = shutil.which('nasm')
+    if nasm is None:
+        return "nasm not found on PATH"
+    proc = subprocess.run([nasm, '-f', 'elf64', '-o', str(obj_path), str(asm_path)],
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        return proc.stderr.strip() or f"nasm exited with status {proc.returncode}"
+    return None
+
+
+class Builder:
+    """Brings the outputs of one project directory up to date."""
+
+    def __init__(self, project, out_dir=None, options=None, jobs=None, cache_dir=None,
+                 emit_ir=False, emit_tokens=False, objects=False):
+        # absolute, so the recorded outputs do not depend on the working directory
+        self.project = Path(os.path.abspath(project))
+        self.out_dir = Path(os.path.abspath(out_dir)) if out_dir else self.project / 'build'
+        self.options = dict(options or {})
+        self.jobs = jobs
+        self.cache_dir = cache_dir
+        self.emit_ir = emit_ir
+        self.emit_tokens = emit_tokens
+        self.objects = objects
+        self.manifest_path = self.out_dir / MANIFEST_NAME
+
+    def _settings(self):
+        """Everything besides the sources that affects the outputs."""
+        return {'options': self.options, 'emit_ir': self.emit_ir,
+                'emit_tokens': self.emit_tokens, 'objects': self.objects}
+
+    def plan(self, force=False):
+        """
+        Compare the tree with the manifest.
+
+        Returns:
+            tuple: (dirty [(rel, stat, hash, recorded outputs)], up_to_date {rel: record},
+                    removed {rel: record}, whether the manifest must be rewritten)
+        """
+        manifest = load_manifest(self.manifest_path)
+        recorded = manifest.get('files', {}) if manifest is not None else {}
+        if (force or manifest is None or manifest.get('compiler') != compiler_fingerprint()
+                or manifest.get('settings') != self._settings()):
+            old = {}
+            rewrite = True
+        else:
+            old = recorded
+            rewrite = False
+
+        dirty, fresh = [], {}
+        exists = os.path.exists
+        for rel, st in scan_sources(self.project, self.out_dir):
+            rec = old.get(rel)
+            if rec is not None and all(exists(o) for o in rec['outputs']):
+                if rec['mtime_ns'] == st.st_mtime_ns and rec['size'] == st.st_size:
+                    fresh[rel] = rec
+                    continue
+                digest = hash_file(self.project / rel)
+                if digest == rec['hash']:
+                    fresh[rel] = dict(rec, mtime_ns=st.st_mtime_ns, size=st.st_size)
+                    rewrite = True
+                    continue
+                dirty.append((rel, st, digest, rec['outputs']))
+                continue
+            # outputs from the manifest even on a full rebuild, so the ones
+            # this build no longer writes can be removed
+            previous = recorded.get(rel)
+            dirty.append((rel, st, None, previous['outputs'] if previous else []))
+        seen = set(fresh)
+        seen.update(rel for rel, _st, _h, _o in dirty)
+        # from the recorded files, so a full rebuild still cleans up after deleted sources
+        removed = {rel: rec for rel, rec in recorded.items() if rel not in seen}
+        return dirty, fresh, removed, rewrite or bool(dirty or removed)
+
+    def build(self, force=False, log=None):
+        """
+        Run an incremental build.
+
+        Returns:
+            tuple: (records of the files compiled now, summary dict)
+        """
+        t0 = time.perf_counter()
+        dirty, fresh, removed, rewrite = self.plan(force)
+
+        for rec in removed.values():
+            for out in rec['outputs']:
+                try:
+                    os.unlink(out)
+                except OSError:
+                    pass
+
+        files = dict(fresh)
+        records = []
+        if dirty:
+            # hash before compiling: an edit made meanwhile no longer matches the record
+            dirty = [(rel, st, digest or hash_file(self.project / rel), previous)
+                     for rel, st, digest, previous in dirty]
+            sources = [(self.project / rel, self.project) for rel, _st, _h, _o in dirty]
+            compiled = batch_compiler.compile_files(sources, self.out_dir, self.jobs, self.emit_ir,
+                                                    self.emit_tokens, self.cache_dir,
+                                                    options=self.options)
+            for (rel, st, digest, previous), rec in zip(dirty, compiled):
+                if self.objects and rec['status'] != 'failed':
+                    self._assemble(rec)
+                # outputs of the last build that this one did not write again
+                # (an .ir without --emit-ir, the .asm of a file that now fails)
+                for out in set(previous).difference(rec['outputs']):
+                    try:
+                        os.unlink(out)
+                    except OSError:
+                        pass
+                records.append(rec)
+                if log:
+                    log(rec)
+                if rec['status'] == 'failed':
+                    continue  # not recorded: retried on the next build
+                files[rel] = {
+                    'mtime_ns': st.st_mtime_ns,
+                    'size': st.st_size,
+                    'hash': digest,
+                    'outputs': rec['outputs'],
+                    'status': rec['status'],
+                    'diagnostics': rec['diagnostics'],
+                }
+
+        if rewrite:
+            save_manifest(self.manifest_path, {
+                'version': MANIFEST_VERSION,
+                'compiler': compiler_fingerprint(),
+                'settings': self._settings(),
+                'files': files,
+            })
+
+        statuses = [r['status'] for r in files.values()] + ['failed' for r in records if r['status'] == 'failed']
+        summary = {
+            'compiled': len(records),
+            'up_to_date': len(fresh),
+            'removed': len(removed),
+            'issues': statuses.count('issues'),
+            'failed': statuses.count('failed'),
+            'seconds': round(time.perf_counter() - t0, 6),
+        }
+        return records, summary
+
+    def _assemble(self, rec):
+        asm = next((o for o in rec['outputs'] if o.endswith('.asm')), None)
+        if asm is None:
+            return
+        obj = asm[:-len('.asm')] + '.o'
+        error = assemble_object(asm, obj)
+        if error is None:
+            rec['outputs'].append(obj)
+        else:
+            rec['status'] = 'failed'
+            rec['diagnostics'].append({'phase': 'assemble', 'message': error, 'line': None, 'column': None})
+
+
+def add_arguments(parser):
+    parser.add_argument('project', help='project directory')
+    parser.add_argument('-o', '--out-dir', help='output directory (default: <project>/build)')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--objects', action='store_true', help='also assemble a .o per source with nasm')
+    parser.add_argument('--emit-ir', action='store_true', help='also write a .ir dump')
+    parser.add_argument('--emit-tokens', action='store_true', help='also write a .tokens dump')
+    parser.add_argument('--force', action='store_true', help='rebuild everything')
+    parser.add_argument('--diagnostics', help='JSON-lines file for the records of recompiled files')
+    parser.add_argument('--cache-dir', default=None, help='also use this compilation cache directory')
+    batch_compiler.add_optimization_arguments(parser)
+
+
+def run(args):
+    if not os.path.isdir(args.project):
+        print(f"error: not a directory: {args.project}", file=sys.stderr)
+        return batch_compiler.EXIT_FAILURE
+    builder = Builder(args.project, args.out_dir, batch_compiler.options_from_args(args), jobs=args.jobs,
+                      cache_dir=args.cache_dir, emit_ir=args.emit_ir, emit_tokens=args.emit_tokens,
+                      objects=args.objects)
+    sink = open(args.diagnostics, 'w', encoding='utf-8') if args.diagnostics else None
+    try:
+        _records, summary = builder.build(
+            force=args.force, log=(lambda rec: sink.write(json.dumps(rec) + '\n')) if sink else None)
+    finally:
+        if sink is not None:
+            sink.close()
+    print(f"{summary['compiled']} compiled, {summary['up_to_date']} up to date, "
+          f"{summary['removed']} removed, {summary['issues']} with issues, "
+          f"{summary['failed']} failed ({summary['seconds']:.3f}s)", file=sys.stderr)
+    if summary['failed']:
+        return batch_compiler.EXIT_FAILURE
+    if summary['issues']:
+        return batch_compiler.EXIT_ISSUES
+    return batch_compiler.EXIT_OK
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description='Incrementally build a project directory.')
+    add_arguments(parser)
+    return run(parser.parse_args(argv))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,328 @@
+"""
+Content-addressed on-disk cache of compilation results.
+
+Entries are keyed by a hash of the source bytes, the compiler fingerprint
+(version and a hash of the compiler's sources), the backend and the compile
+options. Each entry is one file of two marshal-encoded parts: a head with
+the assembly, issues and output counts, and a body with the per-phase
+artifacts (compact token buffer, AST, IR, symbols). A hit decodes only the
+head; the body is decoded the first time the tokens, AST, IR or symbols of
+the result are read, so tools that only need the assembly skip it. A
+checksum of both parts is verified on every hit, so a truncated or corrupt
+entry is a miss in get() rather than an error when the body is decoded
+later. Writes are atomic (temp file + os.replace), the
+store is bounded by size with least-recently-used eviction (entry mtime is
+the recency stamp) and hit/miss counters are kept per instance.
+
+The same directory can be shared by the GUI and any number of batch
+worker processes.
+"""
+import hashlib
+import json
+import marshal
+import os
+import struct
+import tempfile
+import zlib
+from array import array
+from pathlib import Path
+
+from lexer import TokenScanner
+from pipeline import CompilationResult, compiler_fingerprint
+from symbol_table import SymbolEntry
+
+_MAGIC = b'MCC3'
+_HEADER = struct.Struct('<QI')  # head size, crc32 of head + body
+_TOKEN_KINDS = TokenScanner.tokens
+_KIND_INDEX = {k: i for i, k in enumerate(_TOKEN_KINDS)}
+
+DEFAULT_BACKEND = 'nasm-x86_64'
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def default_cache_dir():
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'mini-c-compiler')
+
+
+# -----------------------
+# Compact encodings
+# -----------------------
+def pack_tokens(tokens):
+    """Token dicts -> (kind bytes, values, ln/col/pos int64 buffers)."""
+    kinds = bytes(_KIND_INDEX[t['kind']] for t in tokens)
+    vals = [t['val'] if type(t['val']) in (int, float) else str(t['val']) for t in tokens]
+    ln = array('q', [t['ln'] for t in tokens]).tobytes()
+    col = array('q', [t['col'] for t in tokens]).tobytes()
+    pos = array('q', [t['pos'] for t in tokens]).tobytes()
+    return (kinds, vals, ln, col, pos)
+
+
+def unpack_tokens(packed):
+    kinds, vals, ln, col, pos = packed
+    ln, col, pos = array('q', ln), array('q', col), array('q', pos)
+    return [
+        {'kind': _TOKEN_KINDS[k], 'val': v, 'ln': l, 'col': c, 'pos': p}
+        for k, v, l, c, p in zip(kinds, vals, ln, col, pos)
+    ]
+
+
+def _plain(x):
+    """Strip str subclasses so marshal can encode the value."""
+    t = type(x)
+    if t is str or t is int or t is float or x is None:
+        return x
+    if isinstance(x, str):
+        return str(x)
+    if t is list:
+        return [_plain(y) for y in x]
+    if t is tuple:
+        return tuple(_plain(y) for y in x)
+    return x
+
+
+def pack_ir(ir_code):
+    return [(_plain(i.get('op')), _plain(i.get('src1')), _plain(i.get('src2')), _plain(i.get('dst'))) for i in ir_code]
+
+
+def unpack_ir(packed):
+    return [{'op': op, 'src1': s1, 'src2': s2, 'dst': d} for op, s1, s2, d in packed]
+
+
+_SYMBOL_FIELDS = SymbolEntry.FIELDS
+
+
+def pack_symbols(entries):
+    return [tuple(_plain(e.get(f)) for f in _SYMBOL_FIELDS) for e in entries]
+
+
+def unpack_symbols(packed):
+    return [SymbolEntry(*row) for row in packed]
+
+
+class CachedResult(CompilationResult):
+    """A CompilationResult read from the cache; the body is decoded on first use."""
+
+    def __init__(self, path, head, body):
+        self._body = None
+        self._loaded = {}
+        super().__init__(path)
+        self.lex_issues = head['lex_issues']
+        self.parse_issues = head['parse_issues']
+        self.asm = head['asm']
+        self.codegen_error = head['codegen_error']
+        self._counts = head['counts']
+        self._body = body
+
+    def _part(self, name):
+        if self._body is not None:
+            data = marshal.loads(self._body)
+            self._body = None
+            self._loaded = {
+                'tokens': unpack_tokens(data['tokens']),
+                'ast': data['ast'],
+                'ir': unpack_ir(data['ir']),
+                'symbols': unpack_symbols(data['symbols']),
+            }
+        return self._loaded[name]
+
+    def counts(self):
+        return self._counts
+
+
+def _lazy(name):
+    def get(self):
+        return self._part(name)
+
+    def set(self, value):
+        if self._body is not None:
+            self._part(name)  # decode the rest before replacing one part
+        self._loaded[name] = value
+    return property(get, set)
+
+
+for _name in ('tokens', 'ast', 'ir', 'symbols'):
+    setattr(CachedResult, _name, _lazy(_name))
+
+
+class CompilationCache:
+    """Size-bounded LRU store of CompilationResult artifacts."""
+
+    def __init__(self, root=None, max_bytes=DEFAULT_MAX_BYTES, backend=DEFAULT_BACKEND):
+        self.root = Path(root or default_cache_dir())
+        self.max_bytes = max_bytes
+        self.backend = backend
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'errors': 0}
+        self._total_bytes = None  # computed lazily on the first store
+
+    # -----------------------
+    # Keys and paths
+    # -----------------------
+    def key(self, source, options=None):
+        h = hashlib.blake2b(digest_size=20)
+        h.update(compiler_fingerprint().encode())
+        h.update(b'\0' + self.backend.encode() + b'\0')
+        h.update(json.dumps(options or {}, sort_keys=True).encode())
+        h.update(b'\0')
+        h.update(source.encode('utf-8') if isinstance(source, str) else source)
+        return h.hexdigest()
+
+    def _path(self, key):
+        return self.root / key[:2] / (key[2:] + '.bin')
+
+    # -----------------------
+    # Lookup / store
+    # -----------------------
+    def get(self, key, path=None):
+        """Return a CompilationResult for `key`, or None on a miss."""
+        entry = self._path(key)
+        try:
+            with open(entry, 'rb') as f:
+                blob = f.read()
+            if blob[:4] != _MAGIC:
+                raise ValueError('bad cache entry header')
+            head_size, checksum = _HEADER.unpack_from(blob, 4)
+            start = 4 + _HEADER.size
+            if zlib.crc32(memoryview(blob)[start:]) != checksum:
+                raise ValueError('cache entry checksum mismatch')
+            head = marshal.loads(blob[start:start + head_size])
+            body = blob[start + head_size:]
+        except FileNotFoundError:
+            self.stats['misses'] += 1
+            return None
+        except (OSError, ValueError, EOFError, TypeError, struct.error):
+            self.stats['errors'] += 1
+            self.stats['misses'] += 1
+            return None
+        try:
+            os.utime(entry)  # LRU recency stamp
+        except OSError:
+            pass
+        self.stats['hits'] += 1
+        return CachedResult(path, head, body)
+
+    def put(self, key, result):
+        head = {
+            'lex_issues': [str(m) for m in result.lex_issues],
+            'parse_issues': [str(m) for m in result.parse_issues],
+            'asm': [str(line) for line in result.asm],
+            'codegen_error': result.codegen_error,
+            'counts': tuple(result.counts()),
+        }
+        body = {
+            'tokens': pack_tokens(result.tokens),
+            'ast': _plain(result.ast),
+            'ir': pack_ir(result.ir),
+            'symbols': pack_symbols(result.symbols),
+        }
+        try:
+            head = marshal.dumps(head)
+            body = marshal.dumps(body)
+            checksum = zlib.crc32(body, zlib.crc32(head))
+            blob = b''.join((_MAGIC, _HEADER.pack(len(head), checksum), head, body))
+        except ValueError:
+            self.stats['errors'] += 1
+            return False
+
+        entry = self._path(key)
+        try:
+            old_size = entry.stat().st_size
+        except OSError:
+            old_size = 0
+        try:
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=entry.parent, prefix='.tmp-')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(blob)
+                os.replace(tmp, entry)
+            except BaseException:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+                raise
+        except OSError:
+            self.stats['errors'] += 1
+            return False
+        self.stats['stores'] += 1
+
+        if self._total_bytes is None:
+            self._total_bytes = self.size()
+        else:
+            self._total_bytes += len(blob) - old_size
+        if self._total_bytes > self.max_bytes:
+            self.evict()
+        return True
+
+    # -----------------------
+    # Maintenance
+    # -----------------------
+    def _entries(self):
+        if not self.root.is_dir():
+            return
+        for sub in os.scandir(self.root):
+            if not sub.is_dir():
+                continue
+            for e in os.scandir(sub.path):
+                if e.name.endswith('.bin'):
+                    try:
+                        st = e.stat()
+                    except OSError:
+                        continue
+                    yield e.path, st.st_size, st.st_mtime_ns
+
+    def size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self, target_bytes=None):
+        """Delete least recently used entries until the store is under target (90% of max)."""
+        target = int(self.max_bytes * 0.9) if target_bytes is None else target_bytes
+        entries = sorted(self._entries(), key=lambda e: e[2])
+        total = sum(size for _, size, _ in entries)
+        for entry, size, _ in entries:
+            if total <= target:
+                break
+            try:
+                os.unlink(entry)
+            except OSError:
+                continue
+            total -= size
+            self.stats['evictions'] += 1
+        self._total_bytes = total
+        return total
+
+    def clear(self):
+        return self.evict(target_bytes=0)
+
+    def hit_rate(self):
+        lookups = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / lookups if lookups else 0.0
+
+
+if __name__ == '__main__':
+    # self-check: damaged entries are misses, never errors for the caller
+    from pipeline import CompilerPipeline
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = CompilationCache(tmp)
+        pipeline = CompilerPipeline(cache=cache, jobs=1)
+        source = "int a = 2; while (a < 10) { a = a * 2; } print(a);"
+        expected = pipeline.compile(source)
+        entry = cache._path(cache.key(source, pipeline.options))
+        good = entry.read_bytes()
+        damaged = {
+            'truncated body': good[:-7],
+            'flipped body byte': good[:-3] + bytes([good[-3] ^ 0xFF]) + good[-2:],
+            'truncated header': good[:10],
+        }
+        for label, blob in damaged.items():
+            entry.write_bytes(blob)
+            errors = cache.stats['errors']
+            assert cache.get(cache.key(source, pipeline.options)) is None, label
+            assert cache.stats['errors'] == errors + 1, label
+            result = pipeline.compile(source)  # recompiles and rewrites the entry
+            assert not result.cached and result.asm == expected.asm, label
+            hit = pipeline.compile(source)
+            assert hit.cached and hit.ir == expected.ir and hit.tokens == expected.tokens, label
+            print(f"{label:<20} miss, recompiled, then hit")
+        print(cache.stats)
@@ -0,0 +1,414 @@
+"""
+Long-lived compile server.
+
+Starting a compiler process pays for importing PLY and building the lexer
+and parser tables before the first line is compiled. The server keeps a
+bounded pool of worker processes, each holding a warm CompilerPipeline, and
+answers JSON-lines requests over stdin/stdout or a Unix socket.
+
+Request (one JSON object per line):
+    {"id": 1, "source": "int a = 1;", "options": {}, "path": "a.c",
+     "emit": ["asm", "ir", "tokens"], "timeout": 5}
+    {"id": 2, "op": "ping"}
+
+Response:
+    {"id": 1, "status": "ok" | "issues" | "timeout" | "error",
+     "diagnostics": [...], "asm": "...", "ir": "...", "seconds": 0.01}
+
+Requests are served concurrently, at most one per worker; a request that
+exceeds its timeout, or fails in any other way once it has been sent, has
+its worker killed and replaced, so a worker never goes back to the pool
+still owing a response. Responses on one stream may arrive out of order, so
+clients match them by "id".
+
+CompileClient talks to a running server and compiles in-process when no
+server is listening.
+"""
+import json
+import multiprocessing
+import os
+import queue
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pipeline import COMPILER_VERSION, CompilerPipeline, format_ir, format_tokens
+
+DEFAULT_TIMEOUT = 30.0
+START_TIMEOUT = 60.0  # for a new worker to build its tables
+DEFAULT_EMIT = ('asm',)
+
+
+def default_socket_path():
+    base = os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    return os.path.join(base, f"mini-c-compiler-{os.getuid()}.sock")
+
+
+def handle_request(pipeline, request):
+    """Compile one request with `pipeline` and build its response (no id, no timing)."""
+    source = request.get('source')
+    if not isinstance(source, str):
+        return {'status': 'error', 'error': "request needs a 'source' string"}
+    options = request.get('options') or {}
+    if options != pipeline.options:
+        pipeline.options = dict(options)
+    result = pipeline.compile(source, path=request.get('path'))
+    emit = request.get('emit') or DEFAULT_EMIT
+    response = {
+        'status': 'ok' if result.ok else 'issues',
+        'diagnostics': result.diagnostics(),
+        'cached': result.cached,
+    }
+    if 'asm' in emit and result.codegen_error is None:
+        response['asm'] = '\n'.join(result.asm)
+    if 'ir' in emit:
+        response['ir'] = format_ir(result.ir)
+    if 'tokens' in emit:
+        response['tokens'] = format_tokens(result.tokens)
+    return response
+
+
+# -----------------------
+# Worker processes
+# -----------------------
+def _worker_main(conn, cache_dir):
+    """Entry point of a worker process: build the warm pipeline, then serve requests."""
+    cache = None
+    if cache_dir:
+        from compile_cache import CompilationCache
+        cache = CompilationCache(cache_dir)
+    pipeline = CompilerPipeline(cache=cache, jobs=1)
+    conn.send('ready')
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        try:
+            response = handle_request(pipeline, request)
+        except Exception as e:
+            response = {'status': 'error', 'error': f"{type(e).__name__}: {e}"}
+        conn.send(response)
+
+
+class _Worker:
+    """One warm compiler process and the parent's end of its pipe."""
+
+    def __init__(self, context, cache_dir):
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child, cache_dir),
+                                       name='compile-server-worker', daemon=True)
+        self.process.start()
+        child.close()
+
+    def wait_ready(self, timeout=START_TIMEOUT):
+        if not self.conn.poll(timeout):
+            raise TimeoutError(f"worker not ready after {timeout} s")
+        self.conn.recv()  # 'ready': tables are built
+        return self
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(1)
+        if self.process.is_alive():
+            self.kill()
+
+
+class CompileServer:
+    """Bounded pool of warm workers shared by every connection."""
+
+    def __init__(self, workers=None, timeout=DEFAULT_TIMEOUT, cache_dir=None):
+        self.timeout = timeout
+        self.cache_dir = cache_dir
+        self.size = workers or os.cpu_count() or 1
+        # spawn: workers may be replaced while request threads are running
+        self._context = multiprocessing.get_context('spawn')
+        self._idle = queue.Queue()
+        starting = [_Worker(self._context, cache_dir) for _ in range(self.size)]
+        for worker in starting:
+            self._idle.put(worker.wait_ready())
+        # one dispatch thread per worker: requests beyond that wait their turn
+        self._dispatch = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix='compile-server')
+        self.requests = 0
+        self.timeouts = 0
+        self._stopped = threading.Event()
+
+    def _start_worker(self):
+        """A new ready worker, or None when it failed to start."""
+        worker = _Worker(self._context, self.cache_dir)
+        try:
+            return worker.wait_ready()
+        except (OSError, EOFError):
+            worker.kill()
+            return None
+
+    def run(self, request):
+        """Answer one request dict (blocking until a worker is free)."""
+        rid = request.get('id')
+        op = request.get('op', 'compile')
+        if op == 'ping':
+            return {'id': rid, 'status': 'ok', 'version': COMPILER_VERSION, 'workers': self.size}
+        if op == 'shutdown':
+            self._stopped.set()
+            return {'id': rid, 'status': 'ok'}
+        if op != 'compile':
+            return {'id': rid, 'status': 'error', 'error': f"unknown op {op!r}"}
+
+        timeout = request.get('timeout')
+        if timeout is None:
+            timeout = self.timeout
+        if isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or not 0 < timeout < float('inf'):
+            return {'id': rid, 'status': 'error', 'error': "'timeout' must be a positive number of seconds"}
+        t0 = time.perf_counter()
+        # None in the pool: a slot whose worker could not be restarted, retried here
+        worker = self._idle.get()
+        if worker is None:
+            worker = self._start_worker()
+        if worker is None:
+            self._idle.put(None)
+            response = {'status': 'error', 'error': 'no compile worker could be started'}
+        else:
+            answered = False
+            try:
+                worker.conn.send(request)
+                if worker.conn.poll(timeout):
+                    response = worker.conn.recv()
+                    answered = True
+                else:
+                    self.timeouts += 1
+                    response = {'status': 'timeout', 'error': f"compilation exceeded {timeout} s"}
+            except Exception as e:
+                response = {'status': 'error', 'error': f"worker failed: {type(e).__name__}: {e}"}
+            finally:
+                if not answered:
+                    # it may still owe a response (or be dead): never reuse it
+                    worker.kill()
+                    worker = self._start_worker()
+                self._idle.put(worker)
+        self.requests += 1
+        response['id'] = rid
+        response['seconds'] = round(time.perf_counter() - t0, 6)
+        return response
+
+    def serve_stream(self, rfile, wfile, on_shutdown=None):
+        """
+        Read JSON-lines requests from `rfile`, writing responses to `wfile` as they finish.
+
+        A 'shutdown' request is answered by the reader itself: no later line
+        is read, `on_shutdown` is called (the socket server closes its
+        listener), the requests already submitted are finished and the
+        dispatch threads are shut down.
+        """
+        lock = threading.Lock()
+
+        def reply(response):
+            line = json.dumps(response) + '\n'
+            with lock:
+                wfile.write(line)
+                wfile.flush()
+
+        def work(request):
+            try:
+                reply(self.run(request))
+            except Exception as e:
+                reply({'id': request.get('id'), 'status': 'error', 'error': f"{type(e).__name__}: {e}"})
+
+        pending = []
+        for line in rfile:
+            if self._stopped.is_set():
+                break  # shut down from another connection
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError('request must be a JSON object')
+            except ValueError as e:
+                reply({'id': None, 'status': 'error', 'error': f"bad request: {e}"})
+                continue
+            if request.get('op') == 'shutdown':
+                reply(self.run(request))
+                if on_shutdown is not None:
+                    on_shutdown()
+                break
+            try:
+                pending.append(self._dispatch.submit(work, request))
+            except RuntimeError:  # dispatch already shut down by another connection
+                reply({'id': request.get('id'), 'status': 'error', 'error': 'server is shutting down'})
+                break
+        for future in pending:
+            future.result()
+        if self._stopped.is_set():
+            self._dispatch.shutdown()
+
+    def serve_stdio(self):
+        self.serve_stream(sys.stdin, sys.stdout)
+
+    def serve_unix(self, path):
+        """Listen on a Unix socket until a 'shutdown' request arrives."""
+        if os.path.exists(path):
+            os.unlink(path)
+        server_self = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                wfile = self.request.makefile('w', encoding='utf-8')
+                rfile = self.request.makefile('r', encoding='utf-8')
+                try:
+                    # shutdown() from this handler thread: serve_forever runs in another
+                    server_self.serve_stream(rfile, wfile, on_shutdown=self.server.shutdown)
+                except (OSError, ValueError):
+                    pass  # client went away
+
+        class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+            daemon_threads = True
+
+        with Server(path, Handler) as srv:
+            os.chmod(path, 0o600)
+            try:
+                srv.serve_forever()
+            finally:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+
+    def close(self):
+        self._dispatch.shutdown()
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if worker is not None:
+                worker.stop()
+
+
+# -----------------------
+# Client
+# -----------------------
+class CompileClient:
+    """Sends requests to a running server, or compiles in-process when there is none."""
+
+    def __init__(self, socket_path=None, connect_timeout=0.5, response_timeout=2 * DEFAULT_TIMEOUT):
+        """
+        Args:
+            response_timeout (float): seconds to wait for a response (at least
+                the request's own timeout plus START_TIMEOUT) before giving up
+                on the server and compiling in-process.
+        """
+        self.socket_path = socket_path or default_socket_path()
+        self.connect_timeout = connect_timeout
+        self.response_timeout = response_timeout
+        self._sock = None
+        self._rfile = None
+        self._next_id = 0
+        self._pipeline = None  # fallback, built on first use
+
+    def _connect(self):
+        if self._sock is not None:
+            return True
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.connect_timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            return False
+        self._sock = sock
+        self._rfile = sock.makefile('r', encoding='utf-8')
+        return True
+
+    @property
+    def connected(self):
+        return self._connect()
+
+    def compile(self, source, options=None, path=None, emit=DEFAULT_EMIT, timeout=None):
+        """Compile `source`, returning a response dict (see the module docstring)."""
+        self._next_id += 1
+        request = {'id': self._next_id, 'source': source, 'options': options or {},
+                   'path': path, 'emit': list(emit)}
+        if timeout is not None:
+            request['timeout'] = timeout
+        if self._connect():
+            try:
+                wait = self.response_timeout
+                if isinstance(timeout, (int, float)):
+                    wait = max(wait, timeout + START_TIMEOUT)
+                self._sock.settimeout(wait)
+                self._sock.sendall((json.dumps(request) + '\n').encode('utf-8'))
+                line = self._rfile.readline()
+                if line:
+                    return json.loads(line)
+            except OSError:
+                pass
+            self.close()
+        return self._compile_locally(request)
+
+    def _compile_locally(self, request):
+        t0 = time.perf_counter()
+        if self._pipeline is None:
+            self._pipeline = CompilerPipeline(jobs=1)
+        try:
+            response = handle_request(self._pipeline, request)
+        except Exception as e:
+            response = {'status': 'error', 'error': f"{type(e).__name__}: {e}"}
+        response['id'] = request['id']
+        response['seconds'] = round(time.perf_counter() - t0, 6)
+        response['local'] = True
+        return response
+
+    def close(self):
+        if self._sock is not None:
+            try:
+                self._rfile.close()
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._rfile = None
+
+
+def add_arguments(parser):
+    parser.add_argument('--stdio', action='store_true', help='serve JSON lines on stdin/stdout')
+    parser.add_argument('--socket', default=None, help='Unix socket path (default: per-user runtime dir)')
+    parser.add_argument('-j', '--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help='per-request timeout in seconds')
+    parser.add_argument('--cache-dir', default=None, help='compilation cache directory shared by the workers')
+
+
+def run(args):
+    server = CompileServer(args.workers, args.timeout, args.cache_dir)
+    try:
+        if args.stdio:
+            server.serve_stdio()
+        else:
+            path = args.socket or default_socket_path()
+            print(f"listening on {path}", file=sys.stderr)
+            server.serve_unix(path)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+    return 0
+
+
+if __name__ == '__main__':
+    import argparse
+    cli = argparse.ArgumentParser(description='Serve compile requests from warm worker processes.')
+    add_arguments(cli)
+    sys.exit(run(cli.parse_args()))
@@ -0,0 +1,124 @@
+"""
+Background compilation for the GUI.
+
+BackgroundCompiler owns its own CompilerPipeline on a worker thread. Every
+submit() bumps a generation counter; a compile that is overtaken by a newer
+submission is abandoned at the next phase boundary, and poll() only ever
+returns the result of the newest generation. The Tk main loop drives
+poll() with after(), so no Tk call is made from the worker thread.
+
+The pipeline runs with jobs=1: forking worker processes from a process
+that already runs Tk and other threads is unsafe.
+"""
+import queue
+import threading
+import time
+
+from pipeline import CompilerPipeline, CompilationCancelled
+
+
+def _in_process_pipeline():
+    return CompilerPipeline(jobs=1)
+
+
+class CompileOutcome:
+    """Result of one background compile, as handed back to the UI thread."""
+
+    def __init__(self, generation, result=None, seconds=0.0, error=None):
+        self.generation = generation
+        self.result = result
+        self.seconds = seconds
+        self.error = error
+
+
+class BackgroundCompiler:
+    """Runs compilations off the UI thread, keeping only the newest job."""
+
+    def __init__(self, pipeline_factory=_in_process_pipeline):
+        self.generation = 0
+        self._factory = pipeline_factory
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._pending = None  # (generation, source, options, instrumentation) waiting to run
+        self._closed = False
+        self._results = queue.Queue()
+        self._ready = threading.Event()
+        self.pipeline = None
+        self._thread = threading.Thread(target=self._run, name='compile-worker', daemon=True)
+        self._thread.start()
+
+    def wait_ready(self, timeout=None):
+        """Block until the worker has built its pipeline."""
+        return self._ready.wait(timeout)
+
+    def submit(self, source, options=None, instrumentation=None):
+        """
+        Queue `source` for compilation, replacing any job still waiting.
+
+        `instrumentation` (instrumentation.Instrumentation) is installed on the
+        worker's pipeline for this job only.
+        """
+        with self._lock:
+            self.generation += 1
+            self._pending = (self.generation, source, dict(options or {}), instrumentation)
+            self._wake.notify()
+            return self.generation
+
+    def cancel(self):
+        """Drop the waiting job and make the running one stale."""
+        with self._lock:
+            self.generation += 1
+            self._pending = None
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            self.generation += 1
+            self._pending = None
+            self._wake.notify()
+
+    def poll(self):
+        """Return the newest finished CompileOutcome, or None; stale ones are discarded."""
+        latest = None
+        while True:
+            try:
+                outcome = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if outcome.generation == self.generation:
+                latest = outcome
+        return latest
+
+    def _is_stale(self, generation):
+        return generation != self.generation
+
+    def _run(self):
+        self.pipeline = self._factory()
+        self._ready.set()
+        previous = None
+        while True:
+            with self._lock:
+                while self._pending is None and not self._closed:
+                    self._wake.wait()
+                if self._closed:
+                    self.pipeline.close()
+                    return
+                generation, source, options, instrumentation = self._pending
+                self._pending = None
+
+            if options != self.pipeline.options:
+                self.pipeline.options = options
+                previous = None
+            self.pipeline.instrumentation = instrumentation
+            t0 = time.perf_counter()
+            try:
+                result = self.pipeline.compile(
+                    source, previous=previous,
+                    should_cancel=lambda: self._is_stale(generation))
+            except CompilationCancelled:
+                continue
+            except Exception as e:
+                self._results.put(CompileOutcome(generation, error=f"{type(e).__name__}: {e}"))
+                continue
+            previous = result
+            self._results.put(CompileOutcome(generation, result, time.perf_counter() - t0))
@@ -13,9 +13,14 @@ It also provides buttons to Open any file into the input area and Save the curre
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, filedialog
 from pathlib import Path
-from lexer import TokenScanner
-from parser import SyntaxProcessor
-from assembly_translator import AssemblyTranslator
+from pipeline import CompilerPipeline, format_ir_instruction
+from compile_cache import CompilationCache
+from compile_worker import BackgroundCompiler
+from instrumentation import Instrumentation
+from virtual_view import VirtualTableView
+
+DEBOUNCE_MS = 400   # idle time after an edit before compiling
+POLL_MS = 50        # how often the Tk loop collects finished compilations
 
 
 class CompilerInterface:
@@ -27,25 +32,32 @@ class CompilerInterface:
         self.window.geometry("1400x850")
         self.window.configure(bg='#1e1e1e')
 
-        # Initialize compiler components
-        self.scanner = TokenScanner()
-        try:
-            self.scanner.initialize()
-        except Exception:
-            pass
-
-        self.processor = SyntaxProcessor()
+        # Compiler components live on a worker thread (results are shared with
+        # batch tools via the cache)
         try:
-            self.processor.initialize()
+            cache = CompilationCache()
         except Exception:
-            pass
+            cache = None
+        self.options = {}
+        # jobs=1: no worker processes are forked from the threaded Tk process
+        self.compiler = BackgroundCompiler(lambda: CompilerPipeline(cache=cache, jobs=1))
 
-        self.translator = AssemblyTranslator()
+        # last compilation, reused while the buffer and options are unchanged
+        self._last_key = None
+        self._last_result = None
+        self._rendered = {}
+        self._debounce_id = None
 
         self.build_interface()
         # Load examples/test1.c on startup if present
         self.load_example_on_startup()
 
+        self.code_input.edit_modified(False)
+        self.code_input.bind('<<Modified>>', self._on_edit)
+        self.window.after(POLL_MS, self._poll_compiler)
+        self.run_compilation()
+        self.window.protocol("WM_DELETE_WINDOW", self._on_close)
+
     def build_interface(self):
         """Build the GUI components"""
         container = ttk.Frame(self.window, padding="10")
@@ -56,6 +68,11 @@ class CompilerInterface:
         container.columnconfigure(1, weight=1)
         container.rowconfigure(1, weight=1)
 
+        # Status bar (non-modal compile feedback)
+        self.status_var = tk.StringVar(value="Ready")
+        ttk.Label(container, textvariable=self.status_var, anchor=tk.W).grid(
+            row=3, column=0, columnspan=2, sticky=(tk.W, tk.E), padx=5)
+
         # Input Section
         input_panel = ttk.LabelFrame(container, text="Input Code", padding="10")
         input_panel.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=5, pady=5)
@@ -72,6 +89,15 @@ class CompilerInterface:
         ttk.Button(controls, text="Load examples/test1.c", command=self.load_example_file).pack(side=tk.LEFT, padx=4)
         ttk.Button(controls, text="Open...", command=self.open_file_dialog).pack(side=tk.LEFT, padx=4)
         ttk.Button(controls, text="Save As...", command=self.save_file_dialog).pack(side=tk.LEFT, padx=4)
+        self.profile_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(controls, text="Profile", variable=self.profile_var,
+                        command=self.run_compilation).pack(side=tk.LEFT, padx=4)
+        ttk.Label(controls, text="Opt:").pack(side=tk.LEFT, padx=(8, 2))
+        self.opt_var = tk.StringVar(value="-O0")
+        opt_box = ttk.Combobox(controls, textvariable=self.opt_var, values=("-O0", "-O1", "-O2"),
+                               width=5, state="readonly")
+        opt_box.pack(side=tk.LEFT, padx=2)
+        opt_box.bind("<<ComboboxSelected>>", self._on_opt_level)
 
         # Output Section
         output_panel = ttk.LabelFrame(container, text="Compilation Results", padding="10")
@@ -80,12 +106,13 @@ class CompilerInterface:
         self.tabs = ttk.Notebook(output_panel)
         self.tabs.pack(fill=tk.BOTH, expand=True)
 
-        # Create output tabs
-        self.make_tab("Token Stream", "tok_view")
-        self.make_tab("Symbol Table", "var_view")
-        self.make_tab("IR Code", "ir_view")
-        self.make_tab("Assembly", "asm_view")
+        # Create output tabs (large tables are virtualized)
+        self.make_table_tab("Token Stream", "tok_view")
+        self.make_table_tab("Symbol Table", "var_view")
+        self.make_table_tab("IR Code", "ir_view")
+        self.make_table_tab("Assembly", "asm_view")
         self.make_tab("Issues", "err_view")
+        self.make_tab("Stats", "stats_view")
 
     def make_tab(self, label, attr):
         """Create a new tab and store the ScrolledText widget on self."""
@@ -95,6 +122,14 @@ class CompilerInterface:
         view.pack(fill=tk.BOTH, expand=True)
         setattr(self, attr, view)
 
+    def make_table_tab(self, label, attr):
+        """Create a new tab holding a VirtualTableView and store it on self."""
+        frame = ttk.Frame(self.tabs)
+        self.tabs.add(frame, text=label)
+        view = VirtualTableView(frame, font=('Consolas', 10))
+        view.pack(fill=tk.BOTH, expand=True)
+        setattr(self, attr, view)
+
     # -----------------------
     # File loading / saving
     # -----------------------
@@ -157,108 +192,154 @@ class CompilerInterface:
     # -----------------------
     # Compilation pipeline
     # -----------------------
+    def _on_opt_level(self, _event=None):
+        level = int(self.opt_var.get()[2:])
+        if level:
+            self.options['opt_level'] = level
+        else:
+            self.options.pop('opt_level', None)
+        self.run_compilation()
+
     def run_compilation(self):
-        """Execute lexer -> parser/semantic -> IR -> assembly pipeline and show outputs."""
+        """Compile the buffer now (Compile button); the work runs on the worker thread."""
+        if self._debounce_id is not None:
+            self.window.after_cancel(self._debounce_id)
+            self._debounce_id = None
         src = self.code_input.get('1.0', tk.END)
 
-        # Clear all output views
-        for view in ['tok_view', 'var_view', 'ir_view', 'asm_view', 'err_view']:
-            getattr(self, view).delete('1.0', tk.END)
-
-        # Clear symbol table before compilation
-        try:
-            self.processor.registry.clear()
-        except Exception:
-            pass
-
-        # Phase 1: Lexical Analysis
-        tokens, lex_errs = self.scanner.scan(src)
-
-        tok_display = "TOKEN STREAM\n" + "=" * 70 + "\n\n"
-        tok_display += f"{'Type':<18} {'Value':<22} {'Line':<6} {'Col':<4}\n"
-        tok_display += "-" * 70 + "\n"
-        for tok in tokens:
-            tok_display += f"{tok['kind']:<18} {str(tok['val']):<22} {tok['ln']:<6} {tok.get('col',''):<4}\n"
-        self.tok_view.insert('1.0', tok_display)
-
-        # Phase 2 & 3: Syntax and Semantic Analysis
-        self.processor.process(src)
-
-        # Symbol Table Display
-        var_display = "SYMBOL TABLE\n" + "=" * 100 + "\n\n"
-        var_display += f"{'Identifier':<18} {'Type':<12} {'Context':<15} {'Scope':<20} {'Level':<6}\n"
-        var_display += "-" * 100 + "\n"
-        for entry in self.processor.registry.all_entries():
-            var_display += (
+        # Unchanged buffer and options: nothing to do
+        profile = self.profile_var.get()
+        key = (src, tuple(sorted(self.options.items())), profile)
+        if key == self._last_key:
+            return
+        self._last_key = key
+        # detailed counters, peak memory and a cProfile report when requested
+        instrumentation = Instrumentation(profile=True) if profile else None
+        self.compiler.submit(src, self.options, instrumentation)
+        self.status_var.set("Compiling...")
+
+    def _on_edit(self, event=None):
+        """Debounce edits: compile once typing has paused for DEBOUNCE_MS."""
+        if not self.code_input.edit_modified():
+            return
+        self.code_input.edit_modified(False)
+        if self._debounce_id is not None:
+            self.window.after_cancel(self._debounce_id)
+            self._debounce_id = None
+        if not self.code_input.get('1.0', tk.END).strip():
+            return
+        self._debounce_id = self.window.after(DEBOUNCE_MS, self.run_compilation)
+
+    def _poll_compiler(self):
+        outcome = self.compiler.poll()
+        if outcome is not None:
+            self._apply_outcome(outcome)
+        self.window.after(POLL_MS, self._poll_compiler)
+
+    def _on_close(self):
+        self.compiler.close()
+        self.window.destroy()
+
+    def _apply_outcome(self, outcome):
+        """Show the newest finished compilation (called on the Tk loop)."""
+        if outcome.error is not None:
+            self.status_var.set(f"Compiler error: {outcome.error}")
+            self._last_key = None
+            return
+        result = outcome.result
+        prev = self._last_result
+        self._last_result = result
+
+        # Only refill a tab when its input changed
+        if self._changed(result.tokens, prev and prev.tokens):
+            self._fill_tokens(result)
+        if self._changed(result.symbols, prev and prev.symbols):
+            self._fill_symbols(result)
+        if self._changed(result.ir, prev and prev.ir):
+            self._fill_ir(result)
+        if self._changed(result.asm, prev and prev.asm) or result.codegen_error != (prev and prev.codegen_error):
+            self._fill_asm(result)
+        self._show('err_view', self._render_issues(result))
+        self._show('stats_view', result.stats.format())
+
+        timing = f"{outcome.seconds * 1000:.0f} ms" + (" (cached)" if result.cached else "")
+        all_errs = result.issues
+        if all_errs:
+            self.status_var.set(f"⚠ Detected {len(all_errs)} issue(s) - see Issues tab [{timing}]")
+        else:
+            self.status_var.set(f"✓ Compiled without errors [{timing}]")
+
+    @staticmethod
+    def _changed(new, old):
+        return old is None or (new is not old and new != old)
+
+    def _show(self, attr, text):
+        """Replace a view's text, skipping the widget update if it is identical."""
+        if self._rendered.get(attr) == text:
+            return
+        view = getattr(self, attr)
+        view.delete('1.0', tk.END)
+        view.insert('1.0', text)
+        self._rendered[attr] = text
+
+    def _fill_tokens(self, result):
+        header = "\n".join(["TOKEN STREAM", "=" * 70, "",
+                            f"{'Type':<18} {'Value':<22} {'Line':<6} {'Col':<4}", "-" * 70])
+        self.tok_view.set_rows(
+            result.tokens,
+            lambda tok: f"{tok['kind']:<18} {str(tok['val']):<22} {tok['ln']:<6} {tok.get('col',''):<4}",
+            header)
+
+    def _fill_symbols(self, result):
+        header = "\n".join(["SYMBOL TABLE", "=" * 100, "",
+                            f"{'Identifier':<18} {'Type':<12} {'Context':<15} {'Scope':<20} {'Level':<6}",
+                            "-" * 100])
+        self.var_view.set_rows(
+            result.symbols,
+            lambda entry: (
                 f"{entry.get('id',''):<18} "
                 f"{entry.get('dtype',''):<12} "
                 f"{entry.get('ctx',''):<15} "
                 f"{entry.get('scope',''):<20} "
-                f"{entry.get('scope_level',''):<6}\n"
-            )
-        self.var_view.insert('1.0', var_display)
-
-        # IR Display
-        ir_display = "INTERMEDIATE REPRESENTATION\n" + "=" * 70 + "\n\n"
-        for idx, instr in enumerate(self.processor.ir_instructions):
-            op = instr.get('op')
-            s1 = instr.get('src1')
-            s2 = instr.get('src2')
-            d = instr.get('dst')
-            if op == 'assign':
-                ir_display += f"{idx + 1}. {d} := {s1}\n"
-            elif op in ['+', '-', '*', '/', '%']:
-                ir_display += f"{idx + 1}. {d} := {s1} {op} {s2}\n"
-            elif op in ['<', '<=', '>', '>=', '==', '!=']:
-                ir_display += f"{idx + 1}. {d} := {s1} {op} {s2}\n"
-            elif op == 'mark':
-                ir_display += f"{idx + 1}. {s1}:\n"
-            elif op == 'jump':
-                ir_display += f"{idx + 1}. goto {s1}\n"
-            elif op == 'jump_if_false':
-                ir_display += f"{idx + 1}. if_false {s1} goto {s2}\n"
-            elif op == 'output':
-                ir_display += f"{idx + 1}. print {s1}\n"
-            elif op == 'return':
-                ir_display += f"{idx + 1}. return {s1}\n"
-            else:
-                ir_display += f"{idx + 1}. {op} {s1} {s2} {d}\n"
-        self.ir_view.insert('1.0', ir_display)
-
-        # Phase 4: Code Generation (Assembly)
-        try:
-            asm = self.translator.translate(self.processor.ir_instructions)
-            asm_display = "ASSEMBLY OUTPUT\n" + "=" * 70 + "\n\n" + "\n".join(asm)
-            self.asm_view.insert('1.0', asm_display)
-        except Exception as e:
-            self.asm_view.insert('1.0', f"Code generation failed: {e}")
-
-        # Errors / Issues
-        all_errs = []
-        if lex_errs:
-            all_errs.extend(lex_errs)
-        if self.processor.issues:
-            all_errs.extend(self.processor.issues)
-
-        if all_errs:
-            err_display = "COMPILATION ISSUES\n" + "=" * 70 + "\n\n"
-            for idx, err in enumerate(all_errs, 1):
-                err_display += f"{idx}. {err}\n"
-            self.err_view.insert('1.0', err_display)
-            messagebox.showwarning("Issues Found", f"Detected {len(all_errs)} issue(s)")
-        else:
-            self.err_view.insert('1.0', "✓ Compilation completed successfully!")
-            messagebox.showinfo("Success", "Code compiled without errors!")
+                f"{entry.get('scope_level',''):<6}"
+            ),
+            header)
+
+    def _fill_ir(self, result):
+        ir = result.ir
+        header = "\n".join(["INTERMEDIATE REPRESENTATION", "=" * 70])
+        self.ir_view.set_rows(range(len(ir)), lambda idx: f"{idx + 1}. {format_ir_instruction(ir[idx])}", header)
+
+    def _fill_asm(self, result):
+        if result.codegen_error is not None:
+            self.asm_view.set_rows([result.codegen_error], str, "ASSEMBLY OUTPUT")
+            return
+        self.asm_view.set_rows(result.asm, str, "\n".join(["ASSEMBLY OUTPUT", "=" * 70]))
+
+    def _render_issues(self, result):
+        all_errs = result.issues
+        if not all_errs:
+            return "✓ Compilation completed successfully!"
+        lines = ["COMPILATION ISSUES", "=" * 70, ""]
+        for idx, err in enumerate(all_errs, 1):
+            lines.append(f"{idx}. {err}")
+        return '\n'.join(lines) + '\n'
 
     def reset_all(self):
         """Clear all input and output fields and reset registry."""
         self.code_input.delete('1.0', tk.END)
-        for view in ['tok_view', 'var_view', 'ir_view', 'asm_view', 'err_view']:
-            getattr(self, view).delete('1.0', tk.END)
-        try:
-            self.processor.registry.clear()
-        except Exception:
-            pass
+        for view in ['tok_view', 'var_view', 'ir_view', 'asm_view']:
+            getattr(self, view).clear()
+        self.err_view.delete('1.0', tk.END)
+        self.stats_view.delete('1.0', tk.END)
+        self.compiler.cancel()
+        if self._debounce_id is not None:
+            self.window.after_cancel(self._debounce_id)
+            self._debounce_id = None
+        self._last_key = None
+        self._last_result = None
+        self._rendered = {}
+        self.status_var.set("Ready")
 
 
 def main():
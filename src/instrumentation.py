@@ -0,0 +1,207 @@
+"""
+Compile statistics and optional pipeline instrumentation.
+
+Every compile returns a CompileStats with per-phase wall/CPU time and
+output sizes; recording those costs a few clock reads per phase.
+
+Instrumentation adds detailed counters (parser reductions, registry
+lookups, maximum scope depth), peak traced memory and an optional cProfile
+capture. Its hooks are installed on the component instances only for the
+duration of one compile and removed afterwards, so an uninstrumented
+pipeline runs the original methods unchanged.
+"""
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+
+
+def count_asm_instructions(asm):
+    """Number of instruction lines (indented, not comments) in assembly output."""
+    n = 0
+    for line in asm:
+        if line[:1] in (' ', '\t'):
+            text = line.lstrip()
+            if text and text[0] != ';':
+                n += 1
+    return n
+
+
+class CompileStats:
+    """Metrics for one compilation."""
+
+    def __init__(self):
+        self.phases = {}      # name -> {'wall': seconds, 'cpu': seconds}
+        self.counters = {}    # name -> number
+        self.peak_memory = None
+        self.profile = None   # cProfile report text
+        self.passes = []      # IR pass records (ir_optimizer.PassManager.report)
+
+    class _PhaseTimer:
+        __slots__ = ('stats', 'name', 'wall', 'cpu')
+
+        def __init__(self, stats, name):
+            self.stats = stats
+            self.name = name
+
+        def __enter__(self):
+            self.wall = time.perf_counter()
+            self.cpu = time.thread_time()
+            return self
+
+        def __exit__(self, *exc):
+            # a phase entered repeatedly (streamed pieces) accumulates
+            t = self.stats.phases.setdefault(self.name, {'wall': 0.0, 'cpu': 0.0})
+            t['wall'] += time.perf_counter() - self.wall
+            t['cpu'] += time.thread_time() - self.cpu
+            return False
+
+    def phase(self, name):
+        """Context manager timing one phase."""
+        return self._PhaseTimer(self, name)
+
+    @property
+    def total_wall(self):
+        return sum(p['wall'] for p in self.phases.values())
+
+    def as_dict(self):
+        return {
+            'phases': {k: dict(v) for k, v in self.phases.items()},
+            'counters': dict(self.counters),
+            'peak_memory': self.peak_memory,
+            'passes': [dict(r) for r in self.passes],
+        }
+
+    def _format_passes(self):
+        """Pass records summed across function units, in pipeline order."""
+        totals = {}
+        for r in self.passes:
+            t = totals.setdefault((r['iteration'], r['step'], r['pass']), {'seconds': 0.0, 'before': 0, 'after': 0})
+            t['seconds'] += r['seconds']
+            t['before'] += r['before']
+            t['after'] += r['after']
+        lines = [f"{'Pass':<18} {'Iter':>4} {'Time (ms)':>10} {'Before':>8} {'After':>8}"]
+        for (iteration, _step, name), t in sorted(totals.items()):
+            lines.append(f"{name:<18} {iteration:>4} {t['seconds'] * 1000:>10.3f} "
+                         f"{t['before']:>8} {t['after']:>8}")
+        return '\n'.join(lines)
+
+    def format(self):
+        """Human-readable report (GUI Stats tab)."""
+        lines = ["COMPILE STATISTICS", "=" * 70, ""]
+        lines.append(f"{'Phase':<14} {'Wall (ms)':>12} {'CPU (ms)':>12}")
+        lines.append("-" * 40)
+        for name, t in self.phases.items():
+            lines.append(f"{name:<14} {t['wall'] * 1000:>12.3f} {t['cpu'] * 1000:>12.3f}")
+        lines.append(f"{'total':<14} {self.total_wall * 1000:>12.3f}")
+        lines.append("")
+        for name, value in self.counters.items():
+            if isinstance(value, float):
+                value = f"{value:,.1f}"
+            lines.append(f"{name:<24} {value}")
+        if self.peak_memory is not None:
+            lines.append(f"{'peak_memory_bytes':<24} {self.peak_memory:,}")
+        if self.passes:
+            lines += ["", "IR PASSES", "-" * 70, self._format_passes()]
+        if self.profile:
+            lines += ["", "PROFILE (top functions by cumulative time)", "-" * 70, self.profile]
+        return '\n'.join(lines) + '\n'
+
+
+class Instrumentation:
+    """Detailed counters, memory tracking and profiling for a CompilerPipeline."""
+
+    def __init__(self, memory=True, profile=False, profile_limit=25):
+        self.memory = memory
+        self.profile = profile
+        self.profile_limit = profile_limit
+        self.reductions = 0
+        self.lookups = 0
+        self.max_scope_depth = 0
+        self._restore = []
+        self._profiler = None
+        self._started_tracemalloc = False
+
+    def begin(self, pipeline):
+        """Install the hooks on `pipeline` and start memory/profile capture."""
+        self.reductions = 0
+        self.lookups = 0
+        self.max_scope_depth = 0
+        self._install_hooks(pipeline)
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if self.memory:
+            tracemalloc.reset_peak()
+        if self.profile:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def end(self, stats):
+        """Remove the hooks and copy the collected metrics into `stats`."""
+        if self._profiler is not None:
+            self._profiler.disable()
+            out = io.StringIO()
+            pstats.Stats(self._profiler, stream=out).sort_stats('cumulative').print_stats(self.profile_limit)
+            stats.profile = out.getvalue()
+            self._profiler = None
+        if self.memory and tracemalloc.is_tracing():
+            stats.peak_memory = tracemalloc.get_traced_memory()[1]
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+                self._started_tracemalloc = False
+        for undo in reversed(self._restore):
+            undo()
+        self._restore = []
+        stats.counters['reductions'] = self.reductions
+        stats.counters['registry_lookups'] = self.lookups
+        stats.counters['max_scope_depth'] = self.max_scope_depth
+
+    def _install_hooks(self, pipeline):
+        inst = self
+
+        # parser reductions: wrap each production's action
+        lr = pipeline.processor.processor
+        if lr is not None:
+            saved = [(prod, prod.callable) for prod in lr.productions]
+
+            def counted(fn):
+                def action(p):
+                    inst.reductions += 1
+                    return fn(p)
+                return action
+
+            for prod, fn in saved:
+                # productions without an action are reduced without a call, so they are not counted
+                if fn is not None:
+                    prod.callable = counted(fn)
+
+            def undo_productions():
+                for prod, fn in saved:
+                    prod.callable = fn
+            self._restore.append(undo_productions)
+
+        # registry lookups and scope depth: shadow the methods on the instance
+        registry = pipeline.processor.registry
+        find = registry.find
+        push_scope = registry.push_scope
+
+        def counted_find(identifier):
+            inst.lookups += 1
+            return find(identifier)
+
+        def tracked_push_scope(*args, **kwargs):
+            res = push_scope(*args, **kwargs)
+            depth = registry.get_scope_level()
+            if depth > inst.max_scope_depth:
+                inst.max_scope_depth = depth
+            return res
+
+        registry.find = counted_find
+        registry.push_scope = tracked_push_scope
+
+        def undo_registry():
+            del registry.find
+            del registry.push_scope
+        self._restore.append(undo_registry)
@@ -0,0 +1,134 @@
+"""
+Operand kinds for the translator and the optimiser: a per-compile table of
+tagged names.
+
+Each distinct identifier, temp and label becomes one Symbol when it is
+first seen (by the lexer for identifiers, by the parser for temps and
+labels). A Symbol is a str subclass carrying its `kind` (and its index in
+the table, `id`), so the registry, the IR, the dumps and the cache keep
+working on names unchanged. The gain is local to the consumers of operand
+kinds: the translator recognises variables with `type(x) is Symbol` and
+tells labels apart by `kind`, and ir_optimizer.is_temp reads the kind,
+instead of matching each operand against a regex. A Symbol pickles as a
+Symbol, so function units translated in a process pool take the same path.
+
+The IR still holds names, not integer ids. benchmark() measures the effect;
+it is small (a few percent of translation time).
+
+Plain strings are still accepted everywhere (hand-written IR, cached
+results), through the regex checks.
+"""
+IDENT = 'ident'
+TEMP = 'temp'
+LABEL = 'label'
+
+
+class Symbol(str):
+    """A name tagged with its operand kind and its id in one compile's InternTable."""
+
+    def __new__(cls, name, id=None, kind=IDENT):
+        sym = super().__new__(cls, name)
+        sym.id = id
+        sym.kind = kind
+        return sym
+
+    def __reduce__(self):
+        # keep the kind across process pools (the default would drop the attributes)
+        return (Symbol, (str(self), self.id, self.kind))
+
+
+class InternTable:
+    """Maps names to Symbols with ids 0, 1, 2, ... in first-seen order."""
+
+    def __init__(self):
+        self._by_name = {}
+        self.symbols = []  # id -> Symbol
+
+    def intern(self, name, kind=IDENT):
+        sym = self._by_name.get(name)
+        if sym is None:
+            sym = Symbol(name, len(self.symbols), kind)
+            self._by_name[name] = sym
+            self.symbols.append(sym)
+        return sym
+
+    def lookup(self, name):
+        """The Symbol for `name`, or None if it was never interned."""
+        return self._by_name.get(name)
+
+    def name(self, symbol_id):
+        """Resolve an id back to its plain string."""
+        return str(self.symbols[symbol_id])
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __contains__(self, name):
+        return name in self._by_name
+
+
+def plain(value):
+    """`value` with any Symbol replaced by an exact str."""
+    return str(value) if type(value) is Symbol else value
+
+
+def plain_ir(ir_code):
+    """Copy of `ir_code` whose operands are plain strings (no Symbols)."""
+    return [{k: plain(v) for k, v in instr.items()} for instr in ir_code]
+
+
+def benchmark(lines=20000, seed=0, repeat=5):
+    """
+    Compare the registry- and translator-facing work with and without interning.
+
+    The same IR is translated once with Symbol operands and once with plain
+    strings; `regex_checks_avoided` counts the operand checks that skipped the
+    identifier regex.
+    """
+    import time
+    from assembly_translator import AssemblyTranslator
+    from pipeline import CompilerPipeline
+    from program_generator import ProgramGenerator
+
+    source = ProgramGenerator(seed=seed).generate(lines)
+    result = CompilerPipeline().compile(source)
+    interned = result.ir
+    strings = plain_ir(interned)
+    translator = AssemblyTranslator()
+
+    def best(fn, arg):
+        times = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            fn(arg)
+            times.append(time.perf_counter() - t0)
+        return min(times)
+
+    operands = [x for instr in interned for x in (instr['src1'], instr['src2'], instr['dst'])]
+    names = [x for x in operands if isinstance(x, str)]
+    plain_names = [str(x) for x in names]
+
+    def dict_probe(keys):
+        table = {}
+        for k in keys:
+            table[k] = table.get(k, 0) + 1
+
+    return {
+        'lines': lines,
+        'ir_instructions': len(interned),
+        'distinct_names': len({str(n) for n in names}),
+        'regex_checks_avoided': sum(1 for x in operands if type(x) is Symbol),
+        'translate_interned': best(translator.translate, interned),
+        'translate_plain': best(translator.translate, strings),
+        'dict_probe_interned': best(dict_probe, names),
+        'dict_probe_plain': best(dict_probe, plain_names),
+    }
+
+
+if __name__ == '__main__':
+    import sys
+    # run through the importable module so Symbol is the same class the compiler uses
+    from interning import benchmark
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    for key, value in benchmark(size).items():
+        print(f"{key:<24} {value:.6f}" if isinstance(value, float) else f"{key:<24} {value}")
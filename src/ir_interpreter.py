@@ -0,0 +1,377 @@
+"""
+Execution engine for the dict-based IR produced by SyntaxProcessor.
+
+Runs `ir_instructions` directly, without an assembler or linker:
+- labels are resolved to instruction indices once, when the IR is loaded
+- variables, temps and constants live in one flat slot list
+- instructions are executed through an opcode dispatch table, or, in
+  'blocks' mode, each basic block is compiled into a Python function
+"""
+import math
+import time
+
+
+class IRExecutionError(Exception):
+    """Raised for malformed IR or a runtime fault (division by zero, step limit)."""
+
+
+def c_div(a, b):
+    """C division: truncates toward zero for integers, true division for floats."""
+    if b == 0:
+        raise IRExecutionError("Division by zero")
+    if isinstance(a, int) and isinstance(b, int):
+        q = abs(a) // abs(b)
+        return q if (a < 0) == (b < 0) else -q
+    return a / b
+
+
+def c_mod(a, b):
+    """C remainder: the result takes the sign of the dividend."""
+    if b == 0:
+        raise IRExecutionError("Division by zero")
+    if isinstance(a, int) and isinstance(b, int):
+        r = abs(a) % abs(b)
+        return r if a >= 0 else -r
+    return math.fmod(a, b)
+
+
+def format_value(value):
+    """Format a printed value the way print() in the source language shows it."""
+    if isinstance(value, float):
+        return f"{value:g}"
+    return str(value)
+
+
+ARITH_OPS = ('+', '-', '*', '/', '%')
+REL_OPS = ('<', '<=', '>', '>=', '==', '!=')
+
+# opcode numbers used by the dispatch table
+OP_ASSIGN, OP_ADD, OP_SUB, OP_MUL, OP_DIV, OP_MOD = range(6)
+OP_LT, OP_LE, OP_GT, OP_GE, OP_EQ, OP_NE = range(6, 12)
+OP_JUMP, OP_JUMP_IF_FALSE, OP_OUTPUT, OP_RETURN = range(12, 16)
+
+OPCODES = {
+    'assign': OP_ASSIGN,
+    '+': OP_ADD, '-': OP_SUB, '*': OP_MUL, '/': OP_DIV, '%': OP_MOD,
+    '<': OP_LT, '<=': OP_LE, '>': OP_GT, '>=': OP_GE, '==': OP_EQ, '!=': OP_NE,
+    'jump': OP_JUMP, 'jump_if_false': OP_JUMP_IF_FALSE,
+    'output': OP_OUTPUT, 'return': OP_RETURN,
+}
+
+# Python source templates used when compiling basic blocks ('blocks' mode)
+_EXPR_TEMPLATES = {
+    OP_ADD: "s[{a}] + s[{b}]", OP_SUB: "s[{a}] - s[{b}]", OP_MUL: "s[{a}] * s[{b}]",
+    OP_DIV: "_div(s[{a}], s[{b}])", OP_MOD: "_mod(s[{a}], s[{b}])",
+    OP_LT: "1 if s[{a}] < s[{b}] else 0", OP_LE: "1 if s[{a}] <= s[{b}] else 0",
+    OP_GT: "1 if s[{a}] > s[{b}] else 0", OP_GE: "1 if s[{a}] >= s[{b}] else 0",
+    OP_EQ: "1 if s[{a}] == s[{b}] else 0", OP_NE: "1 if s[{a}] != s[{b}] else 0",
+}
+
+
+class IRInterpreter:
+    """Executes SyntaxProcessor IR and captures everything it prints."""
+
+    def __init__(self, max_steps=None):
+        self.max_steps = max_steps
+        self.output = []
+        self.return_value = None
+        self.steps = 0
+        self.slot_names = []
+        self._slot_of = {}
+        self._initial_slots = []
+        self._slots = []
+        self._code = []
+        self._labels = {}
+        self._blocks = None
+        self._block_sizes = None
+        self._block_ret = None
+
+    # -----------------------
+    # Loading / decoding
+    # -----------------------
+    def _slot(self, operand):
+        """Return the slot index for a variable name or constant."""
+        key = (type(operand), operand) if not isinstance(operand, str) else operand
+        idx = self._slot_of.get(key)
+        if idx is None:
+            idx = len(self._initial_slots)
+            self._slot_of[key] = idx
+            if isinstance(operand, str):
+                self.slot_names.append(operand)
+                self._initial_slots.append(0)  # same as the `dq 0` data section
+            else:
+                self.slot_names.append(None)
+                self._initial_slots.append(operand)
+        return idx
+
+    def load(self, ir_code):
+        """Decode IR into (opcode, a, b, d) tuples over slot indices."""
+        self.slot_names = []
+        self._slot_of = {}
+        self._initial_slots = []
+        self._labels = {}
+        self._blocks = None
+        self._block_sizes = None
+
+        # marks are dropped; each label maps to the index of the next real instruction
+        pending = []
+        for instr in ir_code:
+            op = instr.get('op')
+            if op == 'mark':
+                lbl = instr.get('src1')
+                if lbl in self._labels:
+                    raise IRExecutionError(f"Duplicate label {lbl!r}")
+                self._labels[lbl] = len(pending)
+            elif op in OPCODES:
+                pending.append(instr)
+            else:
+                raise IRExecutionError(f"Unsupported IR op {op!r}")
+
+        code = []
+        for instr in pending:
+            opcode = OPCODES[instr.get('op')]
+            s1 = instr.get('src1')
+            s2 = instr.get('src2')
+            d = instr.get('dst')
+            if opcode == OP_JUMP:
+                code.append((opcode, self._target(s1), 0, 0))
+            elif opcode == OP_JUMP_IF_FALSE:
+                code.append((opcode, self._slot(s1), self._target(s2), 0))
+            elif opcode in (OP_OUTPUT, OP_RETURN):
+                code.append((opcode, self._slot(s1), 0, 0))
+            elif opcode == OP_ASSIGN:
+                code.append((opcode, self._slot(s1), 0, self._slot(d)))
+            else:
+                code.append((opcode, self._slot(s1), self._slot(s2), self._slot(d)))
+        self._code = code
+        return self
+
+    def _target(self, label):
+        if label not in self._labels:
+            raise IRExecutionError(f"Jump to undefined label {label!r}")
+        return self._labels[label]
+
+    # -----------------------
+    # Execution
+    # -----------------------
+    def run(self, ir_code=None, mode='dispatch'):
+        """
+        Execute the loaded IR (or load `ir_code` first).
+
+        Args:
+            mode (str): 'dispatch' for the opcode table loop, 'blocks' for
+                compiled basic blocks.
+
+        Returns:
+            list: the lines printed by the program.
+        """
+        if ir_code is not None:
+            self.load(ir_code)
+        self.output = []
+        self.return_value = None
+        self.steps = 0
+        if mode == 'dispatch':
+            self._run_dispatch()
+        elif mode == 'blocks':
+            self._run_blocks()
+        else:
+            raise ValueError(f"Unknown execution mode {mode!r}")
+        return self.output
+
+    def variables(self):
+        """Return a name -> value dict of the slots after the last run."""
+        slots = self._slots or self._initial_slots
+        return {name: slots[i] for i, name in enumerate(self.slot_names) if name is not None}
+
+    def _make_table(self, s, emit):
+        """Build the opcode -> handler table; each handler returns the next pc."""
+        interp = self
+        end = len(self._code)
+
+        def do_assign(a, b, d, pc):
+            s[d] = s[a]
+            return pc + 1
+
+        def binary(fn):
+            def handler(a, b, d, pc):
+                s[d] = fn(s[a], s[b])
+                return pc + 1
+            return handler
+
+        def do_jump(a, b, d, pc):
+            return a
+
+        def do_jump_if_false(a, b, d, pc):
+            return pc + 1 if s[a] else b
+
+        def do_output(a, b, d, pc):
+            emit(format_value(s[a]))
+            return pc + 1
+
+        def do_return(a, b, d, pc):
+            interp.return_value = s[a]
+            return end
+
+        return [
+            do_assign,
+            binary(lambda x, y: x + y), binary(lambda x, y: x - y),
+            binary(lambda x, y: x * y), binary(c_div), binary(c_mod),
+            binary(lambda x, y: 1 if x < y else 0), binary(lambda x, y: 1 if x <= y else 0),
+            binary(lambda x, y: 1 if x > y else 0), binary(lambda x, y: 1 if x >= y else 0),
+            binary(lambda x, y: 1 if x == y else 0), binary(lambda x, y: 1 if x != y else 0),
+            do_jump, do_jump_if_false, do_output, do_return,
+        ]
+
+    def _run_dispatch(self):
+        s = self._slots = list(self._initial_slots)
+        table = self._make_table(s, self.output.append)
+        code = self._code
+        end = len(code)
+        limit = self.max_steps
+        pc = 0
+        steps = 0
+        if limit is None:
+            while pc < end:
+                op, a, b, d = code[pc]
+                pc = table[op](a, b, d, pc)
+                steps += 1
+        else:
+            while pc < end:
+                if steps >= limit:
+                    self.steps = steps
+                    raise IRExecutionError(f"Step limit of {limit} exceeded")
+                op, a, b, d = code[pc]
+                pc = table[op](a, b, d, pc)
+                steps += 1
+        self.steps = steps
+
+    # -----------------------
+    # Basic block compilation
+    # -----------------------
+    def _split_blocks(self):
+        """Return sorted leader indices of the basic blocks."""
+        code = self._code
+        leaders = {0}
+        for pc, (op, a, b, d) in enumerate(code):
+            if op == OP_JUMP:
+                leaders.add(a)
+                leaders.add(pc + 1)
+            elif op == OP_JUMP_IF_FALSE:
+                leaders.add(b)
+                leaders.add(pc + 1)
+            elif op == OP_RETURN:
+                leaders.add(pc + 1)
+        return sorted(x for x in leaders if x < len(code))
+
+    def compile_blocks(self):
+        """Compile each basic block to a function `block(s, emit) -> next block or -1`."""
+        code = self._code
+        leaders = self._split_blocks()
+        block_of = {pc: i for i, pc in enumerate(leaders)}
+        block_of[len(code)] = -1
+
+        src = []
+        sizes = []
+        for i, start in enumerate(leaders):
+            stop = leaders[i + 1] if i + 1 < len(leaders) else len(code)
+            sizes.append(stop - start)
+            src.append(f"def _b{i}(s, emit):")
+            terminated = False
+            for op, a, b, d in code[start:stop]:
+                if op == OP_ASSIGN:
+                    src.append(f"    s[{d}] = s[{a}]")
+                elif op in _EXPR_TEMPLATES:
+                    src.append(f"    s[{d}] = " + _EXPR_TEMPLATES[op].format(a=a, b=b))
+                elif op == OP_OUTPUT:
+                    src.append(f"    emit(_fmt(s[{a}]))")
+                elif op == OP_JUMP:
+                    src.append(f"    return {block_of[a]}")
+                    terminated = True
+                elif op == OP_JUMP_IF_FALSE:
+                    src.append(f"    if not s[{a}]:")
+                    src.append(f"        return {block_of[b]}")
+                elif op == OP_RETURN:
+                    src.append(f"    _ret.append(s[{a}])")
+                    src.append("    return -1")
+                    terminated = True
+            if not terminated:
+                src.append(f"    return {block_of[stop]}")
+        src.append(f"_blocks = [{', '.join(f'_b{i}' for i in range(len(leaders)))}]")
+
+        ns = {'_div': c_div, '_mod': c_mod, '_fmt': format_value, '_ret': []}
+        exec(compile('\n'.join(src), '<ir-blocks>', 'exec'), ns)
+        self._blocks = ns['_blocks']
+        self._block_sizes = sizes
+        self._block_ret = ns['_ret']
+        return self._blocks
+
+    def _run_blocks(self):
+        if self._blocks is None:
+            self.compile_blocks()
+        s = self._slots = list(self._initial_slots)
+        emit = self.output.append
+        blocks = self._blocks
+        sizes = self._block_sizes
+        ret = self._block_ret
+        ret.clear()
+        limit = self.max_steps
+        steps = 0
+        b = 0 if blocks else -1
+        while b >= 0:
+            if limit is not None and steps >= limit:
+                self.steps = steps
+                raise IRExecutionError(f"Step limit of {limit} exceeded")
+            steps += sizes[b]
+            b = blocks[b](s, emit)
+        if ret:
+            self.return_value = ret[0]
+        self.steps = steps
+
+
+def benchmark(ir_code, repeat=3, modes=('dispatch', 'blocks')):
+    """
+    Measure executed IR instructions per second for each execution mode.
+
+    Returns:
+        dict: mode -> {'steps', 'seconds', 'ips'} using the best of `repeat` runs.
+    """
+    results = {}
+    for mode in modes:
+        interp = IRInterpreter().load(ir_code)
+        if mode == 'blocks':
+            interp.compile_blocks()
+        best = None
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            interp.run(mode=mode)
+            elapsed = time.perf_counter() - t0
+            best = elapsed if best is None else min(best, elapsed)
+        results[mode] = {
+            'steps': interp.steps,
+            'seconds': best,
+            'ips': interp.steps / best if best else float('inf'),
+        }
+    return results
+
+
+if __name__ == '__main__':
+    # counting loop: sum of i % 7 for i in [0, n)
+    n = 200000
+    loop_ir = [
+        {'op': 'assign', 'src1': 0, 'src2': None, 'dst': 'i'},
+        {'op': 'assign', 'src1': 0, 'src2': None, 'dst': 'total'},
+        {'op': 'mark', 'src1': 'Label1', 'src2': None, 'dst': None},
+        {'op': '<', 'src1': 'i', 'src2': n, 'dst': 'temp1'},
+        {'op': 'jump_if_false', 'src1': 'temp1', 'src2': 'Label2', 'dst': None},
+        {'op': '%', 'src1': 'i', 'src2': 7, 'dst': 'temp2'},
+        {'op': '+', 'src1': 'total', 'src2': 'temp2', 'dst': 'temp3'},
+        {'op': 'assign', 'src1': 'temp3', 'src2': None, 'dst': 'total'},
+        {'op': '+', 'src1': 'i', 'src2': 1, 'dst': 'temp4'},
+        {'op': 'assign', 'src1': 'temp4', 'src2': None, 'dst': 'i'},
+        {'op': 'jump', 'src1': 'Label1', 'src2': None, 'dst': None},
+        {'op': 'mark', 'src1': 'Label2', 'src2': None, 'dst': None},
+        {'op': 'output', 'src1': 'total', 'src2': None, 'dst': None},
+    ]
+    print("OUTPUT:", IRInterpreter().run(loop_ir))
+    for mode, res in benchmark(loop_ir).items():
+        print(f"{mode:<10} {res['steps']:>10} instrs  {res['seconds']:.4f}s  {res['ips'] / 1e6:.2f} M instr/s")
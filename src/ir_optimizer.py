@@ -0,0 +1,353 @@
+"""
+IR optimisation passes, the pass manager that runs them, and an IR verifier.
+
+A pass is a function taking an IR list (SyntaxProcessor.ir_instructions
+format) and returning a new one; it never mutates its input, so the parser's
+IR and earlier results stay intact. Passes are registered by name in PASSES
+and grouped into pipelines per optimisation level:
+
+- O0: nothing
+- O1: constant folding, copy/constant propagation, dead temp elimination
+- O2: O1 plus jump-to-next removal, unreachable code and unused label
+      removal, iterated until the IR stops changing
+
+Arithmetic is folded with the same semantics as the IR interpreter (C
+truncating division and remainder); results that do not fit a signed
+64-bit register, and divisions by zero, are left for run time.
+"""
+import re
+import time
+
+from interning import Symbol, TEMP
+from ir_interpreter import ARITH_OPS, REL_OPS, c_div, c_mod
+
+PASSES = {}
+
+INT64_MIN = -(1 << 63)
+INT64_MAX = (1 << 63) - 1
+
+_temp_re = re.compile(r'^temp\d+$')
+
+
+class IRVerificationError(Exception):
+    """Raised by the pass manager when the IR fails verification after a pass."""
+
+
+def register_pass(name):
+    """Decorator adding an IR pass to PASSES."""
+    def decorate(fn):
+        PASSES[name] = fn
+        return fn
+    return decorate
+
+
+def is_const(x):
+    return isinstance(x, (int, float)) and not isinstance(x, bool)
+
+
+def is_temp(x):
+    if type(x) is Symbol:
+        return x.kind == TEMP
+    return isinstance(x, str) and bool(_temp_re.match(x))
+
+
+def _instr(op, s1=None, s2=None, d=None):
+    return {'op': op, 'src1': s1, 'src2': s2, 'dst': d}
+
+
+def _uses(instr):
+    """Operands read by `instr` (labels are not operands)."""
+    op = instr['op']
+    if op in ARITH_OPS or op in REL_OPS:
+        return (instr['src1'], instr['src2'])
+    if op in ('assign', 'output', 'return', 'jump_if_false'):
+        return (instr['src1'],)
+    return ()
+
+
+def _fold(op, a, b):
+    """Value of `a op b`, or None when it must be left to run time."""
+    try:
+        if op == '+':
+            v = a + b
+        elif op == '-':
+            v = a - b
+        elif op == '*':
+            v = a * b
+        elif op == '/':
+            if b == 0:
+                return None
+            v = c_div(a, b)
+        elif op == '%':
+            if b == 0:
+                return None
+            v = c_mod(a, b)
+        elif op == '<':
+            v = 1 if a < b else 0
+        elif op == '<=':
+            v = 1 if a <= b else 0
+        elif op == '>':
+            v = 1 if a > b else 0
+        elif op == '>=':
+            v = 1 if a >= b else 0
+        elif op == '==':
+            v = 1 if a == b else 0
+        else:
+            v = 1 if a != b else 0
+    except (ArithmeticError, ValueError):
+        return None
+    if isinstance(v, int) and not INT64_MIN <= v <= INT64_MAX:
+        return None
+    return v
+
+
+# -----------------------
+# Passes
+# -----------------------
+@register_pass('constant-fold')
+def constant_fold(ir):
+    """Evaluate operations on constants; turn constant branches into jumps."""
+    out = []
+    for instr in ir:
+        op = instr['op']
+        if op in ARITH_OPS or op in REL_OPS:
+            a, b = instr['src1'], instr['src2']
+            if is_const(a) and is_const(b):
+                v = _fold(op, a, b)
+                if v is not None:
+                    out.append(_instr('assign', v, None, instr['dst']))
+                    continue
+        elif op == 'jump_if_false' and is_const(instr['src1']):
+            if instr['src1'] == 0:
+                out.append(_instr('jump', instr['src2']))
+            continue
+        out.append(instr)
+    return out
+
+
+@register_pass('copy-propagation')
+def copy_propagation(ir):
+    """
+    Within each basic block, replace reads of names holding a known constant,
+    and of temps holding a copy of another name, by that value; operations
+    whose operands all become constant are folded on the spot.
+    """
+    out = []
+    known = {}  # name -> constant or name
+    for instr in ir:
+        op = instr['op']
+        if op == 'mark':
+            known.clear()
+            out.append(instr)
+            continue
+        new = instr
+        if known:
+            s1, s2 = instr['src1'], instr['src2']
+            r1 = known.get(s1, s1) if isinstance(s1, str) and op not in ('jump',) else s1
+            r2 = known.get(s2, s2) if isinstance(s2, str) and (op in ARITH_OPS or op in REL_OPS) else s2
+            if r1 is not s1 or r2 is not s2:
+                new = _instr(op, r1, r2, instr['dst'])
+                # fold as we go, so chains of temps collapse in one sweep
+                if (op in ARITH_OPS or op in REL_OPS) and is_const(r1) and is_const(r2):
+                    v = _fold(op, r1, r2)
+                    if v is not None:
+                        new = _instr('assign', v, None, instr['dst'])
+                        op = 'assign'
+        out.append(new)
+
+        d = new['dst']
+        if d is not None:
+            # anything copied from `d` is stale now
+            for name in [k for k, v in known.items() if v == d and not is_const(v)]:
+                del known[name]
+            known.pop(d, None)
+            if op == 'assign':
+                v = new['src1']
+                if is_const(v) or (is_temp(d) and isinstance(v, str) and v != d):
+                    known[d] = v
+        if op in ('jump', 'jump_if_false', 'return'):
+            known.clear()
+    return out
+
+
+@register_pass('dead-temps')
+def dead_temps(ir):
+    """Drop side-effect-free instructions whose temp result is never read."""
+    changed = True
+    while changed:
+        used = set()
+        for instr in ir:
+            for x in _uses(instr):
+                if isinstance(x, str):
+                    used.add(x)
+        out = []
+        for instr in ir:
+            op, d = instr['op'], instr['dst']
+            if d is not None and is_temp(d) and d not in used and op != 'jump_if_false':
+                # a division by a run-time value may fault, keep it
+                if op not in ('/', '%') or (is_const(instr['src2']) and instr['src2'] != 0):
+                    continue
+            out.append(instr)
+        changed = len(out) != len(ir)
+        ir = out
+    return ir
+
+
+@register_pass('jump-to-next')
+def jump_to_next(ir):
+    """Remove jumps (and conditional jumps) to a label that immediately follows."""
+    out = []
+    n = len(ir)
+    for i, instr in enumerate(ir):
+        op = instr['op']
+        if op in ('jump', 'jump_if_false'):
+            target = instr['src1'] if op == 'jump' else instr['src2']
+            j = i + 1
+            while j < n and ir[j]['op'] == 'mark':
+                if ir[j]['src1'] == target:
+                    break
+                j += 1
+            if j < n and ir[j]['op'] == 'mark' and ir[j]['src1'] == target:
+                continue
+        out.append(instr)
+    return out
+
+
+@register_pass('unreachable')
+def unreachable(ir):
+    """Remove instructions between an unconditional jump or return and the next label."""
+    out = []
+    live = True
+    for instr in ir:
+        op = instr['op']
+        if op == 'mark':
+            live = True
+        if live:
+            out.append(instr)
+        if op in ('jump', 'return'):
+            live = False
+    return out
+
+
+@register_pass('unused-labels')
+def unused_labels(ir):
+    """Remove labels that no jump refers to."""
+    targets = set()
+    for instr in ir:
+        if instr['op'] == 'jump':
+            targets.add(instr['src1'])
+        elif instr['op'] == 'jump_if_false':
+            targets.add(instr['src2'])
+    return [instr for instr in ir if instr['op'] != 'mark' or instr['src1'] in targets]
+
+
+# -----------------------
+# Verification
+# -----------------------
+class IRVerifier:
+    """Structural checks on IR: labels, jump targets and temp definitions."""
+
+    def verify(self, ir):
+        """Return a list of problems (empty when the IR is well formed)."""
+        problems = []
+        labels = set()
+        for i, instr in enumerate(ir):
+            if instr.get('op') == 'mark':
+                lbl = instr.get('src1')
+                if lbl in labels:
+                    problems.append(f"#{i + 1}: label {lbl} defined twice")
+                labels.add(lbl)
+        defined = set()
+        for i, instr in enumerate(ir):
+            op = instr.get('op')
+            if op == 'jump' and instr.get('src1') not in labels:
+                problems.append(f"#{i + 1}: jump to undefined label {instr.get('src1')}")
+            elif op == 'jump_if_false' and instr.get('src2') not in labels:
+                problems.append(f"#{i + 1}: branch to undefined label {instr.get('src2')}")
+            for x in _uses(instr):
+                if is_temp(x) and x not in defined:
+                    problems.append(f"#{i + 1}: {x} used before definition")
+            d = instr.get('dst')
+            if d is not None:
+                defined.add(d)
+        return problems
+
+
+# -----------------------
+# Pass manager
+# -----------------------
+LEVELS = {
+    0: ([], False),
+    1: (['constant-fold', 'copy-propagation', 'constant-fold', 'dead-temps'], False),
+    2: (['constant-fold', 'copy-propagation', 'constant-fold', 'dead-temps',
+         'jump-to-next', 'unreachable', 'unused-labels'], True),
+}
+
+
+class PassManager:
+    """Runs a sequence of registered passes, optionally to a fixed point."""
+
+    def __init__(self, passes=(), fixed_point=False, max_iterations=10, verify=False):
+        for name in passes:
+            if name not in PASSES:
+                raise ValueError(f"unknown IR pass {name!r}")
+        self.passes = list(passes)
+        self.fixed_point = fixed_point
+        self.max_iterations = max_iterations
+        self.verify = verify
+        self.verifier = IRVerifier()
+        self.report = []  # one record per pass run: pass, iteration, step, seconds, before, after
+
+    @classmethod
+    def for_level(cls, level, verify=False):
+        if level not in LEVELS:
+            raise ValueError(f"unknown optimisation level {level!r} (use 0, 1 or 2)")
+        passes, fixed_point = LEVELS[level]
+        return cls(passes, fixed_point, verify=verify)
+
+    def _check(self, ir, after):
+        problems = self.verifier.verify(ir)
+        if problems:
+            raise IRVerificationError(f"IR invalid {after}: " + '; '.join(problems[:5]))
+
+    def run(self, ir):
+        """Return the optimised IR; self.report describes what each pass did."""
+        self.report = []
+        if self.verify:
+            self._check(ir, 'before optimisation')
+        iterations = self.max_iterations if self.fixed_point else 1
+        for iteration in range(1, iterations + 1):
+            start = ir
+            for step, name in enumerate(self.passes):
+                before = len(ir)
+                t0 = time.perf_counter()
+                ir = PASSES[name](ir)
+                self.report.append({'pass': name, 'iteration': iteration, 'step': step,
+                                    'seconds': time.perf_counter() - t0,
+                                    'before': before, 'after': len(ir)})
+                if self.verify:
+                    self._check(ir, f"after {name}")
+            if ir == start:
+                break
+        return ir
+
+
+def format_report(report):
+    lines = [f"{'Pass':<18} {'Iter':>4} {'Time (ms)':>10} {'Before':>8} {'After':>8} {'Delta':>7}"]
+    for r in report:
+        lines.append(f"{r['pass']:<18} {r['iteration']:>4} {r['seconds'] * 1000:>10.3f} "
+                     f"{r['before']:>8} {r['after']:>8} {r['after'] - r['before']:>+7}")
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    import sys
+    from pipeline import CompilerPipeline, format_ir
+    src = open(sys.argv[1]).read() if len(sys.argv) > 1 else \
+        "int a = 2 * 3; int b = a + 4; if (b > 5) { print(b); } else { print(0); }"
+    result = CompilerPipeline().compile(src)
+    manager = PassManager.for_level(2, verify=True)
+    optimised = manager.run(result.ir)
+    print(format_report(manager.report))
+    print()
+    print(format_ir(optimised))
@@ -0,0 +1,356 @@
+"""
+Transpile SyntaxProcessor IR into a Python function and run it.
+
+The `mark`/`jump`/`jump_if_false` patterns emitted by the parser are turned
+back into structured `while`/`if` statements and every variable or temp
+becomes a Python local, so the generated function runs at the speed of
+ordinary Python code. IR whose control flow cannot be structured (or that
+nests deeper than the Python compiler allows) falls back to a basic-block
+state machine that still keeps variables in locals.
+
+Compiled code objects are cached by a fingerprint of the IR.
+"""
+import hashlib
+from collections import OrderedDict
+
+from ir_interpreter import IRExecutionError, c_div, c_mod, format_value, ARITH_OPS, REL_OPS
+
+_FUNC_NAME = '_ir_program'
+
+
+class _Irreducible(Exception):
+    """Internal signal: the control flow does not match a structured pattern."""
+
+
+class IRTranspiler:
+    """Generates, compiles and caches Python code for IR programs."""
+
+    cache_size = 128
+
+    # shared by all instances: fingerprint -> (code object, structured?)
+    _code_cache = OrderedDict()
+
+    def __init__(self):
+        self.output = []
+        self.return_value = None
+        self.structured = None
+        self.source = None
+
+    # -----------------------
+    # Helpers
+    # -----------------------
+    @staticmethod
+    def fingerprint(ir_code):
+        """Stable digest of the IR; repr keeps 1 and 1.0 apart."""
+        h = hashlib.blake2b(digest_size=16)
+        for instr in ir_code:
+            h.update(repr((instr.get('op'), instr.get('src1'), instr.get('src2'), instr.get('dst'))).encode())
+        return h.digest()
+
+    @staticmethod
+    def _val(operand):
+        if isinstance(operand, str):
+            return f"v_{operand}"
+        return repr(operand)
+
+    def _expr(self, op, s1, s2):
+        a = self._val(s1)
+        b = self._val(s2)
+        if op == '/':
+            return f"_div({a}, {b})"
+        if op == '%':
+            return f"_mod({a}, {b})"
+        if op in REL_OPS:
+            return f"1 if {a} {op} {b} else 0"
+        return f"{a} {op} {b}"
+
+    def _simple(self, instr, pad):
+        """Source line for a straight-line instruction, or None if it is control flow."""
+        op = instr.get('op')
+        s1 = instr.get('src1')
+        d = instr.get('dst')
+        if op == 'assign':
+            return f"{pad}v_{d} = {self._val(s1)}"
+        if op in ARITH_OPS or op in REL_OPS:
+            return f"{pad}v_{d} = {self._expr(op, s1, instr.get('src2'))}"
+        if op == 'output':
+            return f"{pad}_emit(_fmt({self._val(s1)}))"
+        if op == 'return':
+            return f"{pad}return {self._val(s1)}"
+        if op in ('mark', 'jump', 'jump_if_false'):
+            return None
+        raise IRExecutionError(f"Unsupported IR op {op!r}")
+
+    def _prepare(self, ir_code):
+        self._ir = ir_code
+        self._pos = {}
+        self._jumps_to = {}
+        self._uses = {}
+        names = set()
+        for i, instr in enumerate(ir_code):
+            op = instr.get('op')
+            s1 = instr.get('src1')
+            s2 = instr.get('src2')
+            d = instr.get('dst')
+            if op == 'mark':
+                if s1 in self._pos:
+                    raise IRExecutionError(f"Duplicate label {s1!r}")
+                self._pos[s1] = i
+                continue
+            if op == 'jump':
+                self._jumps_to.setdefault(s1, []).append(i)
+                continue
+            if op == 'jump_if_false':
+                self._jumps_to.setdefault(s2, []).append(i)
+                operands = (s1,)
+            else:
+                operands = (s1, s2)
+            for x in operands:
+                if isinstance(x, str):
+                    names.add(x)
+                    self._uses[x] = self._uses.get(x, 0) + 1
+            if isinstance(d, str):
+                names.add(d)
+        for lbl in self._jumps_to:
+            if lbl not in self._pos:
+                raise IRExecutionError(f"Jump to undefined label {lbl!r}")
+        return sorted(names)
+
+    # -----------------------
+    # Structured translation
+    # -----------------------
+    def _only_marks_between(self, lo, hi):
+        return all(self._ir[k].get('op') == 'mark' for k in range(lo, hi))
+
+    def _emit_range(self, lo, hi, depth, loop, out):
+        """Translate ir[lo:hi] into `out`; loop is (header, exit) of the innermost loop."""
+        ir = self._ir
+        pad = '    ' * depth
+        start_len = len(out)
+        i = lo
+        while i < hi:
+            instr = ir[i]
+            op = instr.get('op')
+            s1 = instr.get('src1')
+
+            if op == 'mark':
+                back = [k for k in self._jumps_to.get(s1, ()) if i < k < hi]
+                if back:
+                    k = back[-1]
+                    exit_lbl = ir[k + 1].get('src1') if k + 1 < len(ir) and ir[k + 1].get('op') == 'mark' else None
+                    out.append(f"{pad}while True:")
+                    self._emit_range(i + 1, k, depth + 1, (s1, exit_lbl), out)
+                    i = k + 1
+                    continue
+                if any(k > i for k in self._jumps_to.get(s1, ())):
+                    # backward jump from outside this region
+                    raise _Irreducible(s1)
+                i += 1
+                continue
+
+            if op == 'jump':
+                if loop and s1 == loop[0]:
+                    out.append(f"{pad}continue")
+                elif loop and s1 == loop[1]:
+                    out.append(f"{pad}break")
+                elif s1 in self._pos and i < self._pos[s1] <= hi and self._only_marks_between(i + 1, self._pos[s1]):
+                    pass
+                else:
+                    raise _Irreducible(s1)
+                i += 1
+                continue
+
+            if op == 'jump_if_false':
+                cond, target = s1, instr.get('src2')
+                test = self._val(cond)
+                # fuse `t = a < b; if_false t` when t has no other use
+                prev = ir[i - 1] if i > lo else None
+                fused = (prev is not None and prev.get('op') in REL_OPS and prev.get('dst') == cond
+                         and self._uses.get(cond) == 1 and out and len(out) > start_len)
+                if fused:
+                    out.pop()
+                    test = f"{self._val(prev.get('src1'))} {prev.get('op')} {self._val(prev.get('src2'))}"
+                if loop and target == loop[1]:
+                    out.append(f"{pad}if not ({test}):")
+                    out.append(f"{pad}    break")
+                    i += 1
+                    continue
+                if loop and target == loop[0]:
+                    out.append(f"{pad}if not ({test}):")
+                    out.append(f"{pad}    continue")
+                    i += 1
+                    continue
+                f = self._pos.get(target)
+                if f is None or not (i < f < hi):
+                    raise _Irreducible(target)
+                else_jump = ir[f - 1] if f - 1 > i else None
+                e = None
+                if else_jump is not None and else_jump.get('op') == 'jump':
+                    e = self._pos.get(else_jump.get('src1'))
+                    if e is None or not (f < e < hi):
+                        e = None
+                out.append(f"{pad}if {test}:")
+                if e is not None:
+                    self._emit_range(i + 1, f - 1, depth + 1, loop, out)
+                    out.append(f"{pad}else:")
+                    self._emit_range(f + 1, e, depth + 1, loop, out)
+                    i = e
+                else:
+                    self._emit_range(i + 1, f, depth + 1, loop, out)
+                    i = f
+                continue
+
+            out.append(self._simple(instr, pad))
+            i += 1
+
+        if len(out) == start_len:
+            out.append(f"{pad}pass")
+
+    # -----------------------
+    # Fallback: basic-block state machine
+    # -----------------------
+    def _emit_state_machine(self, out):
+        ir = self._ir
+        leaders = {0}
+        for i, instr in enumerate(ir):
+            op = instr.get('op')
+            if op == 'mark':
+                leaders.add(i)
+            elif op in ('jump', 'jump_if_false', 'return'):
+                leaders.add(i + 1)
+        leaders = sorted(x for x in leaders if x < len(ir))
+        block_at = {pc: n for n, pc in enumerate(leaders)}
+
+        def block_of(label):
+            return block_at[self._pos[label]]
+
+        out.append("    _pc = 0")
+        out.append("    while True:")
+        for n, start in enumerate(leaders):
+            stop = leaders[n + 1] if n + 1 < len(leaders) else len(ir)
+            out.append(f"        {'if' if n == 0 else 'elif'} _pc == {n}:")
+            pad = ' ' * 12
+            terminated = False
+            for instr in ir[start:stop]:
+                op = instr.get('op')
+                if op == 'jump':
+                    out.append(f"{pad}_pc = {block_of(instr.get('src1'))}")
+                    out.append(f"{pad}continue")
+                    terminated = True
+                elif op == 'jump_if_false':
+                    out.append(f"{pad}if not {self._val(instr.get('src1'))}:")
+                    out.append(f"{pad}    _pc = {block_of(instr.get('src2'))}")
+                    out.append(f"{pad}    continue")
+                elif op != 'mark':
+                    out.append(self._simple(instr, pad))
+                    terminated = op == 'return'
+            if not terminated:
+                out.append(f"{pad}_pc = {n + 1 if stop < len(ir) else -1}")
+        out.append("        else:")
+        out.append("            return None")
+
+    # -----------------------
+    # Public API
+    # -----------------------
+    def transpile(self, ir_code, structured=True):
+        """
+        Return Python source defining `_ir_program(_emit, _fmt, _div, _mod)`.
+
+        The structured form is tried first unless `structured` is False; the
+        `structured` attribute records which form was produced.
+        """
+        names = self._prepare(ir_code)
+        header = [f"def {_FUNC_NAME}(_emit, _fmt, _div, _mod):"]
+        header += [f"    v_{n} = 0" for n in names]
+        body = []
+        self.structured = False
+        if structured:
+            try:
+                self._emit_range(0, len(ir_code), 1, None, body)
+                self.structured = True
+            except (_Irreducible, RecursionError):
+                body = []
+        if not self.structured:
+            self._emit_state_machine(body)
+        body.append("    return None")
+        self.source = '\n'.join(header + body) + '\n'
+        return self.source
+
+    def compile(self, ir_code):
+        """Return the cached code object for `ir_code`, compiling it on a miss."""
+        key = self.fingerprint(ir_code)
+        cache = self._code_cache
+        hit = cache.get(key)
+        if hit is not None:
+            cache.move_to_end(key)
+            self.structured = hit[1]
+            return hit[0]
+        src = self.transpile(ir_code)
+        try:
+            code = compile(src, '<ir-transpiled>', 'exec')
+        except (SyntaxError, RecursionError, MemoryError):
+            # e.g. "too many statically nested blocks"
+            src = self.transpile(ir_code, structured=False)
+            code = compile(src, '<ir-transpiled>', 'exec')
+        cache[key] = (code, self.structured)
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return code
+
+    def build(self, ir_code):
+        """Return the generated Python function for `ir_code`."""
+        ns = {}
+        exec(self.compile(ir_code), ns)
+        return ns[_FUNC_NAME]
+
+    def run(self, ir_code):
+        """Execute `ir_code` and return the printed lines."""
+        fn = self.build(ir_code)
+        self.output = []
+        try:
+            self.return_value = fn(self.output.append, format_value, c_div, c_mod)
+        except ZeroDivisionError:
+            raise IRExecutionError("Division by zero")
+        return self.output
+
+
+if __name__ == '__main__':
+    import time
+    from lexer import TokenScanner
+    from parser import SyntaxProcessor
+    from ir_interpreter import IRInterpreter
+
+    sample = '''
+    int i;
+    int total;
+    i = 0;
+    total = 0;
+    while (i < 200000) {
+        if (i % 3 == 0) {
+            total = total + i % 7;
+        } else {
+            total = total - 1;
+        }
+        i = i + 1;
+    }
+    print(total);
+    '''
+    TokenScanner()
+    proc = SyntaxProcessor()
+    proc.process(sample)
+    ir = proc.ir_instructions
+
+    tr = IRTranspiler()
+    print(tr.transpile(ir))
+    timings = {}
+    t0 = time.perf_counter()
+    out = tr.run(ir)
+    timings['transpiled'] = time.perf_counter() - t0
+    for mode in ('dispatch', 'blocks'):
+        t0 = time.perf_counter()
+        ref = IRInterpreter().run(ir, mode=mode)
+        timings[mode] = time.perf_counter() - t0
+        assert ref == out, (mode, ref, out)
+    print("OUTPUT:", out)
+    for name, secs in timings.items():
+        print(f"{name:<12} {secs:.4f}s")
@@ -4,7 +4,105 @@ Requires: ply (pip install ply)
 """
 # Lexer.py
 import ply.lex as lex
+import gc
 import re
+from bisect import bisect_right
+from contextlib import contextmanager
+
+from interning import InternTable
+
+# below this many characters, shipping chunks to worker processes costs more
+# than lexing them in-process. The parent's share (split, unpickling, merge)
+# is ~30% of a sequential scan at any size, so what sets the crossover is the
+# fixed cost: ~0.12 s to spawn a worker on first use and ~0.2 ms per task.
+# With two cores that is repaid from ~0.75 MB (benchmark_parallel measures it)
+PARALLEL_MIN_CHARS = 1 << 20
+# smallest chunk worth a task of its own
+MIN_CHUNK_CHARS = 256 << 10
+
+# every comment, so a '/*' inside a '//' comment does not open a block
+_comment_re = re.compile(r'//[^\n]*|/\*.*?\*/', re.S)
+
+
+def split_source(code, pieces):
+    """
+    Cut `code` into up to `pieces` (start, end, first line) parts of similar
+    size. Each part starts at the beginning of a line that is not inside a
+    /* */ comment, so lexing the parts separately gives the same tokens.
+    """
+    n = len(code)
+    if pieces <= 1 or n == 0:
+        return [(0, n, 1)]
+    # spans of multi-line comments: one C-level pass over the source
+    starts, ends = [], []
+    for m in _comment_re.finditer(code):
+        if m.end() - m.start() > 2 and code[m.start() + 1] == '*':
+            starts.append(m.start())
+            ends.append(m.end())
+    parts = []
+    begin, line = 0, 1
+    for i in range(1, pieces):
+        cut = code.find('\n', max(begin, n * i // pieces)) + 1
+        while cut:
+            k = bisect_right(starts, cut - 1) - 1
+            if k < 0 or ends[k] <= cut - 1:
+                break  # the newline is outside every comment
+            cut = code.find('\n', ends[k]) + 1
+        if not cut or cut >= n:
+            break
+        if cut > begin:
+            parts.append((begin, cut, line))
+            line += code.count('\n', begin, cut)
+            begin = cut
+    parts.append((begin, n, line))
+    return parts
+
+
+@contextmanager
+def gc_paused():
+    """Token records and IR hold no cycles: skip collections while millions are allocated."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+# per-process scanner for _scan_chunk (process pool workers)
+_chunk_scanner = None
+
+
+def _scan_chunk(job):
+    """
+    Lex one part of a source in a worker process. Returns the tokens as
+    columns (kinds, values, lines, columns, absolute positions), which
+    pickle about twice as fast as per-token tuples, with identifiers as
+    plain strings, followed by the part's issues.
+    """
+    global _chunk_scanner
+    if _chunk_scanner is None:
+        _chunk_scanner = TokenScanner()
+    code, offset, first_line = job
+    s = _chunk_scanner
+    s.reset(code)
+    lexer = s.scanner
+    lexer.input(code)
+    lexer.lineno = first_line
+    column = s._compute_column
+    kinds, vals, lines, cols, positions = [], [], [], [], []
+    with gc_paused():
+        for tok in iter(lexer.token, None):
+            val = tok.value
+            if tok.type == 'IDENTIFIER':
+                val = str(val)
+            kinds.append(tok.type)
+            vals.append(val)
+            lines.append(tok.lineno)
+            cols.append(column(tok.lexpos))
+            positions.append(tok.lexpos + offset)
+    return kinds, vals, lines, cols, positions, s.issues
 
 
 class TokenScanner:
@@ -43,11 +141,13 @@ class TokenScanner:
     t_ignore = ' \t'  # spaces and tabs ignored
 
     _code = ''
+    _line_start = 0  # offset of the first character of the current line
     scanner = None
 
     def __init__(self):
         self.token_stream = []
         self.issues = []
+        self.symbols = InternTable()
         self.initialize()
 
     def initialize(self):
@@ -63,7 +163,9 @@ class TokenScanner:
     def t_COMMENT_MULTI(self, t):
         r'/\*(.|\n)*?\*/'
         t.lexer.lineno += t.value.count('\n')
-        pass
+        nl = t.value.rfind('\n')
+        if nl >= 0:
+            self._line_start = t.lexpos + nl + 1
 
   
     def t_EQUAL_TO(self, t):
@@ -122,6 +224,7 @@ class TokenScanner:
             t.type = self.keywords[t.value]
         else:
             t.type = 'IDENTIFIER'
+            t.value = self.symbols.intern(t.value)
         return t
 
     #
@@ -130,6 +233,7 @@ class TokenScanner:
     def t_newline(self, t):
         r'\n+'
         t.lexer.lineno += len(t.value)
+        self._line_start = t.lexpos + len(t.value)
 
     #
     # Error handling
@@ -145,6 +249,9 @@ class TokenScanner:
     # Utility: compute human readable column from lexpos using stored source
     #
     def _compute_column(self, lexpos):
+        # tokens arrive in order, so the newline rules keep the line start current
+        if lexpos >= self._line_start:
+            return lexpos - self._line_start + 1
         if not self._code:
             return lexpos
         last_nl = self._code.rfind('\n', 0, lexpos)
@@ -155,32 +262,162 @@ class TokenScanner:
     #
     # Main scanning API
     #
-    def scan(self, code):
-       
-        # reset state
+    def reset(self, code='', symbols=None):
+        """
+        Clear per-source state. scan() calls this itself; call it directly
+        before a parse that drives self.scanner without a scan (streaming).
+        """
         self.token_stream = []
         self.issues = []
+        self.symbols = symbols if symbols is not None else InternTable()
         self._code = code
+        self._line_start = 0
+
+    def scan(self, code, symbols=None):
+        """
+        Tokenize `code`; identifier values are Symbols interned in `symbols`
+        (a fresh InternTable when None), which stays on self.symbols so the
+        parser's pass over the same lexer shares it.
+        """
+        self.reset(code, symbols)
         self.scanner.input(code)
         self.scanner.lineno = 1
 
-        while True:
-            tok = self.scanner.token()
-            if not tok:
-                break
-            col = self._compute_column(tok.lexpos)
-            self.token_stream.append({
-                'kind': tok.type,
-                'val': tok.value,
-                'ln': tok.lineno,
-                'col': col,
-                'pos': tok.lexpos
-            })
+        with gc_paused():
+            while True:
+                tok = self.scanner.token()
+                if not tok:
+                    break
+                col = self._compute_column(tok.lexpos)
+                self.token_stream.append({
+                    'kind': tok.type,
+                    'val': tok.value,
+                    'ln': tok.lineno,
+                    'col': col,
+                    'pos': tok.lexpos
+                })
 
         return self.token_stream, self.issues
 
+    def scan_parallel(self, code, symbols=None, executor=None, workers=None):
+        """
+        scan() for very large sources: the code is cut at line starts outside
+        comments (split_source) and the parts are lexed in a process pool.
+        Positions, lines and columns are absolute and identifiers are interned
+        here in source order, so the tokens and issues equal scan()'s.
+
+        Args:
+            executor: a concurrent.futures executor to use; a temporary
+                ProcessPoolExecutor with `workers` processes when None.
+        """
+        import os
+        workers = workers or os.cpu_count() or 1
+        pieces = min(workers * 2, max(1, len(code) // MIN_CHUNK_CHARS))
+        parts = split_source(code, pieces)
+        if len(parts) == 1:
+            return self.scan(code, symbols)
+        self.reset(code, symbols)
+        jobs = [(code[a:b], a, line) for a, b, line in parts]
+        if executor is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=min(workers, len(jobs)),
+                                     mp_context=multiprocessing.get_context('spawn')) as pool:
+                results = list(pool.map(_scan_chunk, jobs))
+        else:
+            results = list(executor.map(_scan_chunk, jobs))
+
+        intern = self.symbols.intern
+        stream = self.token_stream
+        append = stream.append
+        with gc_paused():
+            for kinds, vals, lines, cols, positions, issues in results:
+                for kind, val, ln, col, pos in zip(kinds, vals, lines, cols, positions):
+                    if kind == 'IDENTIFIER':
+                        val = intern(val)
+                    append({'kind': kind, 'val': val, 'ln': ln, 'col': col, 'pos': pos})
+                self.issues.extend(issues)
+        return stream, self.issues
+
+
+class TokenListLexer:
+    """
+    Replays token dicts from scan() or scan_parallel() to the PLY parser
+    (the input()/token() interface of a PLY lexer), so a parse after a scan
+    does not lex the source a second time.
+    """
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.lineno = 1
+        self.lexpos = 0
+        self._next = iter(())
+
+    def input(self, data):
+        self._next = iter(self.tokens)
+
+    def token(self):
+        rec = next(self._next, None)
+        if rec is None:
+            return None
+        tok = lex.LexToken()
+        tok.type = rec['kind']
+        tok.value = rec['val']
+        tok.lineno = self.lineno = rec['ln']
+        tok.lexpos = self.lexpos = rec['pos']
+        tok.lexer = self
+        return tok
+
+
+def benchmark_parallel(sizes=(1 << 18, 1 << 20, 1 << 22, 1 << 24), workers=None, seed=0, repeat=3):
+    """
+    Time scan() against scan_parallel() on generated sources of about
+    `sizes` characters (pool start-up excluded) and check that both give the
+    same tokens. Returns one record per size; the crossover is the smallest
+    size where the parallel scan is faster.
+    """
+    import multiprocessing
+    import os
+    import time
+    from concurrent.futures import ProcessPoolExecutor
+    from program_generator import ProgramGenerator
+
+    workers = workers or os.cpu_count() or 1
+    scanner = TokenScanner()
+    records = []
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+        pool.submit(_scan_chunk, ('int a;', 0, 1)).result()  # warm the workers
+        for size in sizes:
+            source = ProgramGenerator(seed=seed).generate(max(1, size // 24))
+
+            def best(fn):
+                times = []
+                for _ in range(repeat):
+                    t0 = time.perf_counter()
+                    out = fn()
+                    times.append(time.perf_counter() - t0)
+                return min(times), out
+
+            t_seq, (seq_tokens, seq_issues) = best(lambda: scanner.scan(source))
+            seq = ([(t['kind'], str(t['val']), t['ln'], t['col'], t['pos']) for t in seq_tokens], list(seq_issues))
+            t_par, (par_tokens, par_issues) = best(
+                lambda: scanner.scan_parallel(source, executor=pool, workers=workers))
+            par = ([(t['kind'], str(t['val']), t['ln'], t['col'], t['pos']) for t in par_tokens], list(par_issues))
+            records.append({'chars': len(source), 'tokens': len(seq[0]), 'workers': workers,
+                            'sequential': t_seq, 'parallel': t_par,
+                            'speedup': t_seq / t_par if t_par else None,
+                            'identical': seq == par})
+    return records
+
 
 if __name__ == '__main__':
+    import sys
+    if sys.argv[1:2] == ['--benchmark']:
+        print(f"{'Chars':>10} {'Tokens':>9} {'Workers':>7} {'Seq (s)':>8} {'Par (s)':>8} {'Speedup':>7}  Same")
+        for r in benchmark_parallel():
+            print(f"{r['chars']:>10} {r['tokens']:>9} {r['workers']:>7} {r['sequential']:>8.3f} "
+                  f"{r['parallel']:>8.3f} {r['speedup']:>7.2f}  {r['identical']}")
+        sys.exit(0)
     sample = r'''
     // sample program
     int main() {
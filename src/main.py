@@ -1,13 +1,46 @@
-import tkinter as tk
-from gui import CompilerInterface
+import argparse
+import sys
 
 
-def main():
+def launch_gui():
     """Initialize and run the compiler GUI"""
+    import tkinter as tk
+    from gui import CompilerInterface
+
     app_window = tk.Tk()
     compiler_ui = CompilerInterface(app_window)
     app_window.mainloop()
 
 
+def main(argv=None):
+    """Run the GUI, or a headless command when one is given."""
+    argv = sys.argv[1:] if argv is None else argv
+    parser = argparse.ArgumentParser(prog='main.py', description='Mini C Compiler')
+    commands = parser.add_subparsers(dest='command')
+
+    import batch_compiler
+    compile_cmd = commands.add_parser('compile', help='compile files or directories to assembly')
+    batch_compiler.add_arguments(compile_cmd)
+    compile_cmd.set_defaults(handler=batch_compiler.run)
+
+    import build
+    build_cmd = commands.add_parser('build', help='incrementally build a project directory')
+    build.add_arguments(build_cmd)
+    build_cmd.set_defaults(handler=build.run)
+
+    import compile_server
+    serve_cmd = commands.add_parser('serve', help='run a compile server with warm worker processes')
+    compile_server.add_arguments(serve_cmd)
+    serve_cmd.set_defaults(handler=compile_server.run)
+
+    commands.add_parser('gui', help='launch the GUI (default)')
+
+    args = parser.parse_args(argv)
+    if getattr(args, 'handler', None) is None:
+        launch_gui()
+        return 0
+    return args.handler(args)
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -1,7 +1,46 @@
 # parser.py
+from bisect import bisect_right
+import ply.lex as lex
 import ply.yacc as yacc
-from lexer import TokenScanner
+from lexer import TokenScanner, gc_paused
 from symbol_table import VariableRegistry
+from interning import InternTable, Symbol, TEMP, LABEL
+
+
+class FunctionUnit:
+    """The IR of one function, lowered and translated on its own."""
+
+    def __init__(self, name, return_type, ir):
+        self.name = name
+        self.return_type = return_type
+        self.ir = ir
+
+    # compact form for process pools: operand tuples of plain strings instead
+    # of dicts, and one (id, kind) entry per Symbol (much cheaper than
+    # pickling each Symbol through its __reduce__)
+    def __getstate__(self):
+        tags = {}
+        ir = []
+        for i in self.ir:
+            row = [i['op'], i['src1'], i['src2'], i['dst']]
+            for k in (1, 2, 3):
+                x = row[k]
+                if type(x) is Symbol:
+                    name = row[k] = str(x)
+                    if name not in tags:
+                        tags[name] = (x.id, x.kind)
+            ir.append(tuple(row))
+        return (self.name, self.return_type, ir, tags)
+
+    def __setstate__(self, state):
+        self.name, self.return_type, ir, tags = state
+        with gc_paused():
+            table = {name: Symbol(name, sym_id, kind) for name, (sym_id, kind) in tags.items()}
+            get = table.get
+            self.ir = [{'op': op,
+                        'src1': get(s1, s1) if type(s1) is str else s1,
+                        'src2': get(s2, s2) if type(s2) is str else s2,
+                        'dst': get(d, d) if type(d) is str else d} for op, s1, s2, d in ir]
 
 
 class SyntaxProcessor:
@@ -14,31 +53,65 @@ class SyntaxProcessor:
         self.lbl_counter = 0
         self.issues = []
         self.ast = []
+        self.units = []  # FunctionUnit per function, in source order
         self.processor = None
+        self.symbols = InternTable()
+        # bookkeeping used to lay out control flow in execution order
+        self._stmt_mark = 0
+        self._cond_spans = []
+        self._block_marks = []
+        self._last_block_start = 0
+        self._code = ''
+        self._first_line = 1
+        self._line_starts = None
 
     def gen_temp(self):
         self.tmp_counter += 1
-        return f"temp{self.tmp_counter}"
+        return self.symbols.intern(f"temp{self.tmp_counter}", TEMP)
 
     def gen_label(self):
         self.lbl_counter += 1
-        return f"Label{self.lbl_counter}"
+        return self.symbols.intern(f"Label{self.lbl_counter}", LABEL)
+
+    def _make_instruction(self, operation, operand1=None, operand2=None, dest=None):
+        return {'op': operation, 'src1': operand1, 'src2': operand2, 'dst': dest}
 
     def add_instruction(self, operation, operand1=None, operand2=None, dest=None):
-        instr = {'op': operation, 'src1': operand1, 'src2': operand2, 'dst': dest}
+        instr = self._make_instruction(operation, operand1, operand2, dest)
         self.ir_instructions.append(instr)
         return dest
 
     def p_start(self, p):
         '''start : function_list
-                 | stmt_sequence'''
+                 | top_sequence'''
         p[0] = ('program', p[1])
         self.ast.append(p[0])
 
     def p_function_list(self, p):
         '''function_list : function_list function
                          | function'''
-        p[0] = p[1] + [p[2]] if len(p) == 3 else [p[1]]
+        if len(p) == 3:
+            p[1].append(p[2])  # extend in place: copying made long programs quadratic
+            p[0] = p[1]
+        else:
+            p[0] = [p[1]]
+
+    def p_top_sequence(self, p):
+        '''top_sequence : top_sequence stmt
+                        | stmt'''
+        if len(p) == 3:
+            p[1].append(p[2])
+            p[0] = p[1]
+        else:
+            p[0] = [p[1]]
+
+    def p_stray_brace(self, p):
+        '''function_list : function_list error RBRACE
+           top_sequence : top_sequence error RBRACE
+                        | error RBRACE'''
+        # a '}' with no open block (reported by p_error) is dropped, so the
+        # statements after it still parse; inside blocks '}' is block_end
+        p[0] = p[1] if len(p) == 4 else []
 
     def p_function(self, p):
         'function : data_type IDENTIFIER LPAREN RPAREN code_block'
@@ -46,11 +119,18 @@ class SyntaxProcessor:
         return_type = p[1]
         body = p[5]
         p[0] = ('function', return_type, func_name, body)
+        # the body is the IR emitted since its block opened
+        unit_ir = self.ir_instructions[self._last_block_start:]
+        self.units.append(FunctionUnit(str(func_name), return_type, unit_ir))
 
     def p_stmt_sequence(self, p):
         '''stmt_sequence : stmt_sequence stmt
                          | stmt'''
-        p[0] = p[1] + [p[2]] if len(p) == 3 else [p[1]]
+        if len(p) == 3:
+            p[1].append(p[2])
+            p[0] = p[1]
+        else:
+            p[0] = [p[1]]
 
     def p_stmt(self, p):
         '''stmt : var_decl
@@ -61,6 +141,19 @@ class SyntaxProcessor:
                | return_stmt
                | code_block'''
         p[0] = p[1]
+        self._stmt_mark = len(self.ir_instructions)
+
+    def p_stmt_error(self, p):
+        '''stmt : error SEMICOLON
+                | error code_block
+                | error code_block ELSE code_block'''
+        # resynchronised on ';' or on a whole block after a syntax error
+        # (already reported by p_error); a broken if/while header still has
+        # its body (and an else branch) parsed, so its braces and scope stay
+        # matched and the 'else' is not a second error
+        self._drop_pending_conditions()
+        p[0] = ('error',)
+        self._stmt_mark = len(self.ir_instructions)
 
     def p_return_stmt(self, p):
         '''return_stmt : RETURN expr SEMICOLON
@@ -78,7 +171,7 @@ class SyntaxProcessor:
         dtype = p[1]
         name = p[2]
         if self.registry.is_declared_in_current_scope(name):
-            self.issues.append(f"Redeclaration of '{name}' in current scope")
+            self.issues.append(f"Redeclaration of '{name}' in current scope ({self._where(p, 2)})")
             p[0] = ('decl_error', dtype, name)
             return
         if len(p) == 4:
@@ -100,7 +193,7 @@ class SyntaxProcessor:
         name = p[1]
         val = p[3]
         if not self.registry.find(name):
-            self.issues.append(f"Undefined variable '{name}'")
+            self.issues.append(f"Undefined variable '{name}' ({self._where(p, 1)})")
         self.add_instruction('assign', val, None, name)
         p[0] = ('assign', name, val)
 
@@ -112,40 +205,58 @@ class SyntaxProcessor:
     def p_conditional(self, p):
         '''conditional : IF LPAREN comparison RPAREN code_block
                        | IF LPAREN comparison RPAREN code_block ELSE code_block'''
+        # Bottom-up parsing emits the condition and the blocks before this
+        # reduction, so the jumps are spliced in at the recorded positions.
         cmp = p[3]
+        _, cond_end, _ = self._cond_spans.pop()
         lbl_false = self.gen_label()
         lbl_end = self.gen_label()
+        ir = self.ir_instructions
+        ir.insert(cond_end, self._make_instruction('jump_if_false', cmp, lbl_false))
         if len(p) == 6:
-            self.add_instruction('jump_if_false', cmp, lbl_false, None)
             self.add_instruction('mark', lbl_false, None, None)
             p[0] = ('if', cmp, p[5])
         else:
-            self.add_instruction('jump_if_false', cmp, lbl_false, None)
-            self.add_instruction('mark', lbl_false, None, None)
-            self.add_instruction('jump', lbl_end, None, None)
-            self.add_instruction('mark', lbl_false, None, None)
+            else_start = self._last_block_start + 1
+            ir[else_start:else_start] = [
+                self._make_instruction('jump', lbl_end),
+                self._make_instruction('mark', lbl_false),
+            ]
             self.add_instruction('mark', lbl_end, None, None)
             p[0] = ('if_else', cmp, p[5], p[7])
 
     def p_loop(self, p):
         'loop : WHILE LPAREN comparison RPAREN code_block'
+        cmp = p[3]
+        cond_start, cond_end, _ = self._cond_spans.pop()
         lbl_start = self.gen_label()
         lbl_end = self.gen_label()
-        self.add_instruction('mark', lbl_start, None, None)
-        cmp = p[3]
-        self.add_instruction('jump_if_false', cmp, lbl_end, None)
+        ir = self.ir_instructions
+        ir.insert(cond_end, self._make_instruction('jump_if_false', cmp, lbl_end))
+        ir.insert(cond_start, self._make_instruction('mark', lbl_start))
         self.add_instruction('jump', lbl_start, None, None)
         self.add_instruction('mark', lbl_end, None, None)
         p[0] = ('loop', cmp, p[5])
 
     def p_code_block(self, p):
         'code_block : block_start stmt_sequence block_end'
+        self._last_block_start = self._block_marks.pop()
         p[0] = ('block', p[2])
 
+    def p_code_block_error(self, p):
+        '''code_block : block_start error block_end
+                      | block_start stmt_sequence error block_end'''
+        # resynchronised on '}': the block's scope is still popped by block_end
+        self._drop_pending_conditions()
+        self._last_block_start = self._block_marks.pop()
+        p[0] = ('block', p[2] if len(p) == 5 else [])
+
     def p_block_start(self, p):
         'block_start : LBRACE'
         scope_name = f"block_{self.registry.current_scope_id + 1}"
         self.registry.push_scope(scope_name)
+        self._stmt_mark = len(self.ir_instructions)
+        self._block_marks.append(self._stmt_mark)
         p[0] = 'block_start'
 
     def p_block_end(self, p):
@@ -157,6 +268,7 @@ class SyntaxProcessor:
         'comparison : expr rel_op expr'
         tmp = self.gen_temp()
         self.add_instruction(p[2], p[1], p[3], tmp)
+        self._cond_spans.append((self._stmt_mark, len(self.ir_instructions), len(self._block_marks)))
         p[0] = tmp
 
     def p_rel_op(self, p):
@@ -199,7 +311,7 @@ class SyntaxProcessor:
     def p_base_id(self, p):
         'base : IDENTIFIER'
         if not self.registry.find(p[1]):
-            self.issues.append(f"Undefined variable '{p[1]}'")
+            self.issues.append(f"Undefined variable '{p[1]}' ({self._where(p, 1)})")
         p[0] = p[1]
 
     def p_base_paren(self, p):
@@ -207,21 +319,127 @@ class SyntaxProcessor:
         p[0] = p[2]
 
     def p_error(self, p):
+        # PLY then discards input until an error production can resume
+        # (stmt on ';' or a block, code_block on '}', a top-level stray '}')
+        # and stays quiet until three tokens have been shifted, so each
+        # independent error is reported once.
         if p:
-            self.issues.append(f"Syntax error near '{p.value}' (line {getattr(p, 'lineno', 'unknown')})")
+            self.issues.append(f"Syntax error near '{p.value}' "
+                               f"(line {p.lineno}, column {self._column(p.lexpos)})")
         else:
-            self.issues.append("Unexpected end of input")
+            end = len(self._code.rstrip())  # just past the last token
+            line = self._code.count('\n', 0, end) + self._first_line
+            self.issues.append(f"Unexpected end of input (line {line}, column {self._column(end)})")
+
+    # -----------------------
+    # Error recovery helpers
+    # -----------------------
+    def _drop_pending_conditions(self):
+        """Forget comparisons of if/while headers discarded by the error at this block depth."""
+        depth = len(self._block_marks)
+        spans = self._cond_spans
+        while spans and spans[-1][2] >= depth:
+            spans.pop()
+
+    def _column(self, lexpos):
+        """1-based column of `lexpos` (line starts are indexed once per parse)."""
+        if self._line_starts is None:
+            starts = [0]
+            find = self._code.find
+            i = find('\n')
+            while i >= 0:
+                starts.append(i + 1)
+                i = find('\n', i + 1)
+            self._line_starts = starts
+        return lexpos - self._line_starts[bisect_right(self._line_starts, lexpos) - 1] + 1
+
+    def _where(self, p, n):
+        return f"line {p.lineno(n)}, column {self._column(p.lexpos(n))}"
 
     def initialize(self):
         self.processor = yacc.yacc(module=self)
 
-    def process(self, code):
+    def process(self, code, lexer=None, symbols=None):
+        """
+        Parse `code`, building the AST, IR and registry.
+
+        Temps and labels are interned in `symbols` (pass the table the
+        lexer uses so identifiers and generated names share one id space).
+        """
+        self.lbl_counter = 0
+        self.registry.clear()
+        return self._parse(code, lexer, symbols, 1)
+
+    def begin_stream(self):
+        """Start a program that is parsed piece by piece with process_chunk()."""
+        self.lbl_counter = 0
+        self.registry.clear()
+
+    def process_chunk(self, code, lexer=None, symbols=None, first_line=1):
+        """
+        Parse one piece of a streamed program: whole top-level statements or
+        functions starting at line `first_line`.
+
+        Global declarations and label numbering carry over from earlier
+        pieces; the AST, IR and units cover this piece only. Temps are
+        numbered afresh, since none outlives the statement that defines it.
+        """
+        self.registry.discard_closed_scopes()
+        return self._parse(code, lexer, symbols, first_line)
+
+    def _parse(self, code, lexer, symbols, first_line):
+        self.symbols = symbols if symbols is not None else InternTable()
         self.ir_instructions = []
         self.tmp_counter = 0
-        self.lbl_counter = 0
         self.issues = []
         self.ast = []
-        self.registry.clear()
+        self.units = []
+        self._stmt_mark = 0
+        self._cond_spans = []
+        self._block_marks = []
+        self._last_block_start = 0
+        self._code = code
+        self._first_line = first_line
+        self._line_starts = None
         if not self.processor:
             self.initialize()
-        return self.processor.parse(code)
\ No newline at end of file
+        if lexer is None:
+            lexer = lex.lexer  # PLY's default: the most recently built lexer
+        if lexer is not None:
+            lexer.lineno = first_line
+        try:
+            return self.processor.parse(code, lexer=lexer)
+        finally:
+            # blocks left open by an unrecoverable error (e.g. a missing '}')
+            while self.registry.get_scope_level() > 0:
+                self.registry.pop_scope()
+            self._block_marks = []
+            self._cond_spans = []
+
+if __name__ == '__main__':
+    # self-check: error recovery reports each independent syntax error once
+    # and resynchronises, so the statements after it are still compiled
+    from pipeline import CompilerPipeline
+    cases = {
+        'stray braces': ('int a = 1;\n}\nint b = ;\nprint(a);\nint c = 3 print(c);\n',
+                         ["near '}' (line 2, column 1)", "near ';' (line 3, column 9)",
+                          "near 'print' (line 5, column 11)"]),
+        'many stray braces': ('int a = 1;\n' + '}\n' * 5000 + 'print(a);\nint z = ;\n',
+                              ["near '}' (line 2, column 1)", "near ';' (line 5003, column 9)"]),
+        'stray brace between functions': ('int f() { return 1; }\n}\nint main() { int x = ; return 0; }\n',
+                                          ["near '}' (line 2, column 1)", "near ';' (line 3, column 22)"]),
+        'broken if header with else': ('int a = 1;\nif (a > 1 { print(a); } else { print(0); }\nprint(a);\n',
+                                       ["near '{' (line 2, column 11)"]),
+        'end of input': ('int a = 1;\nprint(a\n', ["end of input (line 2, column 8)"]),
+        'end of input in block': ('int a = 1;\nwhile (a < 3) {\n  a = a + 1;\n',
+                                  ["end of input (line 3, column 13)"]),
+    }
+    pipeline = CompilerPipeline(jobs=1)
+    for label, (source, expected) in cases.items():
+        issues = pipeline.compile(source).parse_issues
+        assert len(issues) == len(expected), (label, issues)
+        for issue, tail in zip(issues, expected):
+            assert issue.endswith(tail), (label, issue)
+        print(f"{label:<32} {len(issues)} error(s)")
+    result = pipeline.compile(cases['many stray braces'][0])
+    assert [i['op'] for i in result.ir] == ['assign', 'output'], result.ir
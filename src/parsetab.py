@@ -6,9 +6,9 @@ _tabversion = '3.10'
 
 _lr_method = 'LALR'
 
-_lr_signature = 'COMMA DECIMAL DIVIDE ELSE EQUALS EQUAL_TO FLOAT FOR GREATER GREATER_EQ IDENTIFIER IF INT INTEGER LBRACE LESS LESS_EQ LPAREN MINUS MOD MULTIPLY NOT_EQUAL PLUS PRINT RBRACE RETURN RPAREN SEMICOLON WHILEstart : function_list\n                 | stmt_sequencefunction_list : function_list function\n                         | functionfunction : data_type IDENTIFIER LPAREN RPAREN code_blockstmt_sequence : stmt_sequence stmt\n                         | stmtstmt : var_decl\n               | var_assign\n               | output_stmt\n               | conditional\n               | loop\n               | return_stmt\n               | code_blockreturn_stmt : RETURN expr SEMICOLON\n                       | RETURN SEMICOLONvar_decl : data_type IDENTIFIER SEMICOLON\n                   | data_type IDENTIFIER EQUALS expr SEMICOLONdata_type : INT\n                     | FLOATvar_assign : IDENTIFIER EQUALS expr SEMICOLONoutput_stmt : PRINT LPAREN expr RPAREN SEMICOLONconditional : IF LPAREN comparison RPAREN code_block\n                       | IF LPAREN comparison RPAREN code_block ELSE code_blockloop : WHILE LPAREN comparison RPAREN code_blockcode_block : block_start stmt_sequence block_endblock_start : LBRACEblock_end : RBRACEcomparison : expr rel_op exprrel_op : LESS\n                  | LESS_EQ\n                  | GREATER\n                  | GREATER_EQ\n                  | EQUAL_TO\n                  | NOT_EQUALexpr : expr PLUS term\n               | expr MINUS termexpr : termterm : term MULTIPLY base\n                | term DIVIDE base\n                | term MOD baseterm : basebase : INTEGER\n                | DECIMALbase : IDENTIFIERbase : LPAREN expr RPAREN'
+_lr_signature = 'COMMA DECIMAL DIVIDE ELSE EQUALS EQUAL_TO FLOAT FOR GREATER GREATER_EQ IDENTIFIER IF INT INTEGER LBRACE LESS LESS_EQ LPAREN MINUS MOD MULTIPLY NOT_EQUAL PLUS PRINT RBRACE RETURN RPAREN SEMICOLON WHILEstart : function_list\n                 | top_sequencefunction_list : function_list function\n                         | functiontop_sequence : top_sequence stmt\n                        | stmtfunction_list : function_list error RBRACE\n           top_sequence : top_sequence error RBRACE\n                        | error RBRACEfunction : data_type IDENTIFIER LPAREN RPAREN code_blockstmt_sequence : stmt_sequence stmt\n                         | stmtstmt : var_decl\n               | var_assign\n               | output_stmt\n               | conditional\n               | loop\n               | return_stmt\n               | code_blockstmt : error SEMICOLON\n                | error code_block\n                | error code_block ELSE code_blockreturn_stmt : RETURN expr SEMICOLON\n                       | RETURN SEMICOLONvar_decl : data_type IDENTIFIER SEMICOLON\n                   | data_type IDENTIFIER EQUALS expr SEMICOLONdata_type : INT\n                     | FLOATvar_assign : IDENTIFIER EQUALS expr SEMICOLONoutput_stmt : PRINT LPAREN expr RPAREN SEMICOLONconditional : IF LPAREN comparison RPAREN code_block\n                       | IF LPAREN comparison RPAREN code_block ELSE code_blockloop : WHILE LPAREN comparison RPAREN code_blockcode_block : block_start stmt_sequence block_endcode_block : block_start error block_end\n                      | block_start stmt_sequence error block_endblock_start : LBRACEblock_end : RBRACEcomparison : expr rel_op exprrel_op : LESS\n                  | LESS_EQ\n                  | GREATER\n                  | GREATER_EQ\n                  | EQUAL_TO\n                  | NOT_EQUALexpr : expr PLUS term\n               | expr MINUS termexpr : termterm : term MULTIPLY base\n                | term DIVIDE base\n                | term MOD baseterm : basebase : INTEGER\n                | DECIMALbase : IDENTIFIERbase : LPAREN expr RPAREN'
     
-_lr_action_items = {'INT':([0,2,3,4,5,8,9,10,11,12,13,14,21,22,23,25,33,40,44,51,58,59,62,79,80,81,82,84,86,],[15,15,15,-4,-7,-14,-8,-9,-10,-11,-12,-13,15,-27,-3,-6,-16,15,-17,-15,-26,-28,-21,-5,-18,-22,-23,-25,-24,]),'FLOAT':([0,2,3,4,5,8,9,10,11,12,13,14,21,22,23,25,33,40,44,51,58,59,62,79,80,81,82,84,86,],[16,16,16,-4,-7,-14,-8,-9,-10,-11,-12,-13,16,-27,-3,-6,-16,16,-17,-15,-26,-28,-21,-5,-18,-22,-23,-25,-24,]),'IDENTIFIER':([0,3,5,6,8,9,10,11,12,13,14,15,16,20,21,22,24,25,26,28,29,30,31,33,39,40,44,45,51,52,53,54,55,56,58,59,62,65,66,67,68,69,70,71,80,81,82,84,86,],[7,7,-7,27,-14,-8,-9,-10,-11,-12,-13,-19,-20,38,7,-27,41,-6,42,38,38,38,38,-16,38,7,-17,38,-15,38,38,38,38,38,-26,-28,-21,38,-30,-31,-32,-33,-34,-35,-18,-22,-23,-25,-24,]),'PRINT':([0,3,5,8,9,10,11,12,13,14,21,22,25,33,40,44,51,58,59,62,80,81,82,84,86,],[17,17,-7,-14,-8,-9,-10,-11,-12,-13,17,-27,-6,-16,17,-17,-15,-26,-28,-21,-18,-22,-23,-25,-24,]),'IF':([0,3,5,8,9,10,11,12,13,14,21,22,25,33,40,44,51,58,59,62,80,81,82,84,86,],[18,18,-7,-14,-8,-9,-10,-11,-12,-13,18,-27,-6,-16,18,-17,-15,-26,-28,-21,-18,-22,-23,-25,-24,]),'WHILE':([0,3,5,8,9,10,11,12,13,14,21,22,25,33,40,44,51,58,59,62,80,81,82,84,86,],[19,19,-7,-14,-8,-9,-10,-11,-12,-13,19,-27,-6,-16,19,-17,-15,-26,-28,-21,-18,-22,-23,-25,-24,]),'RETURN':([0,3,5,8,9,10,11,12,13,14,21,22,25,33,40,44,51,58,59,62,80,81,82,84,86,],[20,20,-7,-14,-8,-9,-10,-11,-12,-13,20,-27,-6,-16,20,-17,-15,-26,-28,-21,-18,-22,-23,-25,-24,]),'LBRACE':([0,3,5,8,9,10,11,12,13,14,21,22,25,33,40,44,51,58,59,60,62,64,72,80,81,82,84,85,86,],[22,22,-7,-14,-8,-9,-10,-11,-12,-13,22,-27,-6,-16,22,-17,-15,-26,-28,22,-21,22,22,-18,-22,-23,-25,22,-24,]),'$end':([1,2,3,4,5,8,9,10,11,12,13,14,23,25,33,44,51,58,59,62,79,80,81,82,84,86,],[0,-1,-2,-4,-7,-14,-8,-9,-10,-11,-12,-13,-3,-6,-16,-17,-15,-26,-28,-21,-5,-18,-22,-23,-25,-24,]),'RBRACE':([5,8,9,10,11,12,13,14,25,33,40,44,51,58,59,62,80,81,82,84,86,],[-7,-14,-8,-9,-10,-11,-12,-13,-6,-16,59,-17,-15,-26,-28,-21,-18,-22,-23,-25,-24,]),'EQUALS':([7,27,42,],[28,45,45,]),'LPAREN':([17,18,19,20,27,28,29,30,31,39,41,45,52,53,54,55,56,65,66,67,68,69,70,71,],[29,30,31,39,43,39,39,39,39,39,43,39,39,39,39,39,39,39,-30,-31,-32,-33,-34,-35,]),'SEMICOLON':([20,27,32,34,35,36,37,38,42,46,61,63,73,74,75,76,77,78,],[33,44,51,-38,-42,-43,-44,-45,44,62,80,81,-36,-37,-39,-40,-41,-46,]),'INTEGER':([20,28,29,30,31,39,45,52,53,54,55,56,65,66,67,68,69,70,71,],[36,36,36,36,36,36,36,36,36,36,36,36,36,-30,-31,-32,-33,-34,-35,]),'DECIMAL':([20,28,29,30,31,39,45,52,53,54,55,56,65,66,67,68,69,70,71,],[37,37,37,37,37,37,37,37,37,37,37,37,37,-30,-31,-32,-33,-34,-35,]),'PLUS':([32,34,35,36,37,38,46,47,49,57,61,73,74,75,76,77,78,83,],[52,-38,-42,-43,-44,-45,52,52,52,52,52,-36,-37,-39,-40,-41,-46,52,]),'MINUS':([32,34,35,36,37,38,46,47,49,57,61,73,74,75,76,77,78,83,],[53,-38,-42,-43,-44,-45,53,53,53,53,53,-36,-37,-39,-40,-41,-46,53,]),'RPAREN':([34,35,36,37,38,43,47,48,50,57,73,74,75,76,77,78,83,],[-38,-42,-43,-44,-45,60,63,64,72,78,-36,-37,-39,-40,-41,-46,-29,]),'LESS':([34,35,36,37,38,49,73,74,75,76,77,78,],[-38,-42,-43,-44,-45,66,-36,-37,-39,-40,-41,-46,]),'LESS_EQ':([34,35,36,37,38,49,73,74,75,76,77,78,],[-38,-42,-43,-44,-45,67,-36,-37,-39,-40,-41,-46,]),'GREATER':([34,35,36,37,38,49,73,74,75,76,77,78,],[-38,-42,-43,-44,-45,68,-36,-37,-39,-40,-41,-46,]),'GREATER_EQ':([34,35,36,37,38,49,73,74,75,76,77,78,],[-38,-42,-43,-44,-45,69,-36,-37,-39,-40,-41,-46,]),'EQUAL_TO':([34,35,36,37,38,49,73,74,75,76,77,78,],[-38,-42,-43,-44,-45,70,-36,-37,-39,-40,-41,-46,]),'NOT_EQUAL':([34,35,36,37,38,49,73,74,75,76,77,78,],[-38,-42,-43,-44,-45,71,-36,-37,-39,-40,-41,-46,]),'MULTIPLY':([34,35,36,37,38,73,74,75,76,77,78,],[54,-42,-43,-44,-45,54,54,-39,-40,-41,-46,]),'DIVIDE':([34,35,36,37,38,73,74,75,76,77,78,],[55,-42,-43,-44,-45,55,55,-39,-40,-41,-46,]),'MOD':([34,35,36,37,38,73,74,75,76,77,78,],[56,-42,-43,-44,-45,56,56,-39,-40,-41,-46,]),'ELSE':([58,59,82,],[-26,-28,85,]),}
+_lr_action_items = {'error':([0,2,3,4,6,9,10,11,12,13,14,15,22,23,24,27,30,31,32,39,46,48,49,51,55,62,69,71,72,73,74,77,94,95,96,97,98,100,102,],[5,25,28,-4,-6,-19,-13,-14,-15,-16,-17,-18,47,-37,-3,-5,-9,-20,-21,-24,70,-12,-7,-8,-25,-23,-34,-11,-38,-35,-22,-29,-36,-10,-26,-30,-31,-33,-32,]),'INT':([0,2,3,4,6,9,10,11,12,13,14,15,22,23,24,27,30,31,32,39,46,48,49,51,55,62,69,71,72,73,74,77,94,95,96,97,98,100,102,],[16,16,16,-4,-6,-19,-13,-14,-15,-16,-17,-18,16,-37,-3,-5,-9,-20,-21,-24,16,-12,-7,-8,-25,-23,-34,-11,-38,-35,-22,-29,-36,-10,-26,-30,-31,-33,-32,]),'FLOAT':([0,2,3,4,6,9,10,11,12,13,14,15,22,23,24,27,30,31,32,39,46,48,49,51,55,62,69,71,72,73,74,77,94,95,96,97,98,100,102,],[17,17,17,-4,-6,-19,-13,-14,-15,-16,-17,-18,17,-37,-3,-5,-9,-20,-21,-24,17,-12,-7,-8,-25,-23,-34,-11,-38,-35,-22,-29,-36,-10,-26,-30,-31,-33,-32,]),'IDENTIFIER':([0,3,6,7,9,10,11,12,13,14,15,16,17,21,22,23,26,27,29,30,31,32,34,35,36,37,39,45,46,48,51,55,56,62,63,64,65,66,67,69,71,72,73,74,77,80,81,82,83,84,85,86,94,96,97,98,100,102,],[8,8,-6,33,-19,-13,-14,-15,-16,-17,-18,-27,-28,44,8,-37,50,-5,52,-9,-20,-21,44,44,44,44,-24,44,8,-12,-8,-25,44,-23,44,44,44,44,44,-34,-11,-38,-35,-22,-29,44,-40,-41,-42,-43,-44,-45,-36,-26,-30,-31,-33,-32,]),'PRINT':([0,3,6,9,10,11,12,13,14,15,22,23,27,30,31,32,39,46,48,51,55,62,69,71,72,73,74,77,94,96,97,98,100,102,],[18,18,-6,-19,-13,-14,-15,-16,-17,-18,18,-37,-5,-9,-20,-21,-24,18,-12,-8,-25,-23,-34,-11,-38,-35,-22,-29,-36,-26,-30,-31,-33,-32,]),'IF':([0,3,6,9,10,11,12,13,14,15,22,23,27,30,31,32,39,46,48,51,55,62,69,71,72,73,74,77,94,96,97,98,100,102,],[19,19,-6,-19,-13,-14,-15,-16,-17,-18,19,-37,-5,-9,-20,-21,-24,19,-12,-8,-25,-23,-34,-11,-38,-35,-22,-29,-36,-26,-30,-31,-33,-32,]),'WHILE':([0,3,6,9,10,11,12,13,14,15,22,23,27,30,31,32,39,46,48,51,55,62,69,71,72,73,74,77,94,96,97,98,100,102,],[20,20,-6,-19,-13,-14,-15,-16,-17,-18,20,-37,-5,-9,-20,-21,-24,20,-12,-8,-25,-23,-34,-11,-38,-35,-22,-29,-36,-26,-30,-31,-33,-32,]),'RETURN':([0,3,6,9,10,11,12,13,14,15,22,23,27,30,31,32,39,46,48,51,55,62,69,71,72,73,74,77,94,96,97,98,100,102,],[21,21,-6,-19,-13,-14,-15,-16,-17,-18,21,-37,-5,-9,-20,-21,-24,21,-12,-8,-25,-23,-34,-11,-38,-35,-22,-29,-36,-26,-30,-31,-33,-32,]),'LBRACE':([0,3,5,6,9,10,11,12,13,14,15,22,23,27,28,30,31,32,39,46,47,48,51,53,55,62,69,70,71,72,73,74,75,77,79,87,94,96,97,98,100,101,102,],[23,23,23,-6,-19,-13,-14,-15,-16,-17,-18,23,-37,-5,23,-9,-20,-21,-24,23,23,-12,-8,23,-25,-23,-34,23,-11,-38,-35,-22,23,-29,23,23,-36,-26,-30,-31,-33,23,-32,]),'$end':([1,2,3,4,6,9,10,11,12,13,14,15,24,27,30,31,32,39,49,51,55,62,69,72,73,74,77,94,95,96,97,98,100,102,],[0,-1,-2,-4,-6,-19,-13,-14,-15,-16,-17,-18,-3,-5,-9,-20,-21,-24,-7,-8,-25,-23,-34,-38,-35,-22,-29,-36,-10,-26,-30,-31,-33,-32,]),'RBRACE':([5,9,10,11,12,13,14,15,25,28,31,32,39,46,47,48,55,62,69,70,71,72,73,74,77,94,96,97,98,100,102,],[30,-19,-13,-14,-15,-16,-17,-18,49,51,-20,-21,-24,72,72,-12,-25,-23,-34,72,-11,-38,-35,-22,-29,-36,-26,-30,-31,-33,-32,]),'SEMICOLON':([5,21,28,33,38,40,41,42,43,44,47,52,57,70,76,78,88,89,90,91,92,93,],[31,39,31,55,62,-48,-52,-53,-54,-55,31,55,77,31,96,97,-46,-47,-49,-50,-51,-56,]),'EQUALS':([8,33,52,],[34,56,56,]),'LPAREN':([18,19,20,21,33,34,35,36,37,45,50,56,63,64,65,66,67,80,81,82,83,84,85,86,],[35,36,37,45,54,45,45,45,45,45,54,45,45,45,45,45,45,45,-40,-41,-42,-43,-44,-45,]),'INTEGER':([21,34,35,36,37,45,56,63,64,65,66,67,80,81,82,83,84,85,86,],[42,42,42,42,42,42,42,42,42,42,42,42,42,-40,-41,-42,-43,-44,-45,]),'DECIMAL':([21,34,35,36,37,45,56,63,64,65,66,67,80,81,82,83,84,85,86,],[43,43,43,43,43,43,43,43,43,43,43,43,43,-40,-41,-42,-43,-44,-45,]),'ELSE':([32,69,72,73,94,98,],[53,-34,-38,-35,-36,101,]),'PLUS':([38,40,41,42,43,44,57,58,60,68,76,88,89,90,91,92,93,99,],[63,-48,-52,-53,-54,-55,63,63,63,63,63,-46,-47,-49,-50,-51,-56,63,]),'MINUS':([38,40,41,42,43,44,57,58,60,68,76,88,89,90,91,92,93,99,],[64,-48,-52,-53,-54,-55,64,64,64,64,64,-46,-47,-49,-50,-51,-56,64,]),'RPAREN':([40,41,42,43,44,54,58,59,61,68,88,89,90,91,92,93,99,],[-48,-52,-53,-54,-55,75,78,79,87,93,-46,-47,-49,-50,-51,-56,-39,]),'LESS':([40,41,42,43,44,60,88,89,90,91,92,93,],[-48,-52,-53,-54,-55,81,-46,-47,-49,-50,-51,-56,]),'LESS_EQ':([40,41,42,43,44,60,88,89,90,91,92,93,],[-48,-52,-53,-54,-55,82,-46,-47,-49,-50,-51,-56,]),'GREATER':([40,41,42,43,44,60,88,89,90,91,92,93,],[-48,-52,-53,-54,-55,83,-46,-47,-49,-50,-51,-56,]),'GREATER_EQ':([40,41,42,43,44,60,88,89,90,91,92,93,],[-48,-52,-53,-54,-55,84,-46,-47,-49,-50,-51,-56,]),'EQUAL_TO':([40,41,42,43,44,60,88,89,90,91,92,93,],[-48,-52,-53,-54,-55,85,-46,-47,-49,-50,-51,-56,]),'NOT_EQUAL':([40,41,42,43,44,60,88,89,90,91,92,93,],[-48,-52,-53,-54,-55,86,-46,-47,-49,-50,-51,-56,]),'MULTIPLY':([40,41,42,43,44,88,89,90,91,92,93,],[65,-52,-53,-54,-55,65,65,-49,-50,-51,-56,]),'DIVIDE':([40,41,42,43,44,88,89,90,91,92,93,],[66,-52,-53,-54,-55,66,66,-49,-50,-51,-56,]),'MOD':([40,41,42,43,44,88,89,90,91,92,93,],[67,-52,-53,-54,-55,67,67,-49,-50,-51,-56,]),}
 
 _lr_action = {}
 for _k, _v in _lr_action_items.items():
@@ -17,7 +17,7 @@ for _k, _v in _lr_action_items.items():
       _lr_action[_x][_k] = _y
 del _lr_action_items
 
-_lr_goto_items = {'start':([0,],[1,]),'function_list':([0,],[2,]),'stmt_sequence':([0,21,],[3,40,]),'function':([0,2,],[4,23,]),'stmt':([0,3,21,40,],[5,25,5,25,]),'data_type':([0,2,3,21,40,],[6,24,26,26,26,]),'code_block':([0,3,21,40,60,64,72,85,],[8,8,8,8,79,82,84,86,]),'var_decl':([0,3,21,40,],[9,9,9,9,]),'var_assign':([0,3,21,40,],[10,10,10,10,]),'output_stmt':([0,3,21,40,],[11,11,11,11,]),'conditional':([0,3,21,40,],[12,12,12,12,]),'loop':([0,3,21,40,],[13,13,13,13,]),'return_stmt':([0,3,21,40,],[14,14,14,14,]),'block_start':([0,3,21,40,60,64,72,85,],[21,21,21,21,21,21,21,21,]),'expr':([20,28,29,30,31,39,45,65,],[32,46,47,49,49,57,61,83,]),'term':([20,28,29,30,31,39,45,52,53,65,],[34,34,34,34,34,34,34,73,74,34,]),'base':([20,28,29,30,31,39,45,52,53,54,55,56,65,],[35,35,35,35,35,35,35,35,35,75,76,77,35,]),'comparison':([30,31,],[48,50,]),'block_end':([40,],[58,]),'rel_op':([49,],[65,]),}
+_lr_goto_items = {'start':([0,],[1,]),'function_list':([0,],[2,]),'top_sequence':([0,],[3,]),'function':([0,2,],[4,24,]),'stmt':([0,3,22,46,],[6,27,48,71,]),'data_type':([0,2,3,22,46,],[7,26,29,29,29,]),'code_block':([0,3,5,22,28,46,47,53,70,75,79,87,101,],[9,9,32,9,32,9,32,74,32,95,98,100,102,]),'var_decl':([0,3,22,46,],[10,10,10,10,]),'var_assign':([0,3,22,46,],[11,11,11,11,]),'output_stmt':([0,3,22,46,],[12,12,12,12,]),'conditional':([0,3,22,46,],[13,13,13,13,]),'loop':([0,3,22,46,],[14,14,14,14,]),'return_stmt':([0,3,22,46,],[15,15,15,15,]),'block_start':([0,3,5,22,28,46,47,53,70,75,79,87,101,],[22,22,22,22,22,22,22,22,22,22,22,22,22,]),'expr':([21,34,35,36,37,45,56,80,],[38,57,58,60,60,68,76,99,]),'term':([21,34,35,36,37,45,56,63,64,80,],[40,40,40,40,40,40,40,88,89,40,]),'base':([21,34,35,36,37,45,56,63,64,65,66,67,80,],[41,41,41,41,41,41,41,41,41,90,91,92,41,]),'stmt_sequence':([22,],[46,]),'comparison':([36,37,],[59,61,]),'block_end':([46,47,70,],[69,73,94,]),'rel_op':([60,],[80,]),}
 
 _lr_goto = {}
 for _k, _v in _lr_goto_items.items():
@@ -27,50 +27,60 @@ for _k, _v in _lr_goto_items.items():
 del _lr_goto_items
 _lr_productions = [
   ("S' -> start","S'",1,None,None,None),
-  ('start -> function_list','start',1,'p_start','parser.py',32),
-  ('start -> stmt_sequence','start',1,'p_start','parser.py',33),
-  ('function_list -> function_list function','function_list',2,'p_function_list','parser.py',38),
-  ('function_list -> function','function_list',1,'p_function_list','parser.py',39),
-  ('function -> data_type IDENTIFIER LPAREN RPAREN code_block','function',5,'p_function','parser.py',43),
-  ('stmt_sequence -> stmt_sequence stmt','stmt_sequence',2,'p_stmt_sequence','parser.py',50),
-  ('stmt_sequence -> stmt','stmt_sequence',1,'p_stmt_sequence','parser.py',51),
-  ('stmt -> var_decl','stmt',1,'p_stmt','parser.py',55),
-  ('stmt -> var_assign','stmt',1,'p_stmt','parser.py',56),
-  ('stmt -> output_stmt','stmt',1,'p_stmt','parser.py',57),
-  ('stmt -> conditional','stmt',1,'p_stmt','parser.py',58),
-  ('stmt -> loop','stmt',1,'p_stmt','parser.py',59),
-  ('stmt -> return_stmt','stmt',1,'p_stmt','parser.py',60),
-  ('stmt -> code_block','stmt',1,'p_stmt','parser.py',61),
-  ('return_stmt -> RETURN expr SEMICOLON','return_stmt',3,'p_return_stmt','parser.py',65),
-  ('return_stmt -> RETURN SEMICOLON','return_stmt',2,'p_return_stmt','parser.py',66),
-  ('var_decl -> data_type IDENTIFIER SEMICOLON','var_decl',3,'p_var_decl','parser.py',75),
-  ('var_decl -> data_type IDENTIFIER EQUALS expr SEMICOLON','var_decl',5,'p_var_decl','parser.py',76),
-  ('data_type -> INT','data_type',1,'p_data_type','parser.py',93),
-  ('data_type -> FLOAT','data_type',1,'p_data_type','parser.py',94),
-  ('var_assign -> IDENTIFIER EQUALS expr SEMICOLON','var_assign',4,'p_var_assign','parser.py',98),
-  ('output_stmt -> PRINT LPAREN expr RPAREN SEMICOLON','output_stmt',5,'p_output_stmt','parser.py',107),
-  ('conditional -> IF LPAREN comparison RPAREN code_block','conditional',5,'p_conditional','parser.py',112),
-  ('conditional -> IF LPAREN comparison RPAREN code_block ELSE code_block','conditional',7,'p_conditional','parser.py',113),
-  ('loop -> WHILE LPAREN comparison RPAREN code_block','loop',5,'p_loop','parser.py',130),
-  ('code_block -> block_start stmt_sequence block_end','code_block',3,'p_code_block','parser.py',141),
-  ('block_start -> LBRACE','block_start',1,'p_block_start','parser.py',145),
-  ('block_end -> RBRACE','block_end',1,'p_block_end','parser.py',151),
-  ('comparison -> expr rel_op expr','comparison',3,'p_comparison','parser.py',156),
-  ('rel_op -> LESS','rel_op',1,'p_rel_op','parser.py',162),
-  ('rel_op -> LESS_EQ','rel_op',1,'p_rel_op','parser.py',163),
-  ('rel_op -> GREATER','rel_op',1,'p_rel_op','parser.py',164),
-  ('rel_op -> GREATER_EQ','rel_op',1,'p_rel_op','parser.py',165),
-  ('rel_op -> EQUAL_TO','rel_op',1,'p_rel_op','parser.py',166),
-  ('rel_op -> NOT_EQUAL','rel_op',1,'p_rel_op','parser.py',167),
-  ('expr -> expr PLUS term','expr',3,'p_expr_add','parser.py',171),
-  ('expr -> expr MINUS term','expr',3,'p_expr_add','parser.py',172),
-  ('expr -> term','expr',1,'p_expr_term','parser.py',178),
-  ('term -> term MULTIPLY base','term',3,'p_term_mul','parser.py',182),
-  ('term -> term DIVIDE base','term',3,'p_term_mul','parser.py',183),
-  ('term -> term MOD base','term',3,'p_term_mul','parser.py',184),
-  ('term -> base','term',1,'p_term_base','parser.py',190),
-  ('base -> INTEGER','base',1,'p_base_num','parser.py',194),
-  ('base -> DECIMAL','base',1,'p_base_num','parser.py',195),
-  ('base -> IDENTIFIER','base',1,'p_base_id','parser.py',199),
-  ('base -> LPAREN expr RPAREN','base',3,'p_base_paren','parser.py',205),
+  ('start -> function_list','start',1,'p_start','parser.py',85),
+  ('start -> top_sequence','start',1,'p_start','parser.py',86),
+  ('function_list -> function_list function','function_list',2,'p_function_list','parser.py',91),
+  ('function_list -> function','function_list',1,'p_function_list','parser.py',92),
+  ('top_sequence -> top_sequence stmt','top_sequence',2,'p_top_sequence','parser.py',100),
+  ('top_sequence -> stmt','top_sequence',1,'p_top_sequence','parser.py',101),
+  ('function_list -> function_list error RBRACE','function_list',3,'p_stray_brace','parser.py',109),
+  ('top_sequence -> top_sequence error RBRACE','top_sequence',3,'p_stray_brace','parser.py',110),
+  ('top_sequence -> error RBRACE','top_sequence',2,'p_stray_brace','parser.py',111),
+  ('function -> data_type IDENTIFIER LPAREN RPAREN code_block','function',5,'p_function','parser.py',117),
+  ('stmt_sequence -> stmt_sequence stmt','stmt_sequence',2,'p_stmt_sequence','parser.py',127),
+  ('stmt_sequence -> stmt','stmt_sequence',1,'p_stmt_sequence','parser.py',128),
+  ('stmt -> var_decl','stmt',1,'p_stmt','parser.py',136),
+  ('stmt -> var_assign','stmt',1,'p_stmt','parser.py',137),
+  ('stmt -> output_stmt','stmt',1,'p_stmt','parser.py',138),
+  ('stmt -> conditional','stmt',1,'p_stmt','parser.py',139),
+  ('stmt -> loop','stmt',1,'p_stmt','parser.py',140),
+  ('stmt -> return_stmt','stmt',1,'p_stmt','parser.py',141),
+  ('stmt -> code_block','stmt',1,'p_stmt','parser.py',142),
+  ('stmt -> error SEMICOLON','stmt',2,'p_stmt_error','parser.py',147),
+  ('stmt -> error code_block','stmt',2,'p_stmt_error','parser.py',148),
+  ('stmt -> error code_block ELSE code_block','stmt',4,'p_stmt_error','parser.py',149),
+  ('return_stmt -> RETURN expr SEMICOLON','return_stmt',3,'p_return_stmt','parser.py',159),
+  ('return_stmt -> RETURN SEMICOLON','return_stmt',2,'p_return_stmt','parser.py',160),
+  ('var_decl -> data_type IDENTIFIER SEMICOLON','var_decl',3,'p_var_decl','parser.py',169),
+  ('var_decl -> data_type IDENTIFIER EQUALS expr SEMICOLON','var_decl',5,'p_var_decl','parser.py',170),
+  ('data_type -> INT','data_type',1,'p_data_type','parser.py',187),
+  ('data_type -> FLOAT','data_type',1,'p_data_type','parser.py',188),
+  ('var_assign -> IDENTIFIER EQUALS expr SEMICOLON','var_assign',4,'p_var_assign','parser.py',192),
+  ('output_stmt -> PRINT LPAREN expr RPAREN SEMICOLON','output_stmt',5,'p_output_stmt','parser.py',201),
+  ('conditional -> IF LPAREN comparison RPAREN code_block','conditional',5,'p_conditional','parser.py',206),
+  ('conditional -> IF LPAREN comparison RPAREN code_block ELSE code_block','conditional',7,'p_conditional','parser.py',207),
+  ('loop -> WHILE LPAREN comparison RPAREN code_block','loop',5,'p_loop','parser.py',229),
+  ('code_block -> block_start stmt_sequence block_end','code_block',3,'p_code_block','parser.py',242),
+  ('code_block -> block_start error block_end','code_block',3,'p_code_block_error','parser.py',247),
+  ('code_block -> block_start stmt_sequence error block_end','code_block',4,'p_code_block_error','parser.py',248),
+  ('block_start -> LBRACE','block_start',1,'p_block_start','parser.py',255),
+  ('block_end -> RBRACE','block_end',1,'p_block_end','parser.py',263),
+  ('comparison -> expr rel_op expr','comparison',3,'p_comparison','parser.py',268),
+  ('rel_op -> LESS','rel_op',1,'p_rel_op','parser.py',275),
+  ('rel_op -> LESS_EQ','rel_op',1,'p_rel_op','parser.py',276),
+  ('rel_op -> GREATER','rel_op',1,'p_rel_op','parser.py',277),
+  ('rel_op -> GREATER_EQ','rel_op',1,'p_rel_op','parser.py',278),
+  ('rel_op -> EQUAL_TO','rel_op',1,'p_rel_op','parser.py',279),
+  ('rel_op -> NOT_EQUAL','rel_op',1,'p_rel_op','parser.py',280),
+  ('expr -> expr PLUS term','expr',3,'p_expr_add','parser.py',284),
+  ('expr -> expr MINUS term','expr',3,'p_expr_add','parser.py',285),
+  ('expr -> term','expr',1,'p_expr_term','parser.py',291),
+  ('term -> term MULTIPLY base','term',3,'p_term_mul','parser.py',295),
+  ('term -> term DIVIDE base','term',3,'p_term_mul','parser.py',296),
+  ('term -> term MOD base','term',3,'p_term_mul','parser.py',297),
+  ('term -> base','term',1,'p_term_base','parser.py',303),
+  ('base -> INTEGER','base',1,'p_base_num','parser.py',307),
+  ('base -> DECIMAL','base',1,'p_base_num','parser.py',308),
+  ('base -> IDENTIFIER','base',1,'p_base_id','parser.py',312),
+  ('base -> LPAREN expr RPAREN','base',3,'p_base_paren','parser.py',318),
 ]
@@ -0,0 +1,396 @@
+"""
+Headless compilation pipeline shared by the GUI and the command-line tools.
+
+CompilerPipeline keeps warm TokenScanner / SyntaxProcessor /
+AssemblyTranslator instances and runs lexer -> parser/semantic -> IR ->
+assembly on a source string, returning a CompilationResult. The source is
+lexed once: the parser replays the scanned tokens (TokenListLexer), and very
+large sources are lexed in parts in a process pool (TokenScanner.scan_parallel).
+Programs made of functions are translated one FunctionUnit at a time; large
+ones fan the units out to the same pool and join the results in source
+order. Every result carries a CompileStats (instrumentation.py); pass an
+Instrumentation to collect detailed counters, peak memory and a cProfile
+report as well.
+
+Options read by the pipeline:
+    opt_level (0, 1, 2): IR optimisation level (ir_optimizer.py), default 0
+    verify_ir (bool): check the IR after every optimisation pass
+"""
+import hashlib
+import importlib
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from lexer import PARALLEL_MIN_CHARS, TokenListLexer, TokenScanner
+from parser import FunctionUnit, SyntaxProcessor
+from assembly_translator import AssemblyTranslator, translate_unit
+from instrumentation import CompileStats, count_asm_instructions
+from interning import InternTable
+from ir_optimizer import IRVerificationError, PassManager
+
+COMPILER_VERSION = '0.2.3'
+
+# modules whose code decides the compiler's output (see compiler_fingerprint)
+OUTPUT_MODULES = ('lexer', 'parser', 'symbol_table', 'interning', 'ir_interpreter', 'ir_optimizer',
+                  'assembly_translator', 'pipeline')
+_fingerprint = None
+
+_line_re = re.compile(r'line (\d+)')
+_column_re = re.compile(r'column (\d+)')
+
+# below this many IR instructions, starting worker processes costs more than it saves
+PARALLEL_MIN_IR = 20000
+
+
+def compiler_fingerprint():
+    """
+    COMPILER_VERSION plus a hash of the sources of OUTPUT_MODULES, so caches
+    and build manifests are invalidated by any change to the compiler, not
+    only by a version bump.
+    """
+    global _fingerprint
+    if _fingerprint is None:
+        h = hashlib.blake2b(digest_size=10)
+        for name in OUTPUT_MODULES:
+            with open(importlib.import_module(name).__file__, 'rb') as f:
+                h.update(name.encode() + b'\0' + f.read() + b'\0')
+        _fingerprint = f"{COMPILER_VERSION}+{h.hexdigest()}"
+    return _fingerprint
+
+
+class CompilationCancelled(Exception):
+    """Raised between phases when the caller's should_cancel() returns True."""
+
+
+class CompilationResult:
+    """Everything produced by one run of the pipeline."""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.tokens = []
+        self.lex_issues = []
+        self.parse_issues = []
+        self.ast = []
+        self.ir = []
+        self.units = []  # FunctionUnits as translated (after optimisation); not cached
+        self.symbols = []
+        self.asm = []
+        self.codegen_error = None
+        self.cached = False
+        self.reused = ()
+        self.stats = CompileStats()
+        self._token_sig = None
+
+    def token_signature(self):
+        """Everything the parser can observe about the tokens (kind, value, position)."""
+        if self._token_sig is None:
+            self._token_sig = tuple((t['kind'], t['val'], t['ln'], t['col']) for t in self.tokens)
+        return self._token_sig
+
+    @property
+    def issues(self):
+        return self.lex_issues + self.parse_issues
+
+    def counts(self):
+        """(tokens, IR instructions, assembly instructions) in the result."""
+        return len(self.tokens), len(self.ir), count_asm_instructions(self.asm)
+
+    @property
+    def ok(self):
+        return not self.issues and self.codegen_error is None
+
+    def diagnostics(self):
+        """Issues as machine-readable dicts: phase, message, line and column when known."""
+        diags = []
+        for phase, messages in (('lex', self.lex_issues), ('parse', self.parse_issues)):
+            for msg in messages:
+                m = _line_re.search(msg)
+                c = _column_re.search(msg)
+                diags.append({'phase': phase, 'message': msg, 'line': int(m.group(1)) if m else None,
+                              'column': int(c.group(1)) if c else None})
+        if self.codegen_error is not None:
+            diags.append({'phase': 'codegen', 'message': self.codegen_error, 'line': None, 'column': None})
+        return diags
+
+
+class CompilerPipeline:
+    """Runs every compiler phase with long-lived component instances."""
+
+    def __init__(self, cache=None, options=None, instrumentation=None, jobs=None):
+        """
+        Args:
+            jobs (int): processes for lexing very large sources and translating
+                function units in parallel; defaults to the CPU count, 1 keeps
+                everything in-process.
+        """
+        self.scanner = TokenScanner()
+        self.processor = SyntaxProcessor()
+        self.processor.initialize()
+        self.translator = AssemblyTranslator()
+        self.cache = cache
+        self.options = dict(options or {})
+        self.instrumentation = instrumentation
+        self.jobs = jobs or os.cpu_count() or 1
+        self._pool = None
+        self._should_cancel = None
+
+    def close(self):
+        """Shut down the worker pool, if one was started."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            # spawn: the pipeline may run on a worker thread (GUI, compile server), where fork is unsafe
+            self._pool = ProcessPoolExecutor(max_workers=self.jobs,
+                                             mp_context=multiprocessing.get_context('spawn'))
+        return self._pool
+
+    def _unit_workers(self, units):
+        """Processes to spread `units` over, or 0 when the program is too small for the pool."""
+        workers = min(self.jobs, len(units))
+        if workers > 1 and sum(len(u.ir) for u in units) >= PARALLEL_MIN_IR:
+            return workers
+        return 0
+
+    def _map_units(self, fn, jobs, workers):
+        # map() yields in submission order, so the output is deterministic
+        chunksize = max(1, len(jobs) // (workers * 4))
+        return list(self._get_pool().map(fn, jobs, chunksize=chunksize))
+
+    def _translate_units(self, units):
+        """Translate function units, in a process pool when the program is large enough."""
+        workers = self._unit_workers(units)
+        if workers:
+            functions = self._map_units(translate_unit, units, workers)
+        else:
+            functions = [translate_unit(u) for u in units]
+        return self.translator.assemble(functions)
+
+    def _optimize_and_translate_units(self, result, units, level, verify, stats):
+        """Optimise and translate function units in the pool, one task per unit; returns the new units."""
+        done = self._map_units(optimize_and_translate_unit, [(u, level, verify) for u in units],
+                               self._unit_workers(units))
+        units = [unit for unit, _text, _report in done]
+        result.ir = [instr for unit in units for instr in unit.ir]
+        stats.passes = [r for _unit, _text, report in done for r in report]
+        result.asm = list(self.translator.assemble([text for _unit, text, _report in done]))
+        return units
+
+    @staticmethod
+    def _optimize(result, units, level, verify, stats):
+        """Run the level's passes over each function unit (or the whole IR); returns the new units."""
+        if not units:
+            manager = PassManager.for_level(level, verify=verify)
+            result.ir = manager.run(result.ir)
+            stats.passes = manager.report
+            return units
+        done = [optimize_unit((unit, level, verify)) for unit in units]
+        optimised = [unit for unit, _report in done]
+        result.ir = [instr for unit in optimised for instr in unit.ir]
+        stats.passes = [r for _unit, report in done for r in report]
+        return optimised
+
+    def _checkpoint(self):
+        if self._should_cancel is not None and self._should_cancel():
+            raise CompilationCancelled()
+
+    def compile(self, source, path=None, previous=None, should_cancel=None):
+        """
+        Compile `source`, answering from the cache (if any) when possible.
+
+        Args:
+            previous (CompilationResult): result of an earlier compile with the
+                same options; phases whose input did not change are reused.
+            should_cancel (callable): polled between phases; when it returns
+                True, CompilationCancelled is raised.
+        """
+        self._should_cancel = should_cancel
+        stats = CompileStats()
+        inst = self.instrumentation
+        if inst is not None:
+            inst.begin(self)
+        try:
+            result = self._compile_cached(source, path, previous, stats)
+        finally:
+            if inst is not None:
+                inst.end(stats)
+        self._count(result, stats)
+        result.stats = stats
+        return result
+
+    def compile_stream(self, readable, sink, path=None, ir_sink=None, should_cancel=None, **kwargs):
+        """
+        Compile the source read from `readable` piece by piece, writing the
+        assembly to `sink` as it goes (see streaming.py); the cache is not used.
+        """
+        from streaming import compile_stream
+        self._should_cancel = should_cancel
+        return compile_stream(self, readable, sink, path, ir_sink, **kwargs)
+
+    def _compile_cached(self, source, path, previous, stats):
+        if self.cache is None:
+            return self._compile(source, path, previous, stats)
+        with stats.phase('cache'):
+            key = self.cache.key(source, self.options)
+            result = self.cache.get(key, path)
+        if result is not None:
+            result.cached = True
+            return result
+        result = self._compile(source, path, previous, stats)
+        self.cache.put(key, result)
+        return result
+
+    @staticmethod
+    def _count(result, stats):
+        c = stats.counters
+        c['tokens'], c['ir_instructions'], c['asm_instructions'] = result.counts()
+        scan = stats.phases.get('scan')
+        if scan is not None and scan['wall'] > 0:
+            c['tokens_per_second'] = c['tokens'] / scan['wall']
+
+    def _compile(self, source, path=None, previous=None, stats=None):
+        result = CompilationResult(path)
+        if stats is None:
+            stats = result.stats
+
+        # one intern table per compile, shared by the lexer and the parser
+        names = InternTable()
+
+        # Phase 1: Lexical Analysis
+        with stats.phase('scan'):
+            if self.jobs > 1 and len(source) >= PARALLEL_MIN_CHARS:
+                tokens, lex_errs = self.scanner.scan_parallel(source, names, self._get_pool(), self.jobs)
+            else:
+                tokens, lex_errs = self.scanner.scan(source, names)
+        result.tokens = list(tokens)
+        result.lex_issues = list(lex_errs)
+        self._checkpoint()
+
+        # Same tokens at the same positions: parsing and codegen would not change
+        if previous is not None and previous.token_signature() == result.token_signature():
+            result.parse_issues = previous.parse_issues
+            result.ast = previous.ast
+            result.ir = previous.ir
+            result.units = previous.units
+            result.symbols = previous.symbols
+            result.asm = previous.asm
+            result.codegen_error = previous.codegen_error
+            result.reused = ('parse', 'codegen')
+            return result
+
+        # Phase 2 & 3: Syntax and Semantic Analysis (+ IR)
+        with stats.phase('parse'):
+            # the parser reads the scanned tokens instead of lexing the source again
+            self.processor.process(source, lexer=TokenListLexer(result.tokens), symbols=names)
+        result.parse_issues = list(self.processor.issues)
+        result.ast = self.processor.ast
+        result.ir = self.processor.ir_instructions
+        result.symbols = self.processor.registry.all_entries()
+        self._checkpoint()
+
+        # Phase 3b: IR optimisation (only on IR the parser accepted)
+        units = self.processor.units
+        level = self.options.get('opt_level', 0)
+        verify = bool(self.options.get('verify_ir'))
+        optimise = (level or verify) and not result.parse_issues
+        if optimise and self._unit_workers(units):
+            # large program: the passes run in the unit workers, next to the translation
+            try:
+                with stats.phase('opt+codegen'):
+                    result.units = self._optimize_and_translate_units(result, units, level, verify, stats)
+            except IRVerificationError as e:
+                result.codegen_error = f"IR verification failed: {e}"
+            except Exception as e:
+                result.codegen_error = f"Code generation failed: {e}"
+            return result
+        if optimise:
+            try:
+                with stats.phase('optimize'):
+                    units = self._optimize(result, units, level, verify, stats)
+            except IRVerificationError as e:
+                result.codegen_error = f"IR verification failed: {e}"
+                return result
+            self._checkpoint()
+
+        result.units = units
+
+        # Phase 4: Code Generation (Assembly)
+        # the asm also depends on the function names and boundaries, which the IR does not hold
+        if (previous is not None and previous.codegen_error is None and previous.ir == result.ir
+                and _unit_layout(previous.units) == _unit_layout(units)):
+            result.asm = previous.asm
+            result.reused = ('codegen',)
+            return result
+        try:
+            with stats.phase('codegen'):
+                if units:
+                    result.asm = list(self._translate_units(units))
+                else:
+                    result.asm = list(self.translator.translate(result.ir))
+        except Exception as e:
+            result.codegen_error = f"Code generation failed: {e}"
+        return result
+
+
+def optimize_unit(job):
+    """
+    Run one optimisation level over a FunctionUnit. `job` is (unit, level,
+    verify); returns (the optimised unit, the pass report).
+    """
+    unit, level, verify = job
+    manager = PassManager.for_level(level, verify=verify)
+    optimised = FunctionUnit(unit.name, unit.return_type, manager.run(unit.ir))
+    return optimised, manager.report
+
+
+def optimize_and_translate_unit(job):
+    """
+    optimize_unit followed by translate_unit; module-level so a process pool
+    can run it. Returns (the optimised unit, the function's text, the pass report).
+    """
+    unit, report = optimize_unit(job)
+    return unit, translate_unit(unit), report
+
+
+def _unit_layout(units):
+    return [(str(u.name), len(u.ir)) for u in units]
+
+
+# -----------------------
+# Text formatting shared by the GUI and file dumps
+# -----------------------
+def format_ir_instruction(instr):
+    """Three-address text for one IR instruction."""
+    op = instr.get('op')
+    s1 = instr.get('src1')
+    s2 = instr.get('src2')
+    d = instr.get('dst')
+    if op == 'assign':
+        return f"{d} := {s1}"
+    if op in ('+', '-', '*', '/', '%', '<', '<=', '>', '>=', '==', '!='):
+        return f"{d} := {s1} {op} {s2}"
+    if op == 'mark':
+        return f"{s1}:"
+    if op == 'jump':
+        return f"goto {s1}"
+    if op == 'jump_if_false':
+        return f"if_false {s1} goto {s2}"
+    if op == 'output':
+        return f"print {s1}"
+    if op == 'return':
+        return f"return {s1}"
+    return f"{op} {s1} {s2} {d}"
+
+
+def format_ir(ir_code):
+    return '\n'.join(f"{idx + 1}. {format_ir_instruction(instr)}" for idx, instr in enumerate(ir_code))
+
+
+def format_tokens(tokens):
+    lines = [f"{'Type':<18} {'Value':<22} {'Line':<6} {'Col':<4}"]
+    lines += [f"{tok['kind']:<18} {str(tok['val']):<22} {tok['ln']:<6} {tok.get('col', ''):<4}" for tok in tokens]
+    return '\n'.join(lines)
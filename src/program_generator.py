@@ -0,0 +1,175 @@
+"""
+Seeded random program generator for the mini C grammar.
+
+Produces valid, terminating programs for benchmarks: every variable is
+declared before use in an enclosing scope, loops count a local counter up
+to a small bound, divisors are non-zero constants and assignments are
+reduced modulo a prime so values stay well inside 64 bits.
+"""
+import random
+
+_REL_OPS = ('<', '<=', '>', '>=', '==', '!=')
+_WRAP = 10007
+
+
+class ProgramGenerator:
+    """Builds synthetic programs of a requested size and shape."""
+
+    def __init__(self, seed=0, max_depth=4, expr_depth=3, decl_density=0.2,
+                 loop_iterations=(2, 5), functions=0, floats=False):
+        """
+        Args:
+            max_depth (int): maximum nesting of if/while blocks.
+            expr_depth (int): maximum depth of arithmetic expression trees.
+            decl_density (float): share of statements that are declarations.
+            loop_iterations (tuple): (min, max) iterations of generated loops.
+            functions (int): wrap the code in this many functions instead of
+                top-level statements (0 = statements).
+            floats (bool): also declare and assign float variables.
+        """
+        self.seed = seed
+        self.max_depth = max_depth
+        self.expr_depth = expr_depth
+        self.decl_density = decl_density
+        self.loop_iterations = loop_iterations
+        self.functions = functions
+        self.floats = floats
+
+    def generate(self, lines):
+        """Return program text of roughly `lines` lines."""
+        self._rng = random.Random(self.seed)
+        self._names = 0
+        self._counters = set()  # loop counters are never assignment targets
+        self._out = []
+        self._budget = lines
+        # int variables visible at the current point; blocks truncate it on exit
+        self._ints = []
+        if self.functions:
+            per_fn = max(8, lines // self.functions)
+            for n in range(self.functions):
+                self._out.append(f"int f{n}() {{")
+                self._budget = per_fn
+                del self._ints[:]
+                while self._budget > 0:
+                    self._stmt(1)
+                self._out.append("}")
+        else:
+            while self._budget > 0:
+                self._stmt(0)
+        return '\n'.join(self._out) + '\n'
+
+    # -----------------------
+    # Names
+    # -----------------------
+    def _fresh(self, prefix='v'):
+        self._names += 1
+        return f"{prefix}{self._names}"
+
+    def _emit(self, depth, text):
+        self._out.append('    ' * depth + text)
+        self._budget -= 1
+
+    # -----------------------
+    # Expressions
+    # -----------------------
+    def _atom(self):
+        names = self._ints
+        if names and self._rng.random() < 0.7:
+            return self._rng.choice(names)
+        return str(self._rng.randint(0, 99))
+
+    def _expr(self, depth):
+        rng = self._rng
+        if depth <= 0 or rng.random() < 0.3:
+            return self._atom()
+        kind = rng.random()
+        left = self._expr(depth - 1)
+        if kind < 0.35:
+            return f"{left} + {self._expr(depth - 1)}"
+        if kind < 0.6:
+            return f"{left} - {self._expr(depth - 1)}"
+        if kind < 0.75:
+            return f"({left}) * {rng.randint(1, 9)}"
+        if kind < 0.85:
+            return f"({left}) / {rng.randint(1, 9)}"
+        if kind < 0.95:
+            return f"({left}) % {rng.randint(2, 97)}"
+        return f"({left})"
+
+    def _comparison(self):
+        return f"{self._atom()} {self._rng.choice(_REL_OPS)} {self._expr(1)}"
+
+    # -----------------------
+    # Statements
+    # -----------------------
+    def _block(self, depth):
+        """Emit the statements of one block body in a new scope."""
+        mark = len(self._ints)
+        count = self._rng.randint(1, 6)
+        for _ in range(count):
+            if self._budget <= 0:
+                break
+            self._stmt(depth)
+        if self._out[-1].endswith('{'):
+            # blocks may not be empty
+            self._emit(depth, f"print({self._atom()});")
+        del self._ints[mark:]
+
+    def _stmt(self, depth):
+        rng = self._rng
+        r = rng.random()
+        if r < self.decl_density or not self._ints:
+            self._decl(depth)
+        elif depth < self.max_depth and r < self.decl_density + 0.12:
+            self._loop(depth)
+        elif depth < self.max_depth and r < self.decl_density + 0.24:
+            self._if(depth)
+        elif r < self.decl_density + 0.34:
+            self._emit(depth, f"print({self._expr(self.expr_depth)});")
+        else:
+            for _ in range(4):
+                target = rng.choice(self._ints)
+                if target not in self._counters:
+                    self._emit(depth, f"{target} = ({self._expr(self.expr_depth)}) % {_WRAP};")
+                    return
+            self._decl(depth)
+
+    def _decl(self, depth):
+        if self.floats and self._rng.random() < 0.2:
+            name = self._fresh('f')
+            self._emit(depth, f"float {name} = {self._rng.randint(0, 99)}.{self._rng.randint(0, 99)};")
+            return
+        name = self._fresh()
+        if self._rng.random() < 0.5:
+            self._emit(depth, f"int {name} = ({self._expr(self.expr_depth)}) % {_WRAP};")
+        else:
+            self._emit(depth, f"int {name};")
+            self._emit(depth, f"{name} = {self._rng.randint(0, 99)};")
+        self._ints.append(name)
+
+    def _loop(self, depth):
+        counter = self._fresh('i')
+        bound = self._rng.randint(*self.loop_iterations)
+        self._emit(depth, f"int {counter};")
+        self._emit(depth, f"{counter} = 0;")
+        self._ints.append(counter)
+        self._counters.add(counter)
+        self._emit(depth, f"while ({counter} < {bound}) {{")
+        # the counter is only read inside the body, then incremented last
+        self._block(depth + 1)
+        self._emit(depth + 1, f"{counter} = {counter} + 1;")
+        self._emit(depth, "}")
+
+    def _if(self, depth):
+        self._emit(depth, f"if ({self._comparison()}) {{")
+        self._block(depth + 1)
+        if self._rng.random() < 0.4:
+            self._emit(depth, "} else {")
+            self._block(depth + 1)
+        self._emit(depth, "}")
+
+
+if __name__ == '__main__':
+    import sys
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    print(ProgramGenerator(seed=1).generate(size))
@@ -0,0 +1,342 @@
+"""
+Runtime benchmarks for the generated code.
+
+Compiles a corpus (examples/*.c plus seeded loop-heavy programs from
+program_generator.ProgramGenerator) once per optimisation configuration,
+assembles each AssemblyTranslator output with nasm (or yasm), links it with
+gcc and runs the binary several times. Per program and configuration it
+records the IR and machine instruction counts of the code, the wall time of
+the runs, retired instructions from `perf stat` when perf is installed, and
+whether the printed output matches a reference evaluation of the source (the
+unoptimised IR run by IRTranspiler).
+
+Without an assembler or linker the native runs are reported as skipped; the
+optimised IR is still checked against the reference, so optimiser bugs show
+up on any machine. The NASM backend handles integers only (float operands
+become 0 and values print with "%d"), so programs using float values are
+reported as unsupported for native runs rather than as mismatches. Wall times include process start-up, which is why the
+generated programs are loop-heavy.
+
+Example:
+    python src/runtime_benchmark.py -o runtime.json
+    python src/runtime_benchmark.py --baseline runtime.json
+"""
+import argparse
+import json
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from instrumentation import count_asm_instructions
+from ir_interpreter import IRExecutionError
+from ir_transpiler import IRTranspiler
+from pipeline import COMPILER_VERSION, CompilerPipeline
+from program_generator import ProgramGenerator
+
+CONFIGS = {
+    'O0': {},
+    'O1': {'opt_level': 1},
+    'O2': {'opt_level': 2},
+}
+DEFAULT_EXAMPLES = Path(__file__).resolve().parent.parent / 'examples'
+
+
+def find_toolchain():
+    """Paths of the assembler, linker driver and perf found on PATH (None when missing)."""
+    return {
+        'assembler': shutil.which('nasm') or shutil.which('yasm'),
+        'linker': shutil.which('gcc') or shutil.which('cc'),
+        'perf': shutil.which('perf'),
+    }
+
+
+def build_corpus(examples=DEFAULT_EXAMPLES, programs=6, lines=300, seed=0, loop_iterations=(30, 80)):
+    """List of (name, source): the example files, then generated loop-heavy programs."""
+    corpus = []
+    if examples is not None and Path(examples).is_dir():
+        for path in sorted(Path(examples).glob('*.c')):
+            corpus.append((f"examples/{path.name}", path.read_text(encoding='utf-8')))
+    for n in range(programs):
+        gen = ProgramGenerator(seed=seed + n, max_depth=3, loop_iterations=loop_iterations)
+        corpus.append((f"generated/seed{seed + n}", gen.generate(lines)))
+    return corpus
+
+
+def entry_ir(result):
+    """IR that the linked binary executes: the `main` unit, or the whole top-level program."""
+    if not result.units:
+        return result.ir
+    for unit in result.units:
+        if unit.name == 'main':
+            return unit.ir
+    return None
+
+
+def uses_floats(result):
+    """True when the program declares a float variable or has a float constant in its IR."""
+    if any(e.get('dtype') == 'float' for e in result.symbols):
+        return True
+    return any(type(instr[k]) is float for instr in result.ir for k in ('src1', 'src2'))
+
+
+def reference_output(source):
+    """Printed lines of the unoptimised program, or an error message string."""
+    result = CompilerPipeline(jobs=1).compile(source)
+    if not result.ok:
+        return f"does not compile: {result.diagnostics()[0]['message']}"
+    ir = entry_ir(result)
+    if ir is None:
+        return "no main function"
+    try:
+        return IRTranspiler().run(ir)
+    except IRExecutionError as e:
+        return f"reference run failed: {e}"
+
+
+def build_binary(asm_text, workdir, name, toolchain):
+    """Assemble and link `asm_text`; returns (executable path, None) or (None, error message)."""
+    if toolchain['assembler'] is None:
+        return None, "no assembler (nasm or yasm) on PATH"
+    if toolchain['linker'] is None:
+        return None, "no linker (gcc or cc) on PATH"
+    asm = Path(workdir) / f"{name}.asm"
+    obj = asm.with_suffix('.o')
+    exe = asm.with_suffix('')
+    asm.write_text(asm_text, encoding='utf-8')
+    steps = (
+        [toolchain['assembler'], '-f', 'elf64', '-o', str(obj), str(asm)],
+        # printf is called directly, not through the PLT
+        [toolchain['linker'], '-no-pie', '-o', str(exe), str(obj)],
+    )
+    for cmd in steps:
+        proc = subprocess.run(cmd, capture_output=True, text=True)
+        if proc.returncode != 0:
+            return None, proc.stderr.strip() or f"{Path(cmd[0]).name} exited with status {proc.returncode}"
+    return exe, None
+
+
+def perf_instructions(exe, perf, timeout):
+    """User-space instructions retired by one run of `exe`, or None if perf cannot count them."""
+    proc = subprocess.run([perf, 'stat', '-x', ',', '-e', 'instructions:u', '--', str(exe)],
+                          capture_output=True, text=True, timeout=timeout)
+    for line in proc.stderr.splitlines():
+        fields = line.split(',')
+        if len(fields) > 2 and fields[2].startswith('instructions'):
+            try:
+                return int(fields[0])
+            except ValueError:
+                return None  # "<not supported>" / "<not counted>"
+    return None
+
+
+def run_binary(exe, repeat=5, perf=None, timeout=60):
+    """Run `exe` `repeat` times; returns its output lines and timing record."""
+    times = []
+    output = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        proc = subprocess.run([str(exe)], capture_output=True, text=True, timeout=timeout)
+        times.append(time.perf_counter() - t0)
+        output = proc.stdout.splitlines()
+    record = {
+        'best_seconds': min(times),
+        'median_seconds': statistics.median(times),
+        'runs': repeat,
+        'instructions': perf_instructions(exe, perf, timeout) if perf else None,
+    }
+    return output, record
+
+
+def benchmark_program(name, source, configs, toolchain, workdir, repeat=5):
+    """Compile, build and run one program under every configuration."""
+    reference = reference_output(source)
+    record = {'program': name, 'source_lines': source.count('\n') + 1, 'configs': {}}
+    if isinstance(reference, str):
+        record['skipped'] = reference
+        return record
+    record['reference_lines'] = len(reference)
+    safe = name.replace('/', '_').replace('.', '_')
+
+    for label, options in configs.items():
+        result = CompilerPipeline(options=options, jobs=1).compile(source)
+        rec = {
+            'ir_instructions': len(result.ir),
+            'asm_instructions': count_asm_instructions(result.asm),
+        }
+        record['configs'][label] = rec
+        if result.codegen_error is not None:
+            rec['status'] = 'failed'
+            rec['error'] = result.codegen_error
+            continue
+        try:
+            rec['ir_output_matches'] = IRTranspiler().run(entry_ir(result)) == reference
+        except IRExecutionError as e:
+            rec['ir_output_matches'] = False
+            rec['error'] = f"IR run failed: {e}"
+        if uses_floats(result):
+            rec['status'] = 'unsupported'
+            rec.setdefault('error', 'float values: the NASM backend prints integers only')
+            continue
+
+        exe, error = build_binary('\n'.join(result.asm), workdir, f"{safe}-{label}", toolchain)
+        if exe is None:
+            rec['status'] = 'skipped'
+            rec['error'] = error
+            continue
+        try:
+            output, timing = run_binary(exe, repeat, toolchain['perf'])
+        except subprocess.TimeoutExpired:
+            rec['status'] = 'failed'
+            rec['error'] = 'binary timed out'
+            continue
+        rec.update(timing)
+        rec['output_matches'] = output == reference
+        rec['status'] = 'ok' if rec['output_matches'] and rec['ir_output_matches'] else 'mismatch'
+    return record
+
+
+def summarize(runs, configs):
+    """Per configuration: programs run, output mismatches and geometric-mean speedup over the first."""
+    base = next(iter(configs))
+    summary = {}
+    for label in configs:
+        recs = [r['configs'][label] for r in runs if label in r.get('configs', {})]
+        timed = [(r['configs'][base], r['configs'][label]) for r in runs
+                 if 'best_seconds' in r.get('configs', {}).get(label, {})
+                 and 'best_seconds' in r['configs'].get(base, {})]
+        ratios = [b['best_seconds'] / c['best_seconds'] for b, c in timed if c['best_seconds'] > 0]
+        summary[label] = {
+            'programs': len(recs),
+            'native_runs': len(timed),
+            'mismatches': sum(1 for r in recs if r.get('status') == 'mismatch'
+                              or r.get('ir_output_matches') is False),
+            'ir_instructions': sum(r['ir_instructions'] for r in recs),
+            'asm_instructions': sum(r['asm_instructions'] for r in recs),
+            'total_seconds': sum(c['best_seconds'] for _b, c in timed) if timed else None,
+            'speedup': statistics.geometric_mean(ratios) if ratios else None,
+        }
+    return summary
+
+
+def run_suite(corpus, configs=CONFIGS, repeat=5, log=None):
+    toolchain = find_toolchain()
+    results = {
+        'compiler_version': COMPILER_VERSION,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'toolchain': toolchain,
+        'config': {'repeat': repeat, 'configs': configs},
+        'runs': [],
+    }
+    with tempfile.TemporaryDirectory(prefix='runtime-bench-') as workdir:
+        for name, source in corpus:
+            rec = benchmark_program(name, source, configs, toolchain, workdir, repeat)
+            results['runs'].append(rec)
+            if log:
+                log(format_run(rec))
+    results['summary'] = summarize(results['runs'], configs)
+    return results
+
+
+def format_run(rec):
+    if 'skipped' in rec:
+        return f"{rec['program']:<24} skipped: {rec['skipped']}"
+    parts = []
+    for label, c in rec['configs'].items():
+        cell = f"{label} ir={c['ir_instructions']} asm={c['asm_instructions']}"
+        if 'best_seconds' in c:
+            cell += f" {c['best_seconds'] * 1000:.2f}ms"
+        if c.get('instructions') is not None:
+            cell += f" {c['instructions']:,} insns"
+        if c.get('status') not in ('ok', 'skipped'):
+            cell += f" [{c.get('status')}]"
+        elif not c.get('ir_output_matches', True):
+            cell += " [ir mismatch]"
+        parts.append(cell)
+    return f"{rec['program']:<24} " + '  '.join(parts)
+
+
+def format_summary(summary):
+    lines = [f"{'Config':<8} {'Programs':>8} {'Native':>7} {'Mismatch':>9} {'IR':>8} {'Asm':>8} "
+             f"{'Time (ms)':>10} {'Speedup':>8}"]
+    for label, s in summary.items():
+        total = f"{s['total_seconds'] * 1000:.2f}" if s['total_seconds'] is not None else '-'
+        speedup = f"x{s['speedup']:.3f}" if s['speedup'] is not None else '-'
+        lines.append(f"{label:<8} {s['programs']:>8} {s['native_runs']:>7} {s['mismatches']:>9} "
+                     f"{s['ir_instructions']:>8} {s['asm_instructions']:>8} {total:>10} {speedup:>8}")
+    return '\n'.join(lines)
+
+
+def compare(results, baseline, threshold=0.10):
+    """Regression records for programs/configs whose best run time grew by more than `threshold`."""
+    base_runs = {r['program']: r for r in baseline.get('runs', [])}
+    regressions = []
+    for run in results['runs']:
+        base = base_runs.get(run['program'])
+        if base is None:
+            continue
+        for label, cur in run.get('configs', {}).items():
+            old = base.get('configs', {}).get(label)
+            if not old or not old.get('best_seconds') or cur.get('best_seconds') is None:
+                continue
+            ratio = cur['best_seconds'] / old['best_seconds']
+            if ratio > 1 + threshold:
+                regressions.append({'program': run['program'], 'config': label,
+                                    'baseline': old['best_seconds'], 'current': cur['best_seconds'],
+                                    'ratio': round(ratio, 3)})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the run time of generated code per -O level.')
+    parser.add_argument('--examples', default=str(DEFAULT_EXAMPLES), help='directory of example sources')
+    parser.add_argument('--no-examples', action='store_true', help='only use generated programs')
+    parser.add_argument('--programs', type=int, default=6, help='generated programs in the corpus')
+    parser.add_argument('--lines', type=int, default=300, help='lines per generated program')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--loop-iterations', type=int, nargs=2, default=(30, 80), metavar=('MIN', 'MAX'),
+                        help='iterations of generated loops')
+    parser.add_argument('-O', dest='levels', action='append', choices=list(CONFIGS),
+                        help='configuration to run (repeatable; default: all)')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per binary (best is kept)')
+    parser.add_argument('-o', '--output', help='write JSON results here')
+    parser.add_argument('--baseline', help='compare against this results file')
+    parser.add_argument('--threshold', type=float, default=0.10, help='allowed slowdown fraction (default 0.10)')
+    args = parser.parse_args(argv)
+
+    configs = {label: CONFIGS[label] for label in (args.levels or CONFIGS)}
+    corpus = build_corpus(None if args.no_examples else args.examples, args.programs, args.lines,
+                          args.seed, tuple(args.loop_iterations))
+    results = run_suite(corpus, configs, args.repeat, log=print)
+    toolchain = results['toolchain']
+    if toolchain['assembler'] is None or toolchain['linker'] is None:
+        print("note: native runs skipped (needs nasm or yasm, and gcc); IR outputs were still checked")
+    print()
+    print(format_summary(results['summary']))
+
+    code = 0
+    if any(s['mismatches'] for s in results['summary'].values()):
+        code = 1
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        results['regressions'] = regressions
+        for r in regressions:
+            print(f"REGRESSION {r['program']} {r['config']}: "
+                  f"{r['baseline']:.6f}s -> {r['current']:.6f}s (x{r['ratio']})")
+        if regressions:
+            code = 1
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    return code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,258 @@
+"""
+Streaming compilation of large sources in bounded memory.
+
+CompilerPipeline.compile holds the whole source, token list, AST, IR and
+assembly at once. compile_stream instead reads the source from a file
+object and cuts it into pieces of whole top-level statements (or whole
+functions), each ending at a line break:
+
+- a piece ends after a ';' or '}' that closes a top-level statement, when
+  nothing but blanks or a // comment follows on that line;
+- a '}' followed by `else` does not end a statement;
+- braces and semicolons inside comments are skipped.
+
+Each piece is parsed, optimised and translated as soon as it is cut and its
+assembly is written to the sink; its tokens, AST and IR are then dropped.
+Across pieces only the global declarations, the label counter and the names
+of the data section are kept, and the data section is written last.
+
+The assembly is equivalent to CompilerPipeline.compile's, but not identical
+text: temps are numbered per piece and the data section follows the code.
+"""
+import re
+import time
+
+from instrumentation import count_asm_instructions
+from interning import InternTable
+from ir_optimizer import IRVerificationError, PassManager
+from pipeline import CompilationResult, format_ir_instruction
+
+DEFAULT_CHUNK_SIZE = 1 << 16  # characters per piece (approximate lower bound)
+READ_SIZE = 1 << 20
+
+_boundary_re = re.compile(r'/\*|//|[{};]')
+_line_rest_re = re.compile(r'[ \t\r\f\v]*(?://[^\n]*)?\n')
+_skip_re = re.compile(r'(?:\s+|//[^\n]*\n|/\*.*?\*/)*', re.S)
+_blank_re = re.compile(r'(?:\s+|//[^\n]*(?:\n|\Z)|/\*.*?\*/)*\Z', re.S)
+_ident_char_re = re.compile(r'[A-Za-z0-9_]')
+
+
+def split_statements(readable, chunk_size=DEFAULT_CHUNK_SIZE, read_size=READ_SIZE):
+    """
+    Yield (text, first line number) pieces of the source read from `readable`.
+
+    Every piece is at least `chunk_size` characters (except the last) and
+    holds whole top-level statements or functions. Text after the last cut
+    that is only blanks and comments is dropped.
+    """
+    buf = ''
+    eof = False
+    start = 0   # first character of the pending piece
+    cut = 0     # end of the last complete statement line (>= start)
+    pos = 0     # scan position
+    line = 1    # line number of buf[start]
+    depth = 0
+    emitted = False
+
+    while True:
+        need_more = False
+        m = _boundary_re.search(buf, pos)
+        if m is None:
+            need_more = True
+        else:
+            tok, p = m.group(), m.start()
+            if tok == '/*':
+                e = buf.find('*/', p + 2)
+                if e >= 0:
+                    pos = e + 2
+                elif eof:
+                    pos = len(buf)  # unterminated: left for the lexer to report
+                else:
+                    need_more = True
+            elif tok == '//':
+                e = buf.find('\n', p + 2)
+                if e >= 0:
+                    pos = e
+                elif eof:
+                    pos = len(buf)
+                else:
+                    need_more = True
+            elif tok == '{':
+                depth += 1
+                pos = p + 1
+            else:
+                new_depth = depth - 1 if tok == '}' else depth
+                end = p + 1
+                boundary = None
+                if new_depth <= 0:
+                    rest = _line_rest_re.match(buf, end)
+                    if rest is None:
+                        # no line break yet: decide once the line is complete
+                        need_more = not eof and buf.find('\n', end) < 0
+                    elif tok == '}':
+                        j = _skip_re.match(buf, end).end()
+                        if not eof and j + 5 > len(buf):
+                            need_more = True
+                        elif not (buf.startswith('else', j)
+                                  and not _ident_char_re.match(buf, j + 4)):
+                            boundary = rest.end()
+                    else:
+                        boundary = rest.end()
+                if not need_more:
+                    depth = max(new_depth, 0)
+                    pos = end
+                    if boundary is not None:
+                        cut = boundary
+                        if cut - start >= chunk_size:
+                            text = buf[start:cut]
+                            yield text, line
+                            emitted = True
+                            line += text.count('\n')
+                            start = cut
+
+        if not need_more:
+            continue
+        if eof:
+            break
+        data = readable.read(read_size)
+        if not data:
+            eof = True
+            continue
+        # keep only the pending piece
+        buf = buf[start:] + data
+        pos -= start
+        cut -= start
+        start = 0
+
+    text = buf[start:]
+    if not emitted or not _blank_re.match(text):
+        yield text, line
+
+
+def compile_stream(pipeline, readable, sink, path=None, ir_sink=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Compile the source read from `readable`, writing assembly to `sink` as it is produced.
+
+    Uses the pipeline's scanner, parser, translator and options (opt_level,
+    verify_ir: optimisation and verification run per piece, on pieces
+    without issues). Returns a CompilationResult carrying the diagnostics,
+    the global symbols and stats; its tokens, AST, IR and asm are empty.
+    With `ir_sink`, the IR is written there as it is produced.
+    """
+    result = CompilationResult(path)
+    stats = result.stats
+    scanner, processor, translator = pipeline.scanner, pipeline.processor, pipeline.translator
+    level = pipeline.options.get('opt_level', 0)
+    verify = bool(pipeline.options.get('verify_ir'))
+    manager = PassManager.for_level(level, verify=verify) if level or verify else None
+    functions = None  # decided by the first piece
+    counters = {'pieces': 0, 'ir_instructions': 0, 'asm_instructions': 0}
+
+    def emit(lines):
+        counters['asm_instructions'] += count_asm_instructions(lines)
+        sink.write('\n'.join(lines) + '\n')
+
+    def optimise(ir):
+        if manager is None or processor.issues or scanner.issues:
+            return ir
+        with stats.phase('optimize'):
+            ir = manager.run(ir)
+        stats.passes.extend(manager.report)
+        return ir
+
+    processor.begin_stream()
+    pieces = split_statements(readable, chunk_size)
+    while True:
+        with stats.phase('split'):
+            piece = next(pieces, None)
+        if piece is None:
+            break
+        text, first_line = piece
+        pipeline._checkpoint()
+        counters['pieces'] += 1
+        names = InternTable()  # per piece: temps and labels do not accumulate
+        with stats.phase('parse'):
+            scanner.reset(text, names)
+            processor.process_chunk(text, lexer=scanner.scanner, symbols=names, first_line=first_line)
+        result.lex_issues += scanner.issues
+        result.parse_issues += processor.issues
+
+        units = processor.units
+        if functions is None:
+            functions = bool(units)
+            emit(translator.begin_stream(functions))
+        elif functions != bool(units):
+            result.parse_issues.append(
+                f"Syntax error: functions and top-level statements cannot be mixed (line {first_line})")
+            continue
+
+        try:
+            if functions:
+                for unit in units:
+                    ir = optimise(unit.ir)
+                    _write_ir(ir_sink, ir, counters)
+                    with stats.phase('codegen'):
+                        lines = translator.translate_function(unit.name, ir)
+                    emit(lines)
+            else:
+                ir = optimise(processor.ir_instructions)
+                _write_ir(ir_sink, ir, counters)
+                with stats.phase('codegen'):
+                    lines = translator.translate_statements(ir)
+                emit(lines)
+        except IRVerificationError as e:
+            result.codegen_error = f"IR verification failed: {e}"
+            break
+        except Exception as e:
+            result.codegen_error = f"Code generation failed: {e}"
+            break
+
+    if result.codegen_error is None:
+        if functions is None:
+            emit(translator.begin_stream(False))
+        emit(translator.end_stream())
+    result.symbols = processor.registry.all_entries()
+    stats.counters.update(counters)
+    return result
+
+
+def _write_ir(ir_sink, ir, counters):
+    if ir_sink is not None:
+        base = counters['ir_instructions']
+        ir_sink.write(''.join(f"{base + i + 1}. {format_ir_instruction(instr)}\n"
+                              for i, instr in enumerate(ir)))
+    counters['ir_instructions'] += len(ir)
+
+
+if __name__ == '__main__':
+    import io
+    import sys
+    import tracemalloc
+    from pipeline import CompilerPipeline
+    from program_generator import ProgramGenerator
+
+    class _CountingSink:
+        def __init__(self):
+            self.size = 0
+
+        def write(self, text):
+            self.size += len(text)
+
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    source = ProgramGenerator(seed=0).generate(size)
+    pipeline = CompilerPipeline(jobs=1)
+    for label in ('batch', 'stream'):
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        if label == 'batch':
+            res = pipeline.compile(source)
+            out_bytes = sum(len(line) + 1 for line in res.asm)
+        else:
+            out = _CountingSink()
+            res = pipeline.compile_stream(io.StringIO(source), out)
+            out_bytes = out.size
+        elapsed = time.perf_counter() - t0
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{label:<7} {elapsed:8.3f}s  peak {peak / 1e6:8.1f} MB  asm {out_bytes / 1e6:.1f} MB  "
+              f"issues {len(res.issues)}")
@@ -1,76 +1,180 @@
 # symbol table.py
+class SymbolEntry:
+    """
+    One declared variable.
+
+    A compact record that still answers the dict-style access
+    (entry['dtype'], entry.get('val')) used by the GUI and the cache.
+    """
+    __slots__ = ('id', 'dtype', 'val', 'ctx', 'scope', 'scope_level')
+    FIELDS = __slots__
+
+    def __init__(self, id, dtype, val=None, ctx='declaration', scope='global', scope_level=0):
+        self.id = id
+        self.dtype = dtype
+        self.val = val
+        self.ctx = ctx
+        self.scope = scope
+        self.scope_level = scope_level
+
+    def get(self, key, default=None):
+        if key in self.FIELDS:
+            return getattr(self, key)
+        return default
+
+    def __getitem__(self, key):
+        if key in self.FIELDS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self.FIELDS
+
+    def keys(self):
+        return self.FIELDS
+
+    def as_tuple(self):
+        return (self.id, self.dtype, self.val, self.ctx, self.scope, self.scope_level)
+
+    def as_dict(self):
+        return dict(zip(self.FIELDS, self.as_tuple()))
+
+    def __eq__(self, other):
+        if isinstance(other, SymbolEntry):
+            return self.as_tuple() == other.as_tuple()
+        if isinstance(other, dict):
+            return self.as_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"SymbolEntry({', '.join(f'{f}={getattr(self, f)!r}' for f in self.FIELDS)})"
+
+
+class Scope:
+    """A node of the scope tree; kept after the scope is closed."""
+    __slots__ = ('id', 'name', 'level', 'parent', 'children', 'entries')
+
+    def __init__(self, id, name, parent=None):
+        self.id = id
+        self.name = name
+        self.parent = parent
+        self.level = 0 if parent is None else parent.level + 1
+        self.children = []
+        self.entries = {}  # identifier -> SymbolEntry, in declaration order
+
+    def lookup(self, identifier):
+        """Innermost binding of `identifier` visible from this scope."""
+        scope = self
+        while scope is not None:
+            entry = scope.entries.get(identifier)
+            if entry is not None:
+                return entry
+            scope = scope.parent
+        return None
+
+
 class VariableRegistry:
+    """
+    Scoped symbol table.
+
+    Each identifier has a shadow stack of its visible bindings, innermost
+    last, so find/update are O(1) regardless of nesting depth. Scopes form a
+    persistent tree (self.scopes, in creation order): pop_scope only leaves a
+    scope, so all_entries() still reports block-local variables after parsing.
+    """
+
     def __init__(self):
-        self.scope_stack = [{}]
-        self.scope_names = ['global']
-        self.current_scope_id = 0
+        self.clear()
 
     def add(self, identifier, var_type, initial_val=None, context='declaration'):
-        current_scope = self.scope_stack[-1]
-        current_scope[identifier] = {
-            'id': identifier,
-            'dtype': var_type,
-            'val': initial_val,
-            'ctx': context,
-            'scope': self.scope_names[-1],
-            'scope_level': len(self.scope_stack) - 1
-        }
+        scope = self.current
+        entry = SymbolEntry(identifier, var_type, initial_val, context, scope.name, scope.level)
+        stack = self._bindings.get(identifier)
+        if identifier in scope.entries:
+            # redeclaration in the same scope replaces the innermost binding
+            stack[-1] = entry
+        elif stack is None:
+            self._bindings[identifier] = [entry]
+        else:
+            stack.append(entry)
+        scope.entries[identifier] = entry
 
     def find(self, identifier):
-        for scope in reversed(self.scope_stack):
-            if identifier in scope:
-                return scope[identifier]
-        return None
+        stack = self._bindings.get(identifier)
+        return stack[-1] if stack else None
 
     def find_in_current_scope(self, identifier):
-        current_scope = self.scope_stack[-1]
-        return current_scope.get(identifier)
+        return self.current.entries.get(identifier)
 
     def update(self, identifier, new_value):
-        for scope in reversed(self.scope_stack):
-            if identifier in scope:
-                scope[identifier]['val'] = new_value
-                return True
+        stack = self._bindings.get(identifier)
+        if stack:
+            stack[-1].val = new_value
+            return True
         return False
 
     def all_entries(self):
         all_vars = []
-        for scope in self.scope_stack:
-            for var_info in scope.values():
-                all_vars.append(var_info)
+        for scope in self.scopes:
+            all_vars.extend(scope.entries.values())
         return all_vars
 
     def current_scope_entries(self):
-        current_scope = self.scope_stack[-1]
-        return list(current_scope.values())
+        return list(self.current.entries.values())
 
     def push_scope(self, scope_name=None):
+        self.current_scope_id += 1
         if scope_name is None:
-            self.current_scope_id += 1
             scope_name = f"scope_{self.current_scope_id}"
-        self.scope_stack.append({})
-        self.scope_names.append(scope_name)
+        scope = Scope(self.current_scope_id, scope_name, self.current)
+        self.current.children.append(scope)
+        self.scopes.append(scope)
+        self.current = scope
 
     def pop_scope(self):
-        if len(self.scope_stack) > 1:
-            popped_scope = self.scope_stack.pop()
-            self.scope_names.pop()
-            return popped_scope
-        return None
+        scope = self.current
+        if scope.parent is None:
+            return None
+        bindings = self._bindings
+        for identifier in scope.entries:
+            stack = bindings[identifier]
+            stack.pop()
+            if not stack:
+                del bindings[identifier]
+        self.current = scope.parent
+        return scope.entries
+
+    def discard_closed_scopes(self):
+        """
+        Drop the closed scopes kept for all_entries(), keeping the global one.
+        Only valid at global level; streaming compiles call it between pieces.
+        """
+        if self.current is self.root:
+            self.root.children = []
+            self.scopes = [self.root]
 
     def get_scope_level(self):
-        return len(self.scope_stack) - 1
+        return self.current.level
 
     def get_current_scope_name(self):
-        return self.scope_names[-1]
+        return self.current.name
 
     def is_declared_in_current_scope(self, identifier):
-        return identifier in self.scope_stack[-1]
+        return identifier in self.current.entries
 
     def clear(self):
-        self.scope_stack = [{}]
-        self.scope_names = ['global']
+        self.root = Scope(0, 'global')
+        self.scopes = [self.root]
+        self.current = self.root
         self.current_scope_id = 0
+        self._bindings = {}
 
     def show(self, include_values=True):
         """
@@ -83,22 +187,19 @@ class VariableRegistry:
             str: The formatted multi-line string representation of the symbol table.
         """
         lines = []
-        for level, (scope, name) in enumerate(zip(self.scope_stack, self.scope_names)):
-            lines.append(f"Scope level {level} ({name}):")
-            if not scope:
-                lines.append("  <empty>")
+        for scope in self.scopes:
+            indent = '  ' * scope.level
+            lines.append(f"{indent}Scope level {scope.level} ({scope.name}):")
+            if not scope.entries:
+                lines.append(f"{indent}  <empty>")
                 continue
             # Keep stable ordering for readability
-            for ident in sorted(scope.keys()):
-                info = scope[ident]
+            for ident in sorted(scope.entries):
+                info = scope.entries[ident]
                 if include_values:
-                    lines.append(
-                        f"  {ident}: type={info.get('dtype')}, val={info.get('val')}, ctx={info.get('ctx')}"
-                    )
+                    lines.append(f"{indent}  {ident}: type={info.dtype}, val={info.val}, ctx={info.ctx}")
                 else:
-                    lines.append(
-                        f"  {ident}: type={info.get('dtype')}, ctx={info.get('ctx')}"
-                    )
+                    lines.append(f"{indent}  {ident}: type={info.dtype}, ctx={info.ctx}")
         out = '\n'.join(lines)
         print(out)
-        return out
\ No newline at end of file
+        return out
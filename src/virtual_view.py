@@ -0,0 +1,168 @@
+"""
+Virtualized row view for large result tables.
+
+VirtualTableView only formats and draws the rows that are visible: the
+data stays in its compact form (token dicts, IR dicts, asm lines) and a
+formatter turns row i into text on demand. Scrolling, paging and search
+work the same for ten rows or a million.
+"""
+import tkinter as tk
+from tkinter import ttk
+import tkinter.font as tkfont
+
+SEARCH_SLICE = 20000  # rows examined per Tk tick while searching
+
+
+class VirtualTableView(ttk.Frame):
+    """Scrollable, searchable list that renders only the rows on screen."""
+
+    def __init__(self, parent, font=('Consolas', 10), **kwargs):
+        super().__init__(parent, **kwargs)
+        self._rows = []
+        self._count = 0
+        self._format = str
+        self._top = 0
+        self._selected = None
+        self._search_job = None
+
+        self._font = tkfont.Font(self, font=font)
+        self._line_height = max(1, self._font.metrics('linespace'))
+
+        # search bar
+        bar = ttk.Frame(self)
+        bar.pack(side=tk.TOP, fill=tk.X)
+        self.search_var = tk.StringVar()
+        entry = ttk.Entry(bar, textvariable=self.search_var, width=30)
+        entry.pack(side=tk.LEFT, padx=(0, 4), pady=2)
+        entry.bind('<Return>', lambda e: self.find_next())
+        ttk.Button(bar, text="Find next", command=self.find_next).pack(side=tk.LEFT)
+        self.info_var = tk.StringVar()
+        ttk.Label(bar, textvariable=self.info_var).pack(side=tk.RIGHT, padx=4)
+
+        # fixed header lines
+        self.header = tk.Label(self, font=self._font, anchor=tk.W, justify=tk.LEFT)
+        self.header.pack(side=tk.TOP, fill=tk.X)
+
+        body = ttk.Frame(self)
+        body.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        self.scrollbar = ttk.Scrollbar(body, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.text = tk.Text(body, font=self._font, wrap=tk.NONE, width=80, height=40,
+                            cursor='arrow', state=tk.DISABLED)
+        self.text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.text.tag_configure('selected', background='#ffe08a')
+
+        self.text.bind('<Configure>', lambda e: self._redraw())
+        for widget in (self.text, self.header):
+            widget.bind('<MouseWheel>', self._on_wheel)
+            widget.bind('<Button-4>', lambda e: self.scroll_rows(-3))
+            widget.bind('<Button-5>', lambda e: self.scroll_rows(3))
+        self.text.bind('<Up>', lambda e: self.scroll_rows(-1))
+        self.text.bind('<Down>', lambda e: self.scroll_rows(1))
+        self.text.bind('<Prior>', lambda e: self.scroll_rows(-self.visible_rows()))
+        self.text.bind('<Next>', lambda e: self.scroll_rows(self.visible_rows()))
+        self.text.bind('<Home>', lambda e: self.scroll_to(0))
+        self.text.bind('<End>', lambda e: self.scroll_to(self._count))
+        self.text.bind('<Button-1>', lambda e: self.text.focus_set())
+
+    # -----------------------
+    # Data
+    # -----------------------
+    def set_rows(self, rows, formatter=str, header=''):
+        """Show `rows`; `formatter(row)` produces the text of one visible row."""
+        self._cancel_search()
+        self._rows = rows
+        self._count = len(rows)
+        self._format = formatter
+        self._selected = None
+        self.header.configure(text=header)
+        self._top = min(self._top, max(0, self._count - 1))
+        self.info_var.set(f"{self._count} rows")
+        self._redraw()
+
+    def clear(self):
+        self.set_rows([], str, '')
+        self._top = 0
+
+    def row_text(self, index):
+        return self._format(self._rows[index])
+
+    # -----------------------
+    # Scrolling
+    # -----------------------
+    def visible_rows(self):
+        height = self.text.winfo_height()
+        return max(1, height // self._line_height) if height > 1 else 40
+
+    def scroll_to(self, index):
+        self._top = max(0, min(index, self._count - self.visible_rows()))
+        self._redraw()
+        return 'break'
+
+    def scroll_rows(self, delta):
+        return self.scroll_to(self._top + delta)
+
+    def _on_wheel(self, event):
+        return self.scroll_rows(-3 if event.delta > 0 else 3)
+
+    def _on_scrollbar(self, action, amount=None, unit=None):
+        if action == 'moveto':
+            self.scroll_to(int(float(amount) * self._count))
+        elif action == 'scroll':
+            step = self.visible_rows() if unit == 'pages' else 1
+            self.scroll_rows(int(amount) * step)
+
+    def _redraw(self):
+        n = self.visible_rows()
+        first = self._top
+        last = min(self._count, first + n)
+        lines = [self._format(self._rows[i]) for i in range(first, last)]
+        self.text.configure(state=tk.NORMAL)
+        self.text.delete('1.0', tk.END)
+        self.text.insert('1.0', '\n'.join(lines))
+        if self._selected is not None and first <= self._selected < last:
+            line = self._selected - first + 1
+            self.text.tag_add('selected', f"{line}.0", f"{line}.end")
+        self.text.configure(state=tk.DISABLED)
+        if self._count:
+            self.scrollbar.set(first / self._count, last / self._count)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    # -----------------------
+    # Search
+    # -----------------------
+    def _cancel_search(self):
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+            self._search_job = None
+
+    def find_next(self):
+        """Search forward (wrapping) for the search text, a slice of rows per Tk tick."""
+        self._cancel_search()
+        needle = self.search_var.get().lower()
+        if not needle or not self._count:
+            return
+        start = (self._selected + 1) if self._selected is not None else self._top
+        self.info_var.set("Searching...")
+        self._search_step(needle, start % self._count, 0)
+
+    def _search_step(self, needle, index, scanned):
+        fmt = self._format
+        rows = self._rows
+        count = self._count
+        stop = min(count, scanned + SEARCH_SLICE)
+        while scanned < stop:
+            if needle in fmt(rows[index]).lower():
+                self._search_job = None
+                self._selected = index
+                self.info_var.set(f"Row {index + 1} of {count}")
+                self.scroll_to(index - self.visible_rows() // 2)
+                return
+            index = (index + 1) % count
+            scanned += 1
+        if scanned >= count:
+            self._search_job = None
+            self.info_var.set("Not found")
+            return
+        self._search_job = self.after(1, self._search_step, needle, index, scanned)